@@ -0,0 +1,85 @@
+"""
+OPEN (book 30) backfill: per-group .loc loop vs the vectorized backfill_open_lines.
+
+    python -m benchmarks.bench_open_lines [--legacy-max-rows 80000]
+
+The legacy loop is O(groups) index probes, so it is skipped on frames larger
+than --legacy-max-rows (a full props season takes many minutes).
+"""
+import argparse
+import time
+import warnings
+from typing import List
+
+import pandas as pd
+
+import event_odds_runner
+import player_props_runner
+from benchmarks.synthetic import make_game_lines_frame, make_player_props_frame
+
+warnings.simplefilter("ignore")
+
+
+def legacy_ensure_open_lines(df: pd.DataFrame, group_keys: List[str], open_book_id: int,
+                             fallback_priority: List[int]) -> pd.DataFrame:
+    """The pre-vectorization implementation, kept here for comparison only."""
+    df = df.copy()
+    df_idx = df.set_index(group_keys + ["book_id"], drop=False)
+    rows_to_add = []
+    present_books_by_group = (
+        df.groupby(group_keys, dropna=False)["book_id"]
+          .apply(lambda s: set(pd.to_numeric(s, errors="coerce").dropna().astype(int)))
+    )
+    groups_missing_open = present_books_by_group[~present_books_by_group.apply(lambda s: open_book_id in s)]
+    for group_key, _ in groups_missing_open.items():
+        chosen = None
+        for bid in fallback_priority:
+            try:
+                candidate = df_idx.loc[group_key + (bid,)]
+            except KeyError:
+                continue
+            if isinstance(candidate, pd.DataFrame):
+                candidate = candidate.sort_values("last_updated").iloc[-1]
+            chosen = candidate
+            break
+        if chosen is not None:
+            r = chosen.to_dict()
+            r["book_id"] = open_book_id
+            r["open_inferred"] = True
+            r["open_source_book_id"] = int(chosen["book_id"])
+            rows_to_add.append(r)
+    if rows_to_add:
+        df = pd.concat([df, pd.DataFrame(rows_to_add)[df.columns]], ignore_index=True)
+    return df
+
+
+def _time(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--legacy-max-rows", type=int, default=80000)
+    args = parser.parse_args()
+
+    cases = [
+        ("game_lines week", event_odds_runner, make_game_lines_frame(weeks=1)),
+        ("game_lines season", event_odds_runner, make_game_lines_frame(weeks=22)),
+        ("player_props week", player_props_runner, make_player_props_frame(weeks=1)),
+        ("player_props season", player_props_runner, make_player_props_frame(weeks=22)),
+    ]
+    for name, runner, df in cases:
+        new_s = _time(runner.ensure_open_lines, df)
+        if len(df) <= args.legacy_max_rows:
+            old_s = _time(legacy_ensure_open_lines, df, runner.UNIQ_KEYS_NO_BOOK,
+                          runner.OPEN_BOOK_ID, runner.OPEN_FALLBACK_PRIORITY)
+            legacy = f"legacy {old_s:8.3f}s  speedup {old_s / new_s:6.1f}x"
+        else:
+            legacy = "legacy  skipped"
+        print(f"{name:<20} rows={len(df):>8}  vectorized {new_s:7.3f}s  {legacy}")
+
+
+if __name__ == "__main__":
+    main()
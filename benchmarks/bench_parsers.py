@@ -0,0 +1,165 @@
+"""
+Payload parsers: dict-of-rows (previous implementation) vs the column-buffer parsers.
+
+    python -m benchmarks.bench_parsers [--games 16] [--repeat 3]
+
+Reports best-of-N wall time and tracemalloc peak for each path and checks that
+both produce identical frames.
+"""
+import argparse
+import time
+import tracemalloc
+import warnings
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from benchmarks.synthetic import make_props_payload, make_scoreboard_payload
+from src.action_games_runner import GameLinesClient
+from src.action_props_runner import GamePropsClient
+
+warnings.simplefilter("ignore")
+
+
+# ---------------- previous implementations (comparison only) ---------------- #
+def legacy_parse_game_markets_flat(client: GameLinesClient, games: List[Dict[str, Any]]) -> pd.DataFrame:
+    rows: List[Dict[str, Any]] = []
+    for g in games:
+        event_id, season_g, week_g, num_bets = g.get("id"), g.get("season"), g.get("week"), g.get("num_bets")
+        id_to_abbr = {t.get("id"): client._map_abbr(t.get("abbr")) for t in (g.get("teams") or []) if isinstance(t, dict)}
+        for book_key, book_blob in (g.get("markets") or {}).items():
+            try:
+                book_id = int(book_key)
+            except Exception:
+                continue
+            period_container = book_blob or {}
+            for period_key in client.PERIOD_KEYS_DEFAULT:
+                period_blob = period_container.get(period_key) or {}
+                if not isinstance(period_blob, dict):
+                    continue
+                for market_type, offers in period_blob.items():
+                    if not isinstance(offers, list):
+                        continue
+                    for o in offers:
+                        if not isinstance(o, dict):
+                            continue
+                        team_id = o.get("team_id", 0)
+                        bet_info = o.get("bet_info") or {}
+                        tickets = bet_info.get("tickets") or {}
+                        money = bet_info.get("money") or {}
+                        rows.append({
+                            "event_id": o.get("event_id", event_id), "market_id": o.get("market_id"),
+                            "outcome_id": o.get("outcome_id"), "book_id": book_id,
+                            "type": o.get("type", market_type), "line_type": o.get("type", market_type),
+                            "period": o.get("period", period_key), "side": o.get("side"),
+                            "value": o.get("value"), "odds": o.get("odds"), "is_live": o.get("is_live"),
+                            "line_status": o.get("line_status"), "deeplink_id": o.get("deeplink_id"),
+                            "odds_coefficient_score": o.get("odds_coefficient_score"),
+                            "team_id": team_id, "team": id_to_abbr.get(team_id),
+                            "player_id": o.get("player_id", 0), "competitor_id": o.get("competitor_id", 0),
+                            "option_type_id": o.get("option_type_id", None),
+                            "season": season_g, "week": week_g, "total_bets_on_event": num_bets,
+                            "tickets_value": tickets.get("value"), "tickets_percent": tickets.get("percent"),
+                            "money_value": money.get("value"), "money_percent": money.get("percent"),
+                        })
+    df = pd.DataFrame(rows)
+    for col in ["event_id", "book_id", "team_id", "player_id", "competitor_id", "season", "week"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="ignore")
+    if not df.empty:
+        order = list(GameLinesClient.MARKET_COLUMNS)
+        df = df[[c for c in order if c in df.columns] + [c for c in df.columns if c not in order]].reset_index(drop=True)
+    return df
+
+
+def legacy_props_blob_to_df(client: GamePropsClient, props_blob: Dict[str, Any], scope: str) -> pd.DataFrame:
+    rows: List[Dict[str, Any]] = []
+    for line_type_key, markets in props_blob.items():
+        if not isinstance(markets, list):
+            continue
+        mapped = client.bet_type_map.get(line_type_key)
+        for m in markets:
+            raw_type = m.get("type") or line_type_key
+            base_row = {
+                "market_id": m.get("market_id") or m.get("id"), "type": raw_type,
+                "bet_type": mapped or client.bet_type_map.get(raw_type) or client.bet_type_map.get(m.get("line_type")) or raw_type,
+                "line_type": m.get("line_type"), "custom_pick_type_name": m.get("custom_pick_type_name"),
+                "custom_pick_type_display_name": m.get("custom_pick_type_display_name"), "scope": scope,
+            }
+            lines = m.get("lines") or {}
+            if not isinstance(lines, dict):
+                continue
+            for book_key, offers in lines.items():
+                try:
+                    book_id = int(book_key)
+                except Exception:
+                    book_id = None
+                if not isinstance(offers, list):
+                    continue
+                for o in offers:
+                    if not isinstance(o, dict):
+                        continue
+                    r = dict(base_row)
+                    r.update({k: o.get(k) for k in (
+                        "event_id", "option_type_id", "side", "period", "player_id", "team_id", "competitor_id",
+                        "value", "odds", "is_live", "line_status", "deeplink_id", "prop_type_id",
+                        "odds_coefficient_score", "outcome_id")})
+                    r["book_id"] = book_id or o.get("book_id")
+                    bet_info = o.get("bet_info") or {}
+                    tickets = bet_info.get("tickets") or {}
+                    money = bet_info.get("money") or {}
+                    r["tickets_value"], r["tickets_percent"] = tickets.get("value"), tickets.get("percent")
+                    r["money_value"], r["money_percent"] = money.get("value"), money.get("percent")
+                    for extra in ("edge", "edge_grade", "projection", "bet_quality"):
+                        if extra in o:
+                            r[extra] = o.get(extra)
+                    rows.append(r)
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        order = GamePropsClient.PROP_COLUMN_ORDER
+        df = df[[c for c in order if c in df.columns] + [c for c in df.columns if c not in order]]
+    return df
+
+
+def _measure(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, best, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines_client, props_client = GameLinesClient(), GamePropsClient()
+    games = make_scoreboard_payload(n_games=args.games)["games"]
+    props_blob = {}
+    for g in range(args.games):  # one week of per-game payloads folded into a single blob
+        for key, markets in make_props_payload(game_id=190000 + g)["player_props"].items():
+            props_blob.setdefault(key, []).extend(markets)
+
+    cases = [
+        ("game lines", lambda: legacy_parse_game_markets_flat(lines_client, games),
+         lambda: lines_client._parse_game_markets_flat(games)),
+        ("player props", lambda: legacy_props_blob_to_df(props_client, props_blob, "player"),
+         lambda: props_client._props_blob_to_df(props_blob, "player")),
+    ]
+    for name, legacy_fn, new_fn in cases:
+        old_df, old_s, old_mb = _measure(legacy_fn, args.repeat)
+        new_df, new_s, new_mb = _measure(new_fn, args.repeat)
+        pd.testing.assert_frame_equal(old_df, new_df)
+        print(f"{name:<13} rows={len(new_df):>7}  dict-of-rows {old_s:6.3f}s {old_mb:7.1f} MiB  "
+              f"columnar {new_s:6.3f}s {new_mb:7.1f} MiB  ({old_s / new_s:.2f}x, {old_mb / new_mb:.2f}x mem)")
+
+
+if __name__ == "__main__":
+    main()
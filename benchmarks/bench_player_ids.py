@@ -0,0 +1,98 @@
+"""
+Action Network -> nflverse player id mapping: the consts.py dict literal vs the sorted
+parquet id store (src.player_ids.PlayerIdMap).
+
+    python -m benchmarks.bench_player_ids [--rows 1000000] [--repeat 5]
+
+"load" is what the first use costs: parsing + executing the 33 KB dict literal (what every
+import of the runners used to pay) vs reading the two-column parquet. "map" is rollup_season's
+mapping of a season of props rows: str-cast + Series.map(dict) vs one searchsorted on the ints.
+Both must give the same player ids.
+"""
+import argparse
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.player_ids import PlayerIdMap
+
+LITERAL = "ACTION_NETWORK_ID_MAPPER = {"
+
+
+def legacy_source(rev=None) -> str:
+    """consts.py with the dict literal: at `rev`, else as it was before the commit that removed it."""
+    def show(r):
+        return subprocess.run(["git", "show", f"{r}:consts.py"], capture_output=True, text=True, check=True).stdout
+
+    if rev:
+        return show(rev)
+    with open("consts.py") as f:
+        source = f.read()
+    if LITERAL in source:
+        return source
+    removed = subprocess.run(["git", "log", "-1", "--format=%H", "-S", LITERAL, "--", "consts.py"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+    return show(f"{removed}~1")
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-rev", default=None,
+                        help="git revision whose consts.py still holds the dict literal (default: from history)")
+    args = parser.parse_args()
+
+    source = legacy_source(args.legacy_rev)
+    namespace = {}
+    exec(compile(source, "consts.py", "exec"), namespace)
+    mapper = namespace["ACTION_NETWORK_ID_MAPPER"]
+
+    def load_dict():
+        exec(compile(source, "consts.py", "exec"), {})
+
+    def load_store():
+        store = PlayerIdMap()
+        store.lookup([0])
+        return store
+
+    store = load_store()
+    assert store.to_dict() == mapper, "id store differs from the consts dict"
+
+    rng = np.random.default_rng(0)
+    known = np.array([int(k) for k in mapper], dtype=np.int64)
+    ids = pd.Series(np.where(rng.random(args.rows) < 0.8, rng.choice(known, args.rows),
+                             rng.integers(1, 400_000, args.rows)), dtype="Int32")
+    ids[rng.random(args.rows) < 0.01] = pd.NA
+
+    def map_dict():
+        return ids.fillna(-1).astype(int).astype(str).map(mapper)
+
+    def map_store():
+        return store.lookup(ids.fillna(-1).astype(int).to_numpy())
+
+    old, new = map_dict().to_numpy(dtype=object), map_store()
+    assert (pd.isna(old) == pd.isna(new)).all() and (old[pd.notna(old)] == new[pd.notna(new)]).all()
+    print(f"{len(mapper)} ids; {args.rows} props rows, {int(pd.notna(new).sum())} mapped; outputs identical")
+
+    old_load, new_load = _best(load_dict, args.repeat), _best(load_store, args.repeat)
+    old_map, new_map = _best(map_dict, args.repeat), _best(map_store, args.repeat)
+    print(f"load  dict literal {old_load * 1000:8.2f} ms   id store {new_load * 1000:8.2f} ms  "
+          f"({old_load / new_load:5.1f}x)")
+    print(f"map   str + dict   {old_map * 1000:8.2f} ms   searchsorted {new_map * 1000:8.2f} ms  "
+          f"({old_map / new_map:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+clean_player_names: six regex passes + a per-row unicodedata apply vs the memoized
+per-unique-name version, on a season of roster names plus props join names.
+
+    python -m benchmarks.bench_player_names [--players 2500] [--weeks 18] [--repeat 3]
+
+Checks that both produce identical Series before timing. "cold" clears the name cache
+first (one process, first week); "warm" is every later call of the run.
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src import utils
+from src.utils import _to_ascii, clean_player_names
+
+warnings.simplefilter("ignore")
+
+FIRST = ["Patrick", "Josh", "Ja'Marr", "Amon-Ra", "D'Andre", "José", "Zoë", "CeeDee", "Travis", "Kenneth",
+         "Ke'Shawn", "Tyreek", "Christian", "Saquon", "Odell", "Mar’Keise", "Justin", "Brian", "Michael", "Derrick"]
+LAST = ["Mahomes", "Allen", "Chase", "St. Brown", "Swift", "Núñez", "O'Neill", "Lamb", "Kelce", "Walker",
+        "Hill", "McCaffrey", "Barkley", "Beckham", "Irving", "Jefferson", "Robinson", "Henry", "Smith", "Pierre-Louis"]
+SUFFIXES = ["", "", "", "", " Jr.", " Sr", " II", " III", " IV", " V"]
+
+
+def legacy_clean_player_names(s: pd.Series, *, lowercase: bool = False, convert_lastfirst: bool = True,
+                              convert_to_ascii: bool = True) -> pd.Series:
+    """The per-row implementation, kept here for comparison only."""
+    s = s.astype("string")
+    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
+    if convert_lastfirst:
+        s = s.str.replace(r"^(.+?),\s*(.+)$", r"\2 \1", regex=True)
+    s = s.str.replace(r"\s+(Jr|Sr)\.?$|\s+(II|III|IV|V)$", "", case=False, regex=True)
+    s = s.str.replace(r"[\'’\.,]", "", regex=True)
+    if convert_to_ascii:
+        s = s.apply(lambda x: _to_ascii(x) if pd.notna(x) else x)
+    if lowercase:
+        s = s.str.lower()
+    return s
+
+
+def make_names(players: int, seed: int = 0) -> np.ndarray:
+    """`players` distinct raw names: accents, apostrophes, suffixes, 'Last, First', stray spaces."""
+    rng = np.random.default_rng(seed)
+    names = set()
+    while len(names) < players:
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        name = f"{first} {last}{rng.choice(SUFFIXES)}{int(rng.integers(0, players // 10 + 1)) or ''}"
+        if rng.random() < 0.1:
+            name = f"{last},  {first}"
+        if rng.random() < 0.05:
+            name = f" {name}  "
+        names.add(name)
+    return np.array(sorted(names), dtype=object)
+
+
+def season_weeks(players: int, weeks: int, props_rows_per_player: int, seed: int = 0):
+    """Per week: (roster names, props join names). Rosters repeat every player; props names
+    ("P. Last") repeat per bet type / side / book, with a few missing."""
+    rng = np.random.default_rng(seed)
+    names = make_names(players, seed)
+    abbr = np.array([f"{n.strip().split(' ')[0][0]}. {n.strip().split(' ', 1)[-1]}" for n in names], dtype=object)
+    out = []
+    for _ in range(weeks):
+        active = rng.choice(len(names), size=int(len(names) * 0.6), replace=False)
+        props = np.repeat(abbr[active[: len(active) // 3]], props_rows_per_player).astype(object)
+        props[rng.random(len(props)) < 0.01] = None
+        out.append((pd.Series(names[active]), pd.Series(props)))
+    return out
+
+
+def _time(fn, weeks, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        utils._clean_name.cache_clear()
+        start = time.perf_counter()
+        for roster, props in weeks:
+            fn(roster, lowercase=True)
+            fn(props, lowercase=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2500)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--props-rows-per-player", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    weeks = season_weeks(args.players, args.weeks, args.props_rows_per_player)
+    for roster, props in weeks:
+        for s in (roster, props):
+            pd.testing.assert_series_equal(clean_player_names(s, lowercase=True),
+                                           legacy_clean_player_names(s, lowercase=True))
+    rows = sum(len(r) + len(p) for r, p in weeks)
+    unique = len(pd.unique(np.concatenate([np.concatenate([r.to_numpy(), p.to_numpy()]) for r, p in weeks])))
+    print(f"season: {args.weeks} weeks, {rows} names ({unique} distinct); outputs identical")
+
+    old_s = _time(legacy_clean_player_names, weeks, args.repeat)
+    new_s = _time(clean_player_names, weeks, args.repeat)
+    utils._clean_name.cache_clear()
+    start = time.perf_counter()
+    clean_player_names(weeks[0][0], lowercase=True)
+    clean_player_names(weeks[0][1], lowercase=True)
+    cold_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for roster, props in weeks[1:]:
+        clean_player_names(roster, lowercase=True)
+        clean_player_names(props, lowercase=True)
+    warm_s = (time.perf_counter() - start) / max(1, len(weeks) - 1)
+    print(f"per-row   {old_s:8.3f}s  season")
+    print(f"memoized  {new_s:8.3f}s  season  speedup {old_s / new_s:6.1f}x  "
+          f"(first week {cold_s * 1000:.1f} ms cold, later weeks {warm_s * 1000:.1f} ms warm)")
+    print(f"cache: {utils._clean_name.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
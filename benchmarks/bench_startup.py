@@ -0,0 +1,125 @@
+"""
+Startup cost of the entry points, from `python -X importtime`, against a budget.
+
+    python -m benchmarks.bench_startup [--repeat 5] [--budget-ms 100] [--output startup.json]
+
+Every entry point needs pandas, pyarrow and requests (the floor). Each run imports the
+floor first and the entry point after it, in the same interpreter, so the entry point's
+own line is what it adds on top; the budget applies to that. Live-run-only dependencies
+(the ESPN league client, nfl_data_loader's season utils and roster/player collectors)
+must not be imported at all: src.planning loads them when a live run plans its weeks,
+the daemon when it picks the tracked weeks, PlayerIdResolver when it hunts.
+
+Prints one line per entry point with its largest direct imports; the exit status is 1
+when an entry point is over budget or imports a deferred module.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ENTRY_POINTS = [
+    "player_props_runner",
+    "event_odds_runner",
+    "poll_daemon",
+    "pipeline",
+    "src.action_props_runner",
+    "src.action_games_runner",
+]
+FLOOR = ["pandas", "pyarrow.parquet", "requests"]
+DEFERRED = [
+    "espn_api_orm.league.api",
+    "nfl_data_loader.utils.utils",
+    "nfl_data_loader.api.sources.players.rosters.rosters",
+    "nfl_data_loader.api.sources.players.general.players",
+]
+BUDGET_MS = 100.0
+TOP = 5
+
+
+def importtime(statement: str) -> List[Tuple[int, int, str]]:
+    """(depth, cumulative us, module) per import line of a fresh interpreter running `statement`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((depth, int(cumulative), name.strip()))
+    return rows
+
+
+def top_level_us(rows: List[Tuple[int, int, str]], names: List[str]) -> int:
+    return sum(us for depth, us, name in rows if depth == 0 and name in names)
+
+
+def direct_imports(rows: List[Tuple[int, int, str]], module: str) -> List[Tuple[int, str]]:
+    """(cumulative us, name) of what `module` itself imported first (importtime lists children before parents)."""
+    end = max(i for i, (depth, _, name) in enumerate(rows) if depth == 0 and name == module)
+    out = []
+    for depth, us, name in reversed(rows[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            out.append((us, name))
+    return out
+
+
+def measure(module: str, repeat: int) -> Dict:
+    """
+    Best of `repeat` fresh interpreters importing the floor, then `module`: the module's
+    line is then exactly what it adds on top of the floor.
+    """
+    best = None
+    for _ in range(repeat):
+        rows = importtime(f"import {', '.join(FLOOR)}; import {module}")
+        extra = top_level_us(rows, [module])
+        if best is None or extra < best[1]:
+            best = (top_level_us(rows, FLOOR), extra, rows)
+    floor_us, extra_us, rows = best
+    imported = {name for _, _, name in rows}
+    children = sorted(direct_imports(rows, module), reverse=True)
+    return {
+        "module": module,
+        "total_ms": round((floor_us + extra_us) / 1000, 1),
+        "floor_ms": round(floor_us / 1000, 1),
+        "over_floor_ms": round(extra_us / 1000, 1),
+        "deferred_imported": [name for name in DEFERRED if name in imported],
+        "top_imports": [{"module": name, "ms": round(us / 1000, 1)} for us, name in children[:TOP]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                        help="import time an entry point may add on top of the floor (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", choices=ENTRY_POINTS)
+    parser.add_argument("--output", help="JSON report path (default: none)")
+    args = parser.parse_args()
+
+    results, failures = [], []
+    for module in args.only or ENTRY_POINTS:
+        r = measure(module, args.repeat)
+        results.append(r)
+        top = ", ".join(f"{t['module']} {t['ms']:.0f}" for t in r["top_imports"])
+        print(f"{module:26s} {r['total_ms']:7.1f} ms  (floor {r['floor_ms']:.1f}, +{r['over_floor_ms']:.1f})  top: {top}")
+        if r["over_floor_ms"] > args.budget_ms:
+            failures.append(f"{module}: +{r['over_floor_ms']:.1f} ms over the floor, budget {args.budget_ms:.0f} ms")
+        if r["deferred_imported"]:
+            failures.append(f"{module}: imports deferred {', '.join(r['deferred_imported'])}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget_ms": args.budget_ms, "floor": FLOOR, "deferred": DEFERRED, "results": results},
+                      f, indent=2)
+    for failure in failures:
+        print(f"OVER BUDGET  {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Offline benchmark suite: payload parsing, OPEN backfill, dedupe, merge and season rollup
+for both runners at week, season and multi-season scale. No network access.
+
+    python -m benchmarks.run_suite [--scales week season multi_season] [--only player_props]
+                                   [--repeat 3] [--dedupe-engine numpy] [--output report.json]
+                                   [--baseline previous.json] [--tolerance 0.25]
+
+Prints one line per case and writes a JSON report (stdout when --output is omitted).
+With --baseline, cases slower than baseline * (1 + tolerance) are listed as
+regressions and the exit status is 1.
+
+Props at multi_season scale is ~3M rows and peaks around 5-6 GB RSS.
+"""
+import argparse
+import datetime as dt
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import event_odds_runner
+import player_props_runner
+from benchmarks.bench_player_names import season_weeks
+from benchmarks.synthetic import (
+    make_game_lines_frame, make_player_props_frame, make_props_payload, make_scoreboard_payload,
+)
+from src.action_games_runner import GameLinesClient
+from src.action_props_runner import GamePropsClient
+from src.datasets import GAME_LINES, PLAYER_PROPS
+from src.dedupe import ENGINES, default_engine, set_default_engine
+from src.rollup import SeasonManifest, incremental_rollup
+from src.schemas import GAME_LINES_SCHEMA, PLAYER_PROPS_RAW_SCHEMA, PLAYER_PROPS_SCHEMA
+from src.utils import _clean_name, clean_player_names
+
+warnings.simplefilter("ignore")
+
+# (seasons, weeks per season) per scale
+SCALES: Dict[str, Dict[str, int]] = {
+    "week": {"seasons": 1, "weeks": 1},
+    "season": {"seasons": 1, "weeks": 18},
+    "multi_season": {"seasons": 3, "weeks": 18},
+}
+GAMES_PER_WEEK = 16
+PROP_BET_TYPES = 120          # distinct bet types per props payload
+PROP_PLAYERS_PER_BET_TYPE = 4
+
+
+# ---------------- timing ---------------- #
+def _measure(setup: Callable[[], Any], fn: Callable[[Any], Any], repeat: int,
+             teardown: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+    """Time fn(setup()) `repeat` times; setup/teardown are untimed and the inputs are dropped afterwards."""
+    inputs = setup()
+    times = []
+    out = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(inputs)
+        times.append(time.perf_counter() - start)
+    rows = len(out) if isinstance(out, pd.DataFrame) else out
+    if teardown is not None:
+        teardown(inputs)
+    del inputs, out
+    gc.collect()
+    return {"rows": int(rows), "best_s": min(times), "median_s": statistics.median(times), "repeat": repeat}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ---------------- cases ---------------- #
+# A case is {"runner", "target", "setup", "fn"[, "teardown"]}: setup() builds the (untimed) inputs,
+# fn(inputs) is timed, teardown(inputs) cleans up after the last repeat.
+# Inputs are built per case and released afterwards so multi-season props fit in memory.
+def _frame_cases(runner, name: str, make_frame: Callable[[], pd.DataFrame],
+                 input_schema: pa.Schema, schema: pa.Schema) -> List[Dict[str, Any]]:
+    """ensure_open_lines / keep_only_latest_per_book / merge / rollup over one synthetic frame."""
+    def bumped(df):
+        return df.assign(last_updated=df["last_updated"] + pd.Timedelta(hours=1))
+
+    def persisted():
+        return runner.ensure_open_lines(make_frame())  # what the weekly parquets hold
+
+    def weekly_by_season():
+        by_season = {}
+        for (season, _), part in persisted().groupby(["season", "week"], sort=True):
+            by_season.setdefault(season, []).append(part)
+        return by_season
+
+    def rollup(by_season):
+        # one rollup per season into an empty processed frame, as a first run of the runner does
+        return sum(len(runner.rollup_season(pd.DataFrame(), rows)) for rows in by_season.values())
+
+    def processed_on_disk():
+        # every season already rolled up once; the timed run is a daily in-season run: the
+        # last three weeks come in again (see the runners' update_weeks) and one of them changed
+        by_season, tmp = weekly_by_season(), tempfile.mkdtemp(prefix="bench_rollup_")
+        for season, rows in by_season.items():
+            incremental_rollup(rows, **incremental_kwargs(tmp, season))
+        return by_season, tmp
+
+    def incremental_kwargs(tmp, season):
+        return dict(processed_path=os.path.join(tmp, f"{season}.parquet"),
+                    manifest=SeasonManifest(name, season, root=tmp).load(), rollup=runner.rollup_season,
+                    input_schema=input_schema, schema=schema)
+
+    def incremental(inputs):
+        by_season, tmp = inputs
+        rebuilt = 0
+        for season, rows in by_season.items():
+            kwargs = incremental_kwargs(tmp, season)
+            kwargs["manifest"].weeks[int(rows[-1].week.iloc[0])]["fingerprint"] = None
+            rebuilt += len(incremental_rollup(rows[-3:], **kwargs)[0])
+        return rebuilt
+
+    cases = [
+        ("ensure_open_lines", make_frame, runner.ensure_open_lines),
+        ("keep_only_latest_per_book", lambda: (lambda p: pd.concat([p, bumped(p)], ignore_index=True))(persisted()),
+         runner.keep_only_latest_per_book),
+        ("merge_with_existing_and_dedupe", lambda: (persisted(), bumped(make_frame())),
+         lambda a: runner.merge_with_existing_and_dedupe(a[0].copy(), a[1])),
+        ("rollup_season", weekly_by_season, rollup),
+    ]
+    out = [{"runner": name, "target": t, "setup": setup, "fn": fn} for t, setup, fn in cases]
+    out.append({"runner": name, "target": "incremental_rollup (1 of 3 weeks changed)", "setup": processed_on_disk,
+                "fn": incremental, "teardown": lambda inputs: shutil.rmtree(inputs[1], ignore_errors=True)})
+    return out
+
+
+def build_cases(scale: str, only: str) -> List[Dict[str, Any]]:
+    seasons, weeks = SCALES[scale]["seasons"], SCALES[scale]["weeks"]
+    n_weeks = seasons * weeks
+    season_list = tuple(range(2024 - seasons + 1, 2025))
+    cases = []
+
+    if only in ("all", "game_lines"):
+        lines_client = GameLinesClient()
+        cases.append({
+            "runner": "game_lines", "target": "GameLinesClient._parse_game_markets_flat",
+            "setup": lambda: make_scoreboard_payload(n_games=GAMES_PER_WEEK)["games"],
+            # the same week's payload parsed once per week in scale
+            "fn": lambda games: sum(len(lines_client._parse_game_markets_flat(games)) for _ in range(n_weeks)),
+        })
+        cases += _frame_cases(event_odds_runner, GAME_LINES, lambda: make_game_lines_frame(
+            seasons=season_list, weeks=weeks, games_per_week=GAMES_PER_WEEK), GAME_LINES_SCHEMA, GAME_LINES_SCHEMA)
+
+    if only in ("all", "player_props"):
+        props_client = GamePropsClient()
+        cases.append({
+            "runner": "player_props", "target": "GamePropsClient._props_blob_to_df",
+            "setup": lambda: [make_props_payload(game_id=190000 + g, n_bet_types=PROP_BET_TYPES,
+                                                 players_per_bet_type=PROP_PLAYERS_PER_BET_TYPE)["player_props"]
+                              for g in range(GAMES_PER_WEEK)],
+            "fn": lambda blobs: sum(len(props_client._props_blob_to_df(b, "player"))
+                                    for _ in range(n_weeks) for b in blobs),
+        })
+        cases.append({
+            "runner": "player_props", "target": "clean_player_names (roster + props)",
+            "setup": lambda: season_weeks(players=2500, weeks=n_weeks, props_rows_per_player=48),
+            # a cold name cache each repeat: one run of the runner
+            "fn": lambda weeks: (_clean_name.cache_clear(), sum(
+                len(clean_player_names(s, lowercase=True)) for week in weeks for s in week))[1],
+        })
+        cases += _frame_cases(player_props_runner, PLAYER_PROPS, lambda: make_player_props_frame(
+            seasons=season_list, weeks=weeks, games_per_week=GAMES_PER_WEEK), PLAYER_PROPS_RAW_SCHEMA,
+            PLAYER_PROPS_SCHEMA)
+    return cases
+
+
+# ---------------- report ---------------- #
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Case names whose best time regressed by more than `tolerance` against the baseline report."""
+    base = {(r["runner"], r["target"], r["scale"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        prev = base.get((r["runner"], r["target"], r["scale"]))
+        if prev is None:
+            continue
+        r["baseline_best_s"] = prev["best_s"]
+        r["ratio"] = r["best_s"] / prev["best_s"] if prev["best_s"] else float("inf")
+        if r["ratio"] > 1.0 + tolerance:
+            regressions.append(f"{r['runner']}:{r['target']}@{r['scale']} {r['ratio']:.2f}x")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--only", choices=["all", "game_lines", "player_props"], default="all")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dedupe-engine", choices=ENGINES, help="engine behind keep_only_latest_per_book / merge")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    if args.dedupe_engine:
+        set_default_engine(args.dedupe_engine)
+
+    results = []
+    for scale in args.scales:
+        for case in build_cases(scale, args.only):
+            r = {"runner": case["runner"], "target": case["target"], "scale": scale,
+                 **_measure(case["setup"], case["fn"], args.repeat, case.get("teardown"))}
+            print(f"{r['runner']:<13} {r['target']:<42} {scale:<13} rows={r['rows']:>9}  "
+                  f"best {r['best_s']:8.3f}s  median {r['median_s']:8.3f}s", file=sys.stderr)
+            results.append(r)
+
+    report = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "dedupe_engine": default_engine(),
+            "platform": platform.platform(),
+            "scales": {s: SCALES[s] for s in args.scales},
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Synthetic, network-free data shaped like what the runners persist.
+
+Sizes are driven by a few knobs so the same generators cover a single week,
+a full season and multi-season backfills.
+"""
+import datetime as dt
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+BOOK_IDS = [15, 30, 68, 69, 79]
+PERIODS = ["event", "firsthalf", "secondhalf",
+           "firstquarter", "secondquarter", "thirdquarter", "fourthquarter"]
+LINE_SIDES = {"moneyline": ["home", "away"], "spread": ["home", "away"], "total": ["over", "under"]}
+
+
+def make_game_lines_frame(
+    *,
+    seasons: Iterable[int] = (2024,),
+    weeks: int = 18,
+    games_per_week: int = 16,
+    book_ids: Iterable[int] = BOOK_IDS,
+    open_share: float = 0.6,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Flat game-lines frame (one row per event/book/period/line_type/side).
+
+    Only `open_share` of the (event, period, line_type) groups carry book 30,
+    the rest need the OPEN backfill.
+    """
+    rng = np.random.default_rng(seed)
+    book_ids = list(book_ids)
+    parts = []
+    event_id = 200000
+    for season in seasons:
+        for week in range(1, weeks + 1):
+            for _ in range(games_per_week):
+                event_id += 1
+                home, away = rng.choice(np.arange(100, 132), size=2, replace=False)
+                for period in PERIODS:
+                    for line_type, sides in LINE_SIDES.items():
+                        books = book_ids if rng.random() < open_share else [b for b in book_ids if b != 30]
+                        for side in sides:
+                            team_id = 0 if line_type == "total" else (home if side == "home" else away)
+                            parts.append((line_type, event_id, period, side, team_id, season, week, books))
+    rows = [(lt, ev, b, per, side, tid, s, w) for lt, ev, per, side, tid, s, w, books in parts for b in books]
+    df = pd.DataFrame(rows, columns=["line_type", "event_id", "book_id", "period", "side", "team_id", "season", "week"])
+    n = len(df)
+    df["value"] = rng.choice(np.arange(-14.5, 55.0, 0.5), size=n)
+    df["odds"] = rng.integers(-250, 250, size=n)
+    df["team"] = df["team_id"].map(lambda t: f"T{t}" if t else None)
+    df["total_bets_on_event"] = rng.integers(1000, 500000, size=n)
+    df["tickets_percent"] = rng.integers(0, 100, size=n).astype(float)
+    df["money_percent"] = rng.integers(0, 100, size=n).astype(float)
+    df["last_updated"] = dt.datetime(2025, 1, 1) + pd.to_timedelta(rng.integers(0, 3600, size=n), unit="s")
+    return df
+
+
+def make_player_props_frame(
+    *,
+    seasons: Iterable[int] = (2024,),
+    weeks: int = 18,
+    games_per_week: int = 16,
+    players_per_game: int = 30,
+    bet_types_per_player: int = 12,
+    book_ids: Iterable[int] = BOOK_IDS,
+    open_share: float = 0.6,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Flat player-props frame in the weekly parquet layout (pre player-id mapping)."""
+    rng = np.random.default_rng(seed)
+    book_ids = list(book_ids)
+    bet_types = [f"bet_type_{i}" for i in range(max(bet_types_per_player * 3, 1))]
+    positions = [("QB", "quarterback"), ("RB", "running_back"), ("WR", "receiver"), ("TE", "receiver")]
+    rows = []
+    event_id = 190000
+    for season in seasons:
+        for week in range(1, weeks + 1):
+            for _ in range(games_per_week):
+                event_id += 1
+                for p in range(players_per_game):
+                    player_id = 1000 + (event_id * 7 + p) % 4000
+                    position, position_group = positions[p % len(positions)]
+                    team = f"T{p % 2}"
+                    for bet_type in rng.choice(bet_types, size=bet_types_per_player, replace=False):
+                        books = book_ids if rng.random() < open_share else [b for b in book_ids if b != 30]
+                        for side in ("over", "under"):
+                            for b in books:
+                                rows.append((bet_type, event_id, b, float(player_id), "total", "event", side,
+                                             team, f"p.player{player_id}", position, position_group, season, week))
+    df = pd.DataFrame(rows, columns=["bet_type", "event_id", "book_id", "player_id", "line_type", "period", "side",
+                                     "team", "join_name", "position", "position_group", "season", "week"])
+    n = len(df)
+    df["value"] = rng.choice(np.arange(0.5, 350.0, 1.0), size=n)
+    df["odds"] = rng.integers(-250, 250, size=n)
+    df["total_bets_on_event"] = rng.integers(1000, 500000, size=n)
+    df["last_updated"] = dt.datetime(2025, 1, 1) + pd.to_timedelta(rng.integers(0, 3600, size=n), unit="s")
+    return df
+
+
+# ---------------- Action Network-shaped payloads ---------------- #
+def make_scoreboard_payload(
+    *,
+    season: int = 2024,
+    week: int = 1,
+    n_games: int = 16,
+    book_ids: Iterable[int] = BOOK_IDS,
+    periods: Iterable[str] = PERIODS,
+    seed: int = 0,
+) -> dict:
+    """`/web/v2/scoreboard/nfl` response: games with markets[book][period][line_type] outcomes."""
+    rng = np.random.default_rng(seed)
+    games = []
+    for g in range(n_games):
+        event_id = 200000 + season * 100 + week * 20 + g
+        home, away = (int(t) for t in rng.choice(np.arange(100, 132), size=2, replace=False))
+        markets = {}
+        for b in book_ids:
+            book_blob = {}
+            for period in periods:
+                period_blob = {}
+                for line_type, sides in LINE_SIDES.items():
+                    offers = []
+                    for side in sides:
+                        team_id = 0 if line_type == "total" else (home if side == "home" else away)
+                        offers.append({
+                            "event_id": event_id, "market_id": int(rng.integers(1, 10**7)),
+                            "outcome_id": int(rng.integers(1, 10**9)), "type": line_type, "period": period,
+                            "side": side, "team_id": team_id, "value": float(rng.choice(np.arange(-14.5, 55, 0.5))),
+                            "odds": int(rng.integers(-250, 250)), "is_live": False, "line_status": "opened",
+                            "deeplink_id": None, "odds_coefficient_score": None, "player_id": 0,
+                            "competitor_id": 0, "option_type_id": None,
+                            "bet_info": {"tickets": {"value": int(rng.integers(0, 5000)), "percent": int(rng.integers(0, 100))},
+                                         "money": {"value": int(rng.integers(0, 5000)), "percent": int(rng.integers(0, 100))}},
+                        })
+                    period_blob[line_type] = offers
+                book_blob[period] = period_blob
+            markets[str(b)] = book_blob
+        games.append({
+            "id": event_id, "season": season, "week": week, "type": "reg", "status": "scheduled",
+            "real_status": "scheduled", "start_time": f"{season}-09-{(week % 28) + 1:02d}T17:00:00.000Z",
+            "num_bets": int(rng.integers(1000, 500000)), "league_name": "nfl", "core_id": event_id,
+            "home_team_id": home, "away_team_id": away, "home_rotation_number": 100 + 2 * g,
+            "away_rotation_number": 101 + 2 * g, "broadcast": {"network": "CBS", "network_short": "CBS"},
+            "teams": [{"id": home, "abbr": f"T{home}"}, {"id": away, "abbr": f"T{away}"}],
+            "markets": markets,
+        })
+    return {"games": games}
+
+
+def make_props_payload(
+    *,
+    game_id: int = 190001,
+    n_bet_types: int = 60,
+    players_per_bet_type: int = 12,
+    book_ids: Iterable[int] = BOOK_IDS,
+    seed: int = 0,
+) -> dict:
+    """`/web/v2/games/{id}/props` response: player_props / game_props keyed by core bet type."""
+    rng = np.random.default_rng(seed + game_id)
+    player_ids = [int(p) for p in rng.integers(1000, 200000, size=players_per_bet_type * 2)]
+
+    def _offers(book_id, player_id, team_id, value):
+        return [{
+            "event_id": game_id, "book_id": book_id, "option_type_id": 1 if side == "over" else 2, "side": side,
+            "period": "event", "player_id": player_id, "team_id": team_id, "competitor_id": 0,
+            "value": value, "odds": int(rng.integers(-250, 250)), "is_live": False, "line_status": "opened",
+            "deeplink_id": None, "prop_type_id": 1, "odds_coefficient_score": None,
+            "outcome_id": int(rng.integers(1, 10**9)),
+            "bet_info": {"tickets": {"value": 0, "percent": 0}, "money": {"value": 0, "percent": 0}},
+        } for side in ("over", "under")]
+
+    player_props = {}
+    for k in range(n_bet_types):
+        key = f"core_bet_type_{k}_synthetic_prop"
+        markets = []
+        for p in rng.choice(player_ids, size=players_per_bet_type, replace=False):
+            value = float(rng.choice(np.arange(0.5, 350, 1.0)))
+            lines = {str(b): _offers(b, int(p), 100 + int(p) % 2, value) for b in book_ids}
+            markets.append({"id": int(rng.integers(1, 10**7)), "market_id": int(rng.integers(1, 10**7)),
+                            "type": key, "line_type": "total", "custom_pick_type_name": None,
+                            "custom_pick_type_display_name": None, "lines": lines})
+        player_props[key] = markets
+    game_props = {"core_bet_type_6_team_score": [{
+        "id": 1, "type": "core_bet_type_6_team_score", "line_type": "total",
+        "lines": {str(b): _offers(b, None, team_id, 23.5) for b in book_ids for team_id in (100, 101)},
+    }]}
+    players = {str(p): {"id": p, "player_id": p, "abbr": f"P. Player{p}", "display_text": f"P. Player{p} - WR",
+                        "team_id": 100 + p % 2, "image": "https://example.invalid/img.png"} for p in player_ids}
+    return {"player_props": player_props, "game_props": game_props, "players": players}
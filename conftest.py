@@ -0,0 +1 @@
+# Lets `pytest` import `src` (and the runner modules) from the repo root without installing anything.
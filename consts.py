@@ -1,4 +1,12 @@
-ACTION_NETWORK_ID_MAPPER = {'1616': '00-0023459', '4583': '00-0025565', '4733': '00-0026158', '1594': '00-0026498', '1789': '00-0026858', '2104': '00-0029263', '1043': '00-0029822', '789': '00-0029892', '1668': '00-0030035', '1394': '00-0030061', '1511': '00-0030098', '5022': '00-0030279', '4493': '00-0030431', '1226': '00-0030506', '1096': '00-0030564', '585': '00-0030565', '825': '00-0031136', '1228': '00-0031203', '1912': '00-0031236', '1662': '00-0031381', '1750': '00-0031408', '5587': '00-0031484', '946': '00-0031492', '1703': '00-0031588', '1578': '00-0031595', '4723': '00-0031610', '741': '00-0031687', '2135': '00-0032211', '5258': '00-0032385', '5539': '00-0032392', '5725': '00-0032394', '4720': '00-0032398', '7663': '00-0032464', '7697': '00-0032569', '4594': '00-0032688', '4970': '00-0032726', '4912': '00-0032764', '5061': '00-0032775', '7593': '00-0032918', '5408': '00-0032951', '5054': '00-0033040', '5108': '00-0033077', '5794': '00-0033090', '7729': '00-0033106', '7725': '00-0033110', '62949': '00-0033217', '57928': '00-0033246', '54135': '00-0033280', '59181': '00-0033281', '54786': '00-0033282', '58505': '00-0033288', '62997': '00-0033293', '63003': '00-0033303', '54449': '00-0033307', '63248': '00-0033357', '63030': '00-0033375', '59864': '00-0033376', '62322': '00-0033526', '60246': '00-0033553', '54651': '00-0033555', '58616': '00-0033572', '58506': '00-0033576', '62308': '00-0033589', '63005': '00-0033591', '63090': '00-0033699', '59023': '00-0033702', '54098': '00-0033757', '59014': '00-0033787', '60209': '00-0033854', '62304': '00-0033857', '57919': '00-0033858', '54623': '00-0033873', '58504': '00-0033881', '62975': '00-0033885', '54089': '00-0033891', '62984': '00-0033897', '62989': '00-0033906', '57816': '00-0033908', '62324': '00-0033921', '63026': '00-0033923', '54655': '00-0033943', '60254': '00-0033955', '87636': '00-0034159', '87559': '00-0034161', '87633': '00-0034270', '87696': '00-0034272', '84234': '00-0034348', '83095': '00-0034351', '83099': '00-0034365', '83100': '00-0034383', '87661': '00-0034386', '87700': '00-0034407', '87861': '00-0034411', '84222': '00-0034418', '87648': '00-0034419', '87917': '00-0034487', '84229': '00-0034521', '88051': '00-0034613', '83086': '00-0034753', '84214': '00-0034775', '60212': '00-0034791', '87862': '00-0034794', '82640': '00-0034796', '87490': '00-0034798', '84216': '00-0034827', '83090': '00-0034829', '84236': '00-0034837', '83191': '00-0034844', '90067': '00-0034854', '82644': '00-0034855', '82643': '00-0034857', '84239': '00-0034860', '82642': '00-0034869', '108628': '00-0034928', '111833': '00-0034960', '111935': '00-0034970', '111897': '00-0034972', '111783': '00-0034975', '111886': '00-0034981', '108203': '00-0034983', '108474': '00-0035021', '108781': '00-0035045', '111840': '00-0035125', '111936': '00-0035140', '108839': '00-0035192', '108538': '00-0035208', '111816': '00-0035216', '111924': '00-0035228', '111902': '00-0035229', '111852': '00-0035243', '111923': '00-0035249', '111892': '00-0035250', '108171': '00-0035261', '111777': '00-0035269', '111869': '00-0035291', '108252': '00-0035298', '108334': '00-0035341', '108885': '00-0035358', '111895': '00-0035406', '111867': '00-0035500', '111845': '00-0035535', '108254': '00-0035537', '108907': '00-0035567', '111379': '00-0035594', '83208': '00-0035628', '111807': '00-0035631', '111836': '00-0035640', '111851': '00-0035644', '108148': '00-0035659', '111218': '00-0035662', '109857': '00-0035676', '109850': '00-0035685', '109855': '00-0035689', '110717': '00-0035700', '111426': '00-0035710', '110810': '00-0035719', '147349': '00-0035891', '147267': '00-0035934', '147212': '00-0035973', '147078': '00-0036020', '147237': '00-0036040', '146916': '00-0036133', '147180': '00-0036139', '146760': '00-0036158', '146914': '00-0036162', '146890': '00-0036165', '146986': '00-0036176', '147391': '00-0036182', '147046': '00-0036187', '146706': '00-0036212', '146756': '00-0036223', '146880': '00-0036232', '146822': '00-0036244', '146742': '00-0036252', '146934': '00-0036259', '146727': '00-0036261', '146731': '00-0036264', '146767': '00-0036265', '146738': '00-0036268', '146765': '00-0036275', '146737': '00-0036290', '146757': '00-0036292', '146810': '00-0036297', '146859': '00-0036309', '146710': '00-0036322', '146800': '00-0036328', '146807': '00-0036331', '146787': '00-0036332', '146832': '00-0036345', '146733': '00-0036355', '146721': '00-0036358', '146718': '00-0036360', '146703': '00-0036387', '146747': '00-0036389', '146730': '00-0036407', '146749': '00-0036410', '146752': '00-0036415', '146784': '00-0036422', '146856': '00-0036427', '146898': '00-0036429', '146707': '00-0036442', '164111': '00-0036463', '166745': '00-0036497', '166809': '00-0036534', '166302': '00-0036550', '166419': '00-0036554', '166368': '00-0036555', '166500': '00-0036556', '166494': '00-0036567', '166712': '00-0036590', '166276': '00-0036613', '166315': '00-0036620', '166400': '00-0036626', '166366': '00-0036628', '166389': '00-0036630', '166457': '00-0036635', '166527': '00-0036637', '166456': '00-0036646', '166675': '00-0036741', '166589': '00-0036754', '166679': '00-0036755', '166424': '00-0036825', '166524': '00-0036841', '166371': '00-0036842', '166332': '00-0036849', '166510': '00-0036854', '166468': '00-0036862', '166374': '00-0036875', '166382': '00-0036876', '166493': '00-0036887', '166283': '00-0036893', '166328': '00-0036894', '166304': '00-0036900', '166427': '00-0036906', '166278': '00-0036912', '166540': '00-0036919', '166379': '00-0036924', '166323': '00-0036936', '166300': '00-0036945', '168551': '00-0036959', '166275': '00-0036970', '166294': '00-0036971', '166293': '00-0036973', '166335': '00-0036980', '166352': '00-0036984', '166403': '00-0036988', '166333': '00-0036997', '166409': '00-0037004', '166353': '00-0037005', '195281': '00-0037085', '195283': '00-0037086', '195290': '00-0037093', '195683': '00-0037112', '195468': '00-0037120', '195704': '00-0037132', '195293': '00-0037197', '195760': '00-0037224', '195431': '00-0037228', '195545': '00-0037231', '194998': '00-0037238', '194993': '00-0037239', '195000': '00-0037240', '195054': '00-0037247', '195079': '00-0037248', '195127': '00-0037252', '195104': '00-0037256', '195168': '00-0037258', '195195': '00-0037261', '195231': '00-0037263', '195222': '00-0037267', '195214': '00-0037276', '195193': '00-0037277', '195247': '00-0037291', '195255': '00-0037304', '195268': '00-0037306', '195282': '00-0037311', '195841': '00-0037382', '196072': '00-0037429', '195440': '00-0037475', '196000': '00-0037509', '195488': '00-0037525', '195606': '00-0037539', '195610': '00-0037545', '195537': '00-0037557', '195607': '00-0037594', '195058': '00-0037614', '195185': '00-0037617', '196105': '00-0037654', '195077': '00-0037664', '195129': '00-0037666', '248020': '00-0037692', '195004': '00-0037740', '195021': '00-0037741', '194996': '00-0037742', '195066': '00-0037744', '195113': '00-0037746', '199625': '00-0037801', '195097': '00-0037805', '195157': '00-0037809', '195165': '00-0037816', '195321': '00-0037834', '195176': '00-0037837', '195188': '00-0037838', '195196': '00-0037840', '195163': '00-0038040', '195187': '00-0038041', '195158': '00-0038046', '195057': '00-0038090', '195171': '00-0038092', '195172': '00-0038098', '195068': '00-0038104', '195161': '00-0038115', '195060': '00-0038117', '195083': '00-0038120', '195062': '00-0038124', '195184': '00-0038129', '195056': '00-0038134', '244009': '00-0038181', '242414': '00-0038359', '242171': '00-0038393', '242103': '00-0038394', '242064': '00-0038396', '243108': '00-0038454', '242393': '00-0038465', '242664': '00-0038477', '242690': '00-0038489', '242666': '00-0038496', '242733': '00-0038519', '241851': '00-0038542', '241855': '00-0038543', '241844': '00-0038544', '241935': '00-0038547', '241920': '00-0038551', '241892': '00-0038555', '241951': '00-0038558', '241955': '00-0038559', '241923': '00-0038562', '241947': '00-0038563', '242141': '00-0038567', '242046': '00-0038573', '242096': '00-0038576', '242170': '00-0038589', '242147': '00-0038590', '242035': '00-0038597', '242168': '00-0038606', '242029': '00-0038608', '242138': '00-0038611', '242128': '00-0038612', '242085': '00-0038618', '242086': '00-0038619', '242048': '00-0038621', '242163': '00-0038622', '242111': '00-0038636', '242034': '00-0038640', '242173': '00-0038643', '243111': '00-0038679', '243094': '00-0038685', '242386': '00-0038705', '242426': '00-0038710', '243101': '00-0038720', '243812': '00-0038735', '243815': '00-0038738', '242475': '00-0038752', '243368': '00-0038783', '243401': '00-0038794', '243957': '00-0038797', '242293': '00-0038809', '243286': '00-0038824', '242066': '00-0038905', '242423': '00-0038930', '241847': '00-0038933', '241942': '00-0038935', '241908': '00-0038938', '242144': '00-0038941', '243411': '00-0038951', '243381': '00-0038953', '241921': '00-0038976', '241944': '00-0038979', '241831': '00-0038994', '241911': '00-0038996', '241902': '00-0038997', '242088': '00-0039021', '241939': '00-0039032', '241887': '00-0039040', '242078': '00-0039041', '242053': '00-0039050', '242124': '00-0039052', '241922': '00-0039062', '241838': '00-0039064', '241912': '00-0039065', '241919': '00-0039066', '241932': '00-0039067', '242015': '00-0039074', '242118': '00-0039075', '241840': '00-0039139', '241926': '00-0039144', '241931': '00-0039146', '241861': '00-0039150', '241856': '00-0039163', '241850': '00-0039164', '241898': '00-0039165', '249961': '00-0039172', '277315': '00-0039236', '277723': '00-0039299', '277712': '00-0039305', '278255': '00-0039325', '277043': '00-0039337', '277049': '00-0039338', '277068': '00-0039342', '277154': '00-0039355', '277190': '00-0039356', '277209': '00-0039359', '277211': '00-0039361', '277215': '00-0039363', '277218': '00-0039364', '277221': '00-0039365', '277279': '00-0039376', '277284': '00-0039379', '277293': '00-0039384', '277297': '00-0039386', '277311': '00-0039391', '277317': '00-0039394', '277321': '00-0039397', '277333': '00-0039404', '277338': '00-0039407', '277342': '00-0039409', '277346': '00-0039410', '277355': '00-0039415', '277363': '00-0039424', '277630': '00-0039471', '277660': '00-0039491', '277499': '00-0039521', '277761': '00-0039530', '278232': '00-0039552', '278193': '00-0039576', '277684': '00-0039589', '277464': '00-0039623', '277722': '00-0039631', '278710': '00-0039648', '277418': '00-0039664', '277468': '00-0039703', '277048': '00-0039732', '277136': '00-0039737', '277137': '00-0039738', '277138': '00-0039739', '277213': '00-0039746', '277280': '00-0039747', '277339': '00-0039750', '277343': '00-0039751', '277374': '00-0039754', '277200': '00-0039792', '277207': '00-0039793', '277220': '00-0039794', '277292': '00-0039796', '277300': '00-0039798', '277134': '00-0039810', '277142': '00-0039811', '277271': '00-0039816', '277217': '00-0039824', '277195': '00-0039847', '277041': '00-0039849', '277040': '00-0039851', '277223': '00-0039853', '277146': '00-0039855', '277224': '00-0039868', '277225': '00-0039874', '277214': '00-0039875', '277314': '00-0039880', '277369': '00-0039884', '277106': '00-0039890', '277059': '00-0039893', '277064': '00-0039894', '277087': '00-0039901', '277091': '00-0039907', '277039': '00-0039910', '277107': '00-0039912', '277088': '00-0039915', '277067': '00-0039916', '277045': '00-0039917', '277038': '00-0039918', '277069': '00-0039919', '277119': '00-0039920', '277120': '00-0039921', '277046': '00-0039923', '305065': '00-0040009', '305238': '00-0040021', '305185': '00-0040074', '305202': '00-0040075', '305227': '00-0040078', '304952': '00-0040122', '304954': '00-0040124', '304956': '00-0040126', '304960': '00-0040128', '304965': '00-0040129', '305012': '00-0040130', '305052': '00-0040134', '305057': '00-0040138', '305080': '00-0040154', '305125': '00-0040162', '305127': '00-0040164', '305135': '00-0040170', '305137': '00-0040172', '305146': '00-0040177', '305150': '00-0040179', '305157': '00-0040184', '305162': '00-0040187', '305164': '00-0040189', '158051': '00-0040194', '305172': '00-0040194', '305183': '00-0040202', '305187': '00-0040205', '305192': '00-0040208', '305201': '00-0040215', '305207': '00-0040218', '305212': '00-0040220', '305232': '00-0040236', '305234': '00-0040237', '305235': '00-0040238', '305239': '00-0040239', '305243': '00-0040241', '305244': '00-0040242', '305251': '00-0040247', '305254': '00-0040250', '305536': '00-0040279', '305398': '00-0040466', '305661': '00-0040522', '305572': '00-0040567', '305109': '00-0040582', '305115': '00-0040583', '305119': '00-0040584', '305148': '00-0040586', '305241': '00-0040590', '305907': '00-0040616', '305113': '00-0040644', '305132': '00-0040646', '305165': '00-0040648', '305222': '00-0040651', '305045': '00-0040663', '304968': '00-0040666', '304969': '00-0040667', '305048': '00-0040669', '304947': '00-0040676', '305116': '00-0040692', '305102': '00-0040705', '305104': '00-0040715', '304948': '00-0040718', '305103': '00-0040719', '305033': '00-0040727', '305036': '00-0040729', '305038': '00-0040730', '305016': '00-0040734', '305017': '00-0040735', '305020': '00-0040736', '305024': '00-0040737', '305028': '00-0040739', '305018': '00-0040743', '220433': '00-PHI16021', '220457': '00-DAL16006', '220444': '00-KC16012', '220453': '00-LAC16024', '220432': '00-NE16017', '220445': '00-LV16013', '220442': '00-CLE16005', '220446': '00-CIN16004', '220426': '00-ARI16022', '220435': '00-NO16018', '220434': '00-WAS16028', '220437': '00-NYG16019', '220443': '00-JAX16030', '220455': '00-CAR16029', '220427': '00-IND16011', '220431': '00-MIA16015', '220438': '00-NYJ16020', '220452': '00-PIT16023', '220441': '00-TB16027', '220447': '00-ATL16001', '220430': '00-TEN16010', '220439': '00-DEN16007', '220428': '00-SF16025', '220449': '00-SEA16026', '220436': '00-HOU16034', '220454': '00-LAR16014', '220440': '00-GB16009', '220448': '00-DET16008', '220450': '00-BAL16033', '220456': '00-BUF16002', '220429': '00-CHI16003', '220451': '00-MIN16016', '1894': '00-0027962', '830': '00-0027969', '2112': '00-0029255', '1752': '00-0029562', '1544': '00-0029604', '1671': '00-0029606', '596': '00-0029607', '5281': '00-0030063', '1641': '00-0030757', '976': '00-0031054', '788': '00-0031177', '1301': '00-0031270', '1989': '00-0031298', '1707': '00-0031565', '1582': '00-0031608', '6583': '00-0031898', '562': '00-0031933', '1162': '00-0032103', '827': '00-0032146', '5174': '00-0032265', '5683': '00-0032378', '5718': '00-0032387', '5352': '00-0032399', '5089': '00-0032762', '5245': '00-0032774', '5348': '00-0032889', '7776': '00-0033051', '4611': '00-0033066', '7780': '00-0033120', '33935': '00-0033132', '60007': '00-0033297', '59178': '00-0033393', '60118': '00-0033537', '54607': '00-0033868', '59984': '00-0033876', '62973': '00-0033877', '63034': '00-0033883', '62976': '00-0033886', '60110': '00-0033890', '62988': '00-0033914', '59895': '00-0033935', '88219': '00-0034116', '87527': '00-0034275', '87536': '00-0034277', '87877': '00-0034285', '88193': '00-0034302', '84348': '00-0034333', '84215': '00-0034353', '87573': '00-0034357', '87616': '00-0034359', '87562': '00-0034376', '87518': '00-0034387', '87384': '00-0034397', '87875': '00-0034431', '87911': '00-0034485', '87578': '00-0034673', '87713': '00-0034675', '87431': '00-0034677', '87403': '00-0034760', '84346': '00-0034773', '87670': '00-0034790', '87683': '00-0034800', '87624': '00-0034805', '87505': '00-0034815', '87539': '00-0034818', '87690': '00-0034825', '87553': '00-0034843', '87596': '00-0034856', '87570': '00-0034874', '166334': '00-0036974', '111882': '00-0034967', '108173': '00-0034973', '111889': '00-0034974', '111819': '00-0035026', '108698': '00-0035133', '111773': '00-0035144', '108808': '00-0035166', '108479': '00-0035227', '111789': '00-0035230', '111905': '00-0035236', '108122': '00-0035239', '108120': '00-0035240', '111856': '00-0035248', '111876': '00-0035254', '108193': '00-0035262', '108200': '00-0035276', '108210': '00-0035277', '108238': '00-0035301', '108281': '00-0035316', '108335': '00-0035357', '111891': '00-0035386', '111217': '00-0035402', '111849': '00-0035409', '108070': '00-0035525', '108496': '00-0035617', '111893': '00-0035632', '111933': '00-0035633', '108069': '00-0035636', '111376': '00-0035643', '108980': '00-0035645', '111932': '00-0035647', '111860': '00-0035663', '108275': '00-0035669', '108146': '00-0035680', '109854': '00-0035683', '108143': '00-0035687', '110698': '00-0035699', '110721': '00-0035705', '110815': '00-0035713', '110812': '00-0035717', '110811': '00-0035718', '147245': '00-0035763', '147122': '00-0035806', '146846': '00-0036081', '147225': '00-0036087', '147068': '00-0036124', '146791': '00-0036130', '146743': '00-0036192', '146783': '00-0036193', '146949': '00-0036199', '146720': '00-0036220', '146809': '00-0036221', '146740': '00-0036231', '146778': '00-0036266', '146739': '00-0036282', '146705': '00-0036285', '146772': '00-0036294', '146862': '00-0036302', '146719': '00-0036321', '146726': '00-0036323', '146776': '00-0036333', '146876': '00-0036338', '146919': '00-0036348', '146962': '00-0036349', '146736': '00-0036361', '146855': '00-0036374', '146827': '00-0036375', '146857': '00-0036378', '146922': '00-0036380', '146766': '00-0036388', '146732': '00-0036409', '146741': '00-0036411', '146786': '00-0036418', '146835': '00-0036425', '146884': '00-0036428', '166286': '00-0036479', '166433': '00-0036500', '166435': '00-0036501', '166531': '00-0036563', '166321': '00-0036621', '166405': '00-0036624', '166501': '00-0036658', '166482': '00-0036661', '166735': '00-0036682', '166731': '00-0036683', '166764': '00-0036728', '166555': '00-0036843', '166358': '00-0036870', '166284': '00-0036874', '166298': '00-0036914', '166317': '00-0036915', '166308': '00-0036927', '166285': '00-0036933', '166281': '00-0036940', '166341': '00-0036942', '166289': '00-0036944', '166548': '00-0036948', '166483': '00-0036952', '166307': '00-0036954', '166361': '00-0036964', '166404': '00-0036989', '166274': '00-0036996', '195003': '00-0037073', '195022': '00-0037074', '194999': '00-0037075', '195223': '00-0037079', '195207': '00-0037083', '195707': '00-0037130', '195657': '00-0037141', '196047': '00-0037155', '196055': '00-0037156', '195012': '00-0037190', '194994': '00-0037191', '195014': '00-0037192', '195053': '00-0037193', '195322': '00-0037198', '195754': '00-0037203', '195681': '00-0037208', '195023': '00-0037236', '195008': '00-0037237', '195071': '00-0037246', '195069': '00-0037249', '195120': '00-0037250', '195099': '00-0037251', '195122': '00-0037253', '195108': '00-0037254', '195095': '00-0037257', '195210': '00-0037268', '195219': '00-0037270', '195203': '00-0037271', '195216': '00-0037281', '195260': '00-0037288', '195256': '00-0037289', '195274': '00-0037294', '195267': '00-0037299', '195278': '00-0037307', '195310': '00-0037320', '195323': '00-0037323', '195839': '00-0037384', '195906': '00-0037422', '195485': '00-0037527', '195953': '00-0037561', '195955': '00-0037578', '194995': '00-0037611', '195090': '00-0037615', '195098': '00-0037616', '196129': '00-0037661', '195020': '00-0037663', '195101': '00-0037667', '199124': '00-0037711', '195072': '00-0037753', '195103': '00-0037755', '195111': '00-0037756', '195067': '00-0037810', '195131': '00-0037819', '195159': '00-0037839', '195275': '00-0037841', '195018': '00-0038038', '195063': '00-0038096', '195167': '00-0038100', '195169': '00-0038106', '195164': '00-0038107', '195070': '00-0038111', '195174': '00-0038119', '195084': '00-0038121', '195059': '00-0038125', '195081': '00-0038130', '195064': '00-0038133', '195073': '00-0038135', '195181': '00-0038136', '195065': '00-0038142', '206050': '00-0038145', '241837': '00-0038386', '242040': '00-0038391', '242092': '00-0038407', '242162': '00-0038408', '242121': '00-0038412', '243114': '00-0038456', '241937': '00-0038504', '242136': '00-0038505', '241910': '00-0038535', '241858': '00-0038541', '241854': '00-0038545', '241925': '00-0038552', '241906': '00-0038553', '241896': '00-0038554', '241928': '00-0038556', '241954': '00-0038557', '242129': '00-0038568', '242110': '00-0038574', '242077': '00-0038577', '242115': '00-0038585', '242083': '00-0038588', '242101': '00-0038594', '242159': '00-0038599', '242125': '00-0038600', '242022': '00-0038603', '242149': '00-0038605', '242155': '00-0038623', '242174': '00-0038625', '242019': '00-0038646', '242739': '00-0038663', '242707': '00-0038711', '242712': '00-0038715', '242285': '00-0038807', '243282': '00-0038820', '243329': '00-0038958', '241899': '00-0038977', '241905': '00-0038980', '242042': '00-0038982', '242039': '00-0038984', '241835': '00-0038995', '241834': '00-0039000', '241833': '00-0039006', '241953': '00-0039007', '241853': '00-0039013', '241836': '00-0039018', '241904': '00-0039047', '242074': '00-0039051', '241901': '00-0039068', '241900': '00-0039070', '241941': '00-0039071', '241832': '00-0039108', '241890': '00-0039110', '241957': '00-0039137', '241950': '00-0039138', '242134': '00-0039140', '241894': '00-0039141', '241903': '00-0039143', '241841': '00-0039147', '241952': '00-0039148', '241916': '00-0039149', '241914': '00-0039152', '241895': '00-0039156', '241930': '00-0039167', '241859': '00-0039169', '277066': '00-0039232', '277618': '00-0039241', '277701': '00-0039284', '277728': '00-0039289', '277052': '00-0039309', '277096': '00-0039343', '277100': '00-0039344', '277118': '00-0039345', '277126': '00-0039347', '277141': '00-0039352', '277210': '00-0039360', '277304': '00-0039366', '277272': '00-0039370', '277306': '00-0039380', '277301': '00-0039387', '277302': '00-0039388', '277308': '00-0039389', '277310': '00-0039390', '277319': '00-0039396', '277324': '00-0039399', '277329': '00-0039401', '277379': '00-0039435', '277393': '00-0039454', '277773': '00-0039573', '278213': '00-0039603', '277093': '00-0039734', '278238': '00-0039770', '278192': '00-0039772', '277266': '00-0039795', '277097': '00-0039807', '277145': '00-0039812', '277198': '00-0039813', '277202': '00-0039814', '277296': '00-0039818', '277219': '00-0039825', '277132': '00-0039838', '277094': '00-0039841', '277099': '00-0039850', '277095': '00-0039860', '277115': '00-0039862', '277112': '00-0039867', '277114': '00-0039872', '277149': '00-0039873', '277295': '00-0039879', '277092': '00-0039886', '277058': '00-0039888', '277104': '00-0039898', '277060': '00-0039903','2012': '00-0032164', '88005': '00-0034248', '87686': '00-0034373', '87857': '00-0034413', '111377': '00-0034968', '108866': '00-0035544', '108078': '00-0035642', '166280': '00-0036934', '194990': '00-0037235', '195006': '00-0037244', '242685': '00-0038487', '243220': '00-0038684', '241846': '00-0039063', '277057': '00-0039911','1854': '00-0028845', '1744': '00-0029714', '735': '00-0030114', '1216': '00-0030615', '1305': '00-0031040', '5534': '00-0031357', '494': '00-0031557', '5111': '00-0033063', '60169': '00-0033571', '59962': '00-0033907', '60042': '00-0033952', '59543': '00-0034051', '87520': '00-0034350', '87569': '00-0034446', '87712': '00-0034465', '111826': '00-0035378', '59956': '00-0035423', '147334': '00-0035876', '146794': '00-0036262', '166365': '00-0036850', '166459': '00-0036888', '166401': '00-0036898', '166410': '00-0036902', '166438': '00-0036922', '166311': '00-0036981', '189572': '00-0037034', '195821': '00-0037057', '195194': '00-0037082', '195307': '00-0037096', '195695': '00-0037129', '195311': '00-0037195', '195752': '00-0037205', '195209': '00-0037259', '195230': '00-0037260', '195229': '00-0037264', '195215': '00-0037269', '195200': '00-0037275', '195248': '00-0037303', '195320': '00-0037313', '196051': '00-0037353', '196050': '00-0037447', '195367': '00-0037457', '196020': '00-0037512', '195061': '00-0037665', '194997': '00-0037743', '195105': '00-0037758', '195135': '00-0037759', '195183': '00-0038043', '195154': '00-0038123', '195086': '00-0038127','87859': '00-0034278','195692': '00-0037106','59172': '00-0034355', '195373': '00-0037459', '195107': '00-0037823','87809': '00-0034832', '146850': '00-0035993', '146886': '00-0036237', '108555': '00-0036943', '195265': '00-0037301',  '195590': '00-0037544', '195943': '00-0037563','166517': '00-0036644', '195350': '00-0037493', '195206': '00-0037752', '111839': '00-0035251', '147347': '00-0035900', '110813': '00-0035704', '642': '00-0027973', '1234': '00-0031957', '54751': '00-0033783', '59831': '00-0033945', '108392': '00-0035039', '108185': '00-0035142', '111786': '00-0035264', '108230': '00-0035279', '108225': '00-0035286', '111832': '00-0035667', '108476': '00-0035757', '242176': '00-0038387', '242146': '00-0038390', '242150': '00-0038395', '242033': '00-0038398', '242133': '00-0038506', '241849': '00-0038546', '241949': '00-0038549', '241889': '00-0038560', '242114': '00-0038570', '242166': '00-0038578', '242012': '00-0038580', '242117': '00-0038591', '242090': '00-0038596', '242151': '00-0038602', '242106': '00-0038614', '242031': '00-0038616', '242160': '00-0038639', '242087': '00-0038642', '242493': '00-0038765', '242157': '00-0038983', '241897': '00-0039002', '241933': '00-0039003', '242082': '00-0039009', '242013': '00-0039031', '242047': '00-0039049', '241915': '00-0039054', '242071': '00-0039076', '241948': '00-0039111', '241938': '00-0039133', '241848': '00-0039142','1061': '00-0027940', '1658': '00-0030090', '4791': '00-0032366', '111842': '00-0035607', '146828': '00-0036424', '147256': '00-0035933', '147277': '00-0035942', '166414': '00-0036994', '194991': '00-0037242', '195261': '00-0037842', '195306': '00-0037844', '195318': '00-0037318', '195815': '00-0037633', '1385': '00-0027865', '1564': '00-0030062', '1630': '00-0031911', '5333': '00-0032792', '5477': '00-0032890', '54684': '00-0033733', '87613': '00-0034377', '87858': '00-0034414', '108158': '00-0035655', '108311': '00-0035265', '146910': '00-0036401', '147106': '00-0036005', '166354': '00-0036916', '166367': '00-0036917', '166528': '00-0036920', '166538': '00-0036670', '166545': '00-0036921', '195232': '00-0037282', '195700': '00-0037137', '5112': '00-0030968', '5590': '00-0032765', '108909': '00-0035572', '166771': '00-0036727', '771': '00-0029597', '802': '00-0031296', '2064': '00-0029621', '146775': '00-0036280', '146788': '00-0036329', '166351': '00-0036987', '195151': '00-0034203', '4616': '00-0033009', '4877': '00-0032521', '5580': '00-0032939', '60021': '00-0033905', '87706': '00-0034789', '108385': '00-0035399', '110159': '00-0035697', '147247': '00-0035895', '147288': '00-0035771', '166549': '00-0036857', '195316': '00-0037760', '678': '00-0032228', '1142': '00-0029249', '1979': '00-0029530', '4650': '00-0032580', '4743': '00-0032415', '54647': '00-0034054', '59988': '00-0033860', '62983': '00-0033461', '62987': '00-0033549', '87601': '00-0034385', '111770': '00-0035346', '146754': '00-0036159', '146888': '00-0036217', '147254': '00-0035841', '166329': '00-0036998', '166480': '00-0036559', '166492': '00-0036872', '166526': '00-0036536', '195128': '00-0037813', '195243': '00-0037298', '195299': '00-0037327', '4497': '00-0032975', '5069': '00-0031500', '5221': '00-0032667', '59888': '00-0033523', '60057': '00-0033936', '146872': '00-0036235', '146923': '00-0036316', '147234': '00-0035157', '166287': '00-0033539', '166339': '00-0036941', '166398': '00-0036625', '166475': '00-0036638', '166496': '00-0036666', '166529': '00-0036671', '166584': '00-0036704', '166633': '00-0036816', '195074': '00-0038099', '195118': '00-0037811', '195233': '00-0037078', '195245': '00-0037833', '195454': '00-0037168', '750': '00-0028924', '1451': '00-0028284', '88010': '00-0034573', '88116': '00-0034073', '108229': '00-0034982', '108468': '00-0035020', '108527': '00-0035621', '108528': '00-0035099', '195115': '00-0037828', '1292': '00-0031544', '1785': '00-0031550', '4814': '00-0032269', '59246': '00-0033579', '60101': '00-0033275', '62321': '00-0033925', '87555': '00-0034173', '108444': '00-0035444', '146790': '00-0036276', '146952': '00-0036438', '147090': '00-0036037', '147101': '00-0035956', '166316': '00-0036955', '166533': '00-0036634', '195182': '00-0038097', '195259': '00-0037300', '547': '00-0031740', '1224': '00-0032150', '63028': '00-0033566', '108312': '00-0034987', '146804': '00-0036253', '166324': '00-0036480', '166554': '00-0036672', '195971': '00-0037456', '699': '00-0029239', '1601': '00-0032104', '4660': '00-0031763', '63049': '00-0033681', '108037': '00-0035726', '108605': '00-0035329', '108875': '00-0035562', '111790': '00-0035414', '146845': '00-0036370', '166306': '00-0036617', '166326': '00-0036962', '166450': '00-0036648', '166516': '00-0036871', '166721': '00-0036527', '195121': '00-0038091', '195180': '00-0038045', '195220': '00-0037280', '195999': '00-0037517', '6802': '00-0033093', '59386': '00-0033792', '60100': '00-0033319', '87531': '00-0034782', '87580': '00-0034728', '88106': '00-0034450', '146866': '00-0036337', '146921': '00-0036250', '166279': '00-0036901', '166369': '00-0036629', '166490': '00-0036642', '195002': '00-0037245', '195125': '00-0037822', '195286': '00-0037098', '511': '00-0029701', '586': '00-0029421', '54758': '00-0033878', '60207': '00-0033308', '146854': '00-0036394', '146903': '00-0036400', '146930': '00-0036167', '166303': '00-0036615', '166319': '00-0036552', '166406': '00-0036899', '166497': '00-0036569', '166583': '00-0036502', '195106': '00-0038128', '195224': '00-0037273', '195264': '00-0037285', '195270': '00-0037312', '195608': '00-0037596', '206052': '00-0037593', '1579': '00-0023853', '1717': '00-0031376', '1987': '00-0032062', '5160': '00-0032933', '87714': '00-0034361', '87914': '00-0034473', '108258': '00-0035147', '108517': '00-0035547', '108547': '00-0035157', '147343': '00-0035890', '166432': '00-0036896', '195112': '00-0037815', '1753': '00-0030386', '5416': '00-0032454', '54664': '00-0033196', '59838': '00-0033595', '60065': '00-0033662', '87587': '00-0034515', '147142': '00-0036032', '166350': '00-0036982', '195947': '00-0037569', '196111': '00-0037627', '724': '00-0031253', '1995': '00-0029890', '7713': '00-0033103', '108136': '00-0035672', '109856': '00-0032388', '146745': '00-0036413', '147100': '00-0035804', '147388': '00-0033929', '166420': '00-0036995', '166471': '00-0036633', '195152': '00-0038105', '195838': '00-0037387','83211': '00-0034115', '108787': '00-0035076', '166296': '00-0036913', '195186': '00-0038093', '195292': '00-0037329', '196006': '00-0037516', '196009': '00-0037503', '4949': '00-0033064', '60033': '00-0033582', '63168': '00-0033659', '88045': '00-0034193', '107793': '00-0034903', '146821': '00-0036306', '146975': '00-0035924', '195246': '00-0037296', '63004': '00-0033302', '166417': '00-0037007', '195303': '00-0037317', '196114': '00-0037639', '491': '00-0027881', '5056': '00-0033038', '147127': '00-0035995', '166467': '00-0036879', '195372': '00-0037460', '196002': '00-0037395', '5505': '00-0032891', '60018': '00-0033347', '60108': '00-0033894', '87619': '00-0034834', '146869': '00-0036298', '146958': '00-0036314', '146959': '00-0036432', '166387': '00-0036881', '195117': '00-0037804', '195383': '00-0037184', '195921': '00-0037415', '195922': '00-0037412', '63040': '00-0033870', '82648': '00-0034401', '87627': '00-0034384', '106408': '00-0034902', '166277': '00-0037013', '166487': '00-0036504', '166620': '00-0036510', '5630': '00-0030459', '54815': '00-0033874', '59830': '00-0033902', '88113': '00-0034317', '108686': '00-0035412', '146955': '00-0036383', '166291': '00-0036926', '166399': '00-0036937', '195540': '00-0037560', '88001': '00-0034251', '111813': '00-0035436', '195156': '00-0038108', '195272': '00-0037286', '1868': '00-0031583', '84241': '00-0034360', '87416': '00-0034438', '108508': '00-0035098', '166313': '00-0036961', '166449': '00-0036643', '166466': '00-0036951', '166514': '00-0036949', '196064': '00-0037487', '196068': '00-0037491', '218179': '00-0038149', '59853': '00-0033929', '63059': '00-0033512', '87552': '00-0034514', '111776': '00-0035260', '147167': '00-0036002', '166381': '00-0036877', '166551': '00-0036908', '195294': '00-0037316', '195309': '00-0037314', '195931': '00-0037332', '922': '00-0029959', '147035': '00-0036059', '166360': '00-0034540', '166362': '00-0036903', '166689': '00-0036254', '166691': '00-0036802', '195926': '00-0037337', '5769': '00-0032671', '108701': '00-0035120', '108813': '00-0035073', '147153': '00-0035862', '195441': '00-0037468', '195817': '00-0037051', '195854': '00-0037375', '60157': '00-0033539', '108180': '00-0035253', '146960': '00-0036402', '147154': '00-0036145', '166703': '00-0036589', '196073': '00-0037621', '868': '00-0032162', '87922': '00-0034490', '88067': '00-0034091', '108330': '00-0033582', '166346': '00-0037008', '166504': '00-0036564', '195075': '00-0037826', '195208': '00-0037830', '195288': '00-0037330', '1249': '00-0031411', '1794': '00-0031596', '146999': '00-0036050', '148243': '00-0036447', '166349': '00-0036986', '166375': '00-0036882', '195228': '00-0037283', '195287': '00-0037095', '1558': '00-0031935', '59154': '00-0033336', '87567': '00-0034084', '166418': '00-0036993', '166582': '00-0036748', '196032': '00-0037348', '195082': '00-0038116', '195096': '00-0037808', '166579': '00-0036705', '4870': '00-0032052', '195291': '00-0037091'
-}
+# ACTION_NETWORK_ID_MAPPER (Action Network player id -> nflverse player id) moved to a sorted
+# parquet id store read on first use: src.player_ids.PlayerIdMap / get_id_map(), file
+# data/reference/football/nfl/action_network_player_ids.parquet. Add ids with
+# PlayerIdMap.add() (hunt_player_merge_ids does) instead of editing this file.
 
 
+def __getattr__(name):
+    # the old dict, built from the store on access, for callers that still import it
+    if name == "ACTION_NETWORK_ID_MAPPER":
+        from src.player_ids import get_id_map
+        return get_id_map().to_dict()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
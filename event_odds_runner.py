@@ -1,17 +1,23 @@
 import os
 import pandas as pd
 import datetime as dt
-from typing import List, Iterable, Optional
+from typing import Any, Dict, List, Iterable, Optional, Tuple
 
 from dotenv import load_dotenv
-from espn_api_orm.consts import ESPNSportLeagueTypes
-from espn_api_orm.league.api import ESPNLeagueAPI
-from nfl_data_loader.utils.utils import (
-    get_seasons_to_update, get_dataframe, put_dataframe,
-    find_year_for_season, find_week_for_season,
-)
-from src.utils import polite_sleep_block  # reuse your jitter sleeper
+from src.utils import backfill_open_lines, api_week_for
 from src.action_games_runner import GameLinesClient  # <-- your class from prior message
+from src.http_cache import ResponseCache
+from src.payload_archive import PayloadArchive, SCOREBOARD
+from src.fingerprints import PayloadFingerprints, discards_pending
+from src.games import GameDimension, from_scoreboard
+from src.history import LineHistory
+from src.open_lines import OpenLineTracker
+from src.metrics import count, timer
+from src.datasets import write_dataset, GAME_LINES
+from src.feed_runner import Feed, main
+from src.rollup import SeasonManifest, incremental_rollup
+from src.schemas import GAME_LINES_SCHEMA, read_parquet, write_parquet
+from src.dedupe import latest_per_key, merge_latest
 
 load_dotenv()
 
@@ -32,12 +38,20 @@ UNIQ_KEYS_W_BOOK: List[str] = [
     "week",
 ]
 UNIQ_KEYS_NO_BOOK: List[str] = [k for k in UNIQ_KEYS_W_BOOK if k != "book_id"]
+# A change in any of these is a line movement worth a row in the history store (src.history)
+HISTORY_COLUMNS: List[str] = ["value", "odds", "tickets_percent", "money_percent"]
 
 # Default books + periods
 DEFAULT_BOOK_IDS = [15, 30, 68, 69, 79]
 DEFAULT_PERIODS = ["event", "firsthalf", "secondhalf",
                    "firstquarter", "secondquarter", "thirdquarter", "fourthquarter"]
 
+# Parallel backfill (--workers > 1): one request budget shared by every worker process
+BACKFILL_REQUESTS_PER_SECOND = 1.0
+
+# First season with Action Network game lines
+START_SEASON = 2016
+
 
 # --------------- OPEN (30) BACKFILL --------------- #
 def ensure_open_lines(df: pd.DataFrame) -> pd.DataFrame:
@@ -55,69 +69,25 @@ def ensure_open_lines(df: pd.DataFrame) -> pd.DataFrame:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # Fast lookup by (group + book_id)
-    df_idx = df.set_index(UNIQ_KEYS_NO_BOOK + ["book_id"], drop=False)
-
-    rows_to_add = []
-    present_books_by_group = (
-        df.groupby(UNIQ_KEYS_NO_BOOK, dropna=False)["book_id"]
-          .apply(lambda s: set(pd.to_numeric(s, errors="coerce").dropna().astype(int)))
+    return backfill_open_lines(
+        df,
+        UNIQ_KEYS_NO_BOOK,
+        open_book_id=OPEN_BOOK_ID,
+        fallback_priority=OPEN_FALLBACK_PRIORITY,
     )
-    groups_missing_open = present_books_by_group[~present_books_by_group.apply(lambda s: OPEN_BOOK_ID in s)]
-
-    for group_key, _ in groups_missing_open.items():
-        chosen = None
-        for bid in OPEN_FALLBACK_PRIORITY:
-            try:
-                candidate = df_idx.loc[group_key + (bid,)]
-            except KeyError:
-                continue
-            # If multiples, keep latest by last_updated
-            if isinstance(candidate, pd.DataFrame):
-                candidate = candidate.sort_values("last_updated").iloc[-1]
-            chosen = candidate
-            break
-
-        if chosen is not None:
-            r = chosen.to_dict()
-            r["book_id"] = OPEN_BOOK_ID
-            r["open_inferred"] = True
-            r["open_source_book_id"] = int(chosen["book_id"]) if "book_id" in chosen else None
-            rows_to_add.append(r)
-
-    if rows_to_add:
-        add_df = pd.DataFrame(rows_to_add)
-        # align columns
-        for col in df.columns:
-            if col not in add_df.columns:
-                add_df[col] = pd.NA
-        df = pd.concat([df, add_df[df.columns]], ignore_index=True)
-
-    # flags on all rows
-    if "open_inferred" not in df.columns:
-        df["open_inferred"] = False
-    if "open_source_book_id" not in df.columns:
-        df["open_source_book_id"] = pd.NA
-    df["open_inferred"] = df["open_inferred"].fillna(False)
-
-    return df
 
 
 # --------------- DEDUPE: KEEP LATEST PER BOOK --------------- #
 def keep_only_latest_per_book(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-    if "last_updated" not in df.columns:
-        df = df.assign(last_updated=pd.Timestamp("1970-01-01"))
-    return (
-        df.sort_values("last_updated")
-          .drop_duplicates(UNIQ_KEYS_W_BOOK, keep="last")
-          .reset_index(drop=True)
-    )
+    # engine (pandas | numpy) comes from src.dedupe / --dedupe-engine
+    return latest_per_key(df, UNIQ_KEYS_W_BOOK)
 
 
-def merge_with_existing_and_dedupe(current_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
-    new_df = ensure_open_lines(new_df)
+def merge_with_existing_and_dedupe(current_df: pd.DataFrame, new_df: pd.DataFrame, *,
+                                   fill_open: bool = True) -> pd.DataFrame:
+    # fill_open=False: new_df already carries its OPEN rows (open-line tracker, weekly files)
+    if fill_open:
+        new_df = ensure_open_lines(new_df)
 
     # guard columns
     for col in UNIQ_KEYS_W_BOOK + ["last_updated", "open_inferred", "open_source_book_id"]:
@@ -125,19 +95,123 @@ def merge_with_existing_and_dedupe(current_df: pd.DataFrame, new_df: pd.DataFram
             new_df[col] = pd.NA
 
     if current_df is None or current_df.empty:
-        combined = new_df
-    else:
-        # align schemas
-        for col in set(new_df.columns) - set(current_df.columns):
-            current_df[col] = pd.NA
-        for col in set(current_df.columns) - set(new_df.columns):
-            new_df[col] = pd.NA
-        combined = pd.concat([current_df[new_df.columns], new_df[current_df.columns]], ignore_index=True)
+        return keep_only_latest_per_book(new_df)
 
-    return keep_only_latest_per_book(combined)
+    # align schemas
+    for col in set(new_df.columns) - set(current_df.columns):
+        current_df[col] = pd.NA
+    for col in set(current_df.columns) - set(new_df.columns):
+        new_df[col] = pd.NA
+    # concat + keep latest per book (the numpy engine skips materializing the concat)
+    return merge_latest(current_df[new_df.columns], new_df, UNIQ_KEYS_W_BOOK)
+
+
+# --------------- SEASON ROLLUP --------------- #
+def rollup_season(processed_df: pd.DataFrame, season_rows: List[pd.DataFrame], *,
+                  replace_weeks: bool = False) -> pd.DataFrame:
+    """
+    Fold this run's weekly frames into the processed season frame.
+    replace_weeks=True (replay) drops the rebuilt weeks from processed_df first.
+    """
+    # already deduped weekly; dedupe again just in case
+    season_df = pd.concat(season_rows, ignore_index=True)
+    season_df = keep_only_latest_per_book(season_df)
+    if replace_weeks and processed_df.shape[0] != 0:
+        # rebuilt weeks replace what was there
+        processed_df = processed_df[~processed_df.week.isin(season_df.week.unique())].copy()
+    # weekly frames already carry their OPEN rows
+    return merge_with_existing_and_dedupe(processed_df, season_df, fill_open=False)
+
+
+def publish_season(season: int, processed_season_path: str, season_rows: List[pd.DataFrame], *,
+                   replace_weeks: bool = False, max_week: Optional[int] = None) -> pd.DataFrame:
+    """
+    Incremental rollup of this run's weekly frames into <season>.parquet, then the
+    partitioned dataset copy of the rebuilt weeks. Returns the rebuilt rows.
+    """
+    with timer("rollup"):
+        rebuilt_df, summary = incremental_rollup(
+            season_rows,
+            processed_path=processed_season_path,
+            manifest=SeasonManifest(GAME_LINES, season).load(),
+            rollup=rollup_season,
+            input_schema=GAME_LINES_SCHEMA,
+            schema=GAME_LINES_SCHEMA,
+            replace_weeks=replace_weeks,
+            max_week=max_week,
+        )
+    print(f"Processed season parquet {processed_season_path}: rebuilt weeks {summary['rebuilt']}, "
+          f"unchanged {summary['unchanged']}, dropped {summary['dropped']}")
+
+    # Partitioned copy for filtered reads (src.datasets): rewrite only the rebuilt weeks
+    with timer("dataset"):
+        write_dataset(rebuilt_df, GAME_LINES)
+    return rebuilt_df
+
+
+def line_history() -> LineHistory:
+    """Change log of every line's value/odds/splits (src.history)."""
+    return LineHistory(GAME_LINES, keys=UNIQ_KEYS_W_BOOK, tracked=HISTORY_COLUMNS, schema=GAME_LINES_SCHEMA)
+
+
+def open_line_tracker() -> OpenLineTracker:
+    """First observed line per key; OPEN (30) is inferred once per group and then frozen (src.open_lines)."""
+    return OpenLineTracker(GAME_LINES, keys=UNIQ_KEYS_W_BOOK, group_keys=UNIQ_KEYS_NO_BOOK,
+                           schema=GAME_LINES_SCHEMA, open_book_id=OPEN_BOOK_ID,
+                           fallback_priority=OPEN_FALLBACK_PRIORITY)
 
 
 # --------------- FETCH ONE WEEK OF GAME LINES --------------- #
+def fetch_scoreboard(
+    *,
+    season: int,
+    week: int,
+    season_type: str,
+    access_token: Optional[str] = None,
+    book_ids: Optional[Iterable[int]] = None,
+    periods: Optional[Iterable[str]] = None,
+    timeout: int = 20,
+    cache: Optional[ResponseCache] = None,
+    cache_ttl: Optional[float] = None,
+    archive: Optional[PayloadArchive] = None,
+    replay: bool = False,
+    rate_limiter=None,
+    games: Optional[GameDimension] = None,
+) -> Optional[Tuple[Dict[str, Any], dt.datetime]]:
+    """
+    The week's scoreboard payload and its fetch time; None when replaying a week that
+    was never archived. The payload is written to `archive` when given, and the week's
+    games (ids, teams, kickoff, status, num_bets) are saved to `games`, where the props
+    pipeline picks them up instead of fetching its own game list.
+    """
+    if replay:
+        archived = archive.load(SCOREBOARD, season=season, season_type=season_type, week=week)
+        if archived is None:
+            return None
+        payload, fetched_at = archived
+    else:
+        hdrs = {"access_token": access_token} if access_token else None
+        client = GameLinesClient(default_headers=hdrs, cache=cache, rate_limiter=rate_limiter)
+        payload = client.fetch_payload(
+            season=season,
+            week=week,
+            season_type=season_type,
+            book_ids=book_ids or DEFAULT_BOOK_IDS,
+            periods=periods or DEFAULT_PERIODS,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+        )
+        fetched_at = dt.datetime.now()
+        if archive is not None:
+            archive.save(SCOREBOARD, payload, season=season, season_type=season_type, week=week,
+                         fetched_at=fetched_at)
+    if games is not None:
+        games.save(from_scoreboard(GameLinesClient().parse_games(payload), season_type=season_type,
+                                   fetched_at=fetched_at),
+                   season=season, season_type=season_type, week=week)
+    return payload, fetched_at
+
+
 def get_game_lines(
     *,
     season: int,
@@ -147,29 +221,52 @@ def get_game_lines(
     book_ids: Optional[Iterable[int]] = None,
     periods: Optional[Iterable[str]] = None,
     timeout: int = 20,
-) -> pd.DataFrame:
+    cache: Optional[ResponseCache] = None,
+    cache_ttl: Optional[float] = None,
+    archive: Optional[PayloadArchive] = None,
+    replay: bool = False,
+    rate_limiter=None,
+    fingerprints: Optional[PayloadFingerprints] = None,
+    games: Optional[GameDimension] = None,
+    scoreboard: Optional[Tuple[Dict[str, Any], dt.datetime]] = None,
+) -> Optional[pd.DataFrame]:
     """
     Single endpoint call; returns a FLAT DataFrame of game market outcomes
     (moneyline/spread/total) across requested books & periods.
+    With `cache`, a fresh cached response (see `cache_ttl`) skips the network.
+    The raw payload is written to `archive` when given; replay=True reads it
+    back from `archive` instead of calling the API. `rate_limiter` (anything with
+    .acquire()) gates the network call. With `fingerprints`, only games whose
+    payload changed since the last commit are parsed; None means none did.
+    The week's games are saved to `games` (see fetch_scoreboard). `scoreboard` is an
+    already fetched (payload, fetched_at) of the week: no call is made at all.
     """
-    hdrs = {"access_token": access_token} if access_token else None
-    client = GameLinesClient(default_headers=hdrs)
-
-    games_df, game_lines_df = client.fetch_games_and_market_lines_df(
-        season=season,
-        week=week,
-        season_type=season_type,
-        book_ids=book_ids or DEFAULT_BOOK_IDS,
-        periods=periods or DEFAULT_PERIODS,
-        timeout=timeout,
-    )
+    if scoreboard is None:
+        scoreboard = fetch_scoreboard(season=season, week=week, season_type=season_type, access_token=access_token,
+                                      book_ids=book_ids, periods=periods, timeout=timeout, cache=cache,
+                                      cache_ttl=cache_ttl, archive=archive, replay=replay,
+                                      rate_limiter=rate_limiter, games=games)
+        if scoreboard is None:
+            return pd.DataFrame()
+    payload, fetched_at = scoreboard
+    client = GameLinesClient()
+    if fingerprints is not None:
+        # per game: a finished game's markets stop changing long before the week does
+        changed = [g for g in payload.get("games", []) or []
+                   if not fingerprints.check(SCOREBOARD, g, season=season, season_type=season_type, week=week,
+                                             game_id=g.get("id"))]
+        if not changed:
+            return None
+        payload = {**payload, "games": changed}
+    games_df, game_lines_df = client.parse_payload(payload)
 
     if game_lines_df.empty:
         return game_lines_df
 
-    # Stamp update time now for dedupe ordering
+    count("rows_parsed", game_lines_df.shape[0])
+    # Stamp update (fetch) time for dedupe ordering
     game_lines_df = game_lines_df.copy()
-    game_lines_df["last_updated"] = dt.datetime.now()
+    game_lines_df["last_updated"] = fetched_at
 
     # Make sure columns you rely on exist
     must_have = [
@@ -196,116 +293,134 @@ def get_game_lines(
     return game_lines_df
 
 
+# --------------- ONE (SEASON, WEEK) UNIT --------------- #
+def weekly_path_for(season_raw_path: str, canonical_week: int) -> str:
+    return os.path.join(season_raw_path, str(canonical_week), "game_lines.parquet")
+
+
+@discards_pending
+def run_week(
+    *,
+    season: int,
+    canonical_week: int,
+    season_raw_path: str,
+    access_token: Optional[str],
+    cache_ttl: Optional[float],
+    cache: Optional[ResponseCache],
+    archive: Optional[PayloadArchive],
+    replay: bool = False,
+    rate_limiter=None,
+    fingerprints: Optional[PayloadFingerprints] = None,
+    history: Optional[LineHistory] = None,
+    open_lines: Optional[OpenLineTracker] = None,
+    games: Optional[GameDimension] = None,
+    scoreboard: Optional[Tuple[Dict[str, Any], dt.datetime]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetch one canonical week, fill OPEN, merge into its weekly parquet and save it.
+    Returns the merged weekly frame, or None when there is nothing for the week.
+    With `fingerprints`, games whose payload is unchanged are not re-merged; when
+    none changed the weekly parquet is returned untouched. Lines that moved are
+    appended to `history`. With `open_lines`, OPEN (30) rows are the frozen first
+    observation instead of being re-inferred from the latest fallback-book rows.
+    `scoreboard` is the week's already fetched payload (see fetch_scoreboard), e.g. from
+    the pipeline's shared games task.
+    Units are independent of each other, so they can run in any order/process.
+    """
+    # Map canonical NFL week -> (season_type, api_week)
+    api_week = api_week_for(season, canonical_week)
+    if api_week is None:
+        return None
+    season_type, season_type_week = api_week
+
+    weekly_path = weekly_path_for(season_raw_path, canonical_week)
+    if replay:
+        fingerprints = None  # replay rebuilds every game from the archive
+        history = None  # the archive only holds each week's last fetch: nothing new to log
+    elif fingerprints is not None and not os.path.exists(weekly_path):
+        fingerprints.forget(SCOREBOARD, season=season, season_type=season_type, week=season_type_week)
+
+    # Fetch
+    df = get_game_lines(
+        season=season,
+        week=season_type_week,
+        season_type=season_type,
+        access_token=access_token,
+        book_ids=DEFAULT_BOOK_IDS,
+        periods=DEFAULT_PERIODS,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        archive=archive,
+        replay=replay,
+        rate_limiter=rate_limiter,
+        fingerprints=fingerprints,
+        games=games,
+        scoreboard=scoreboard,
+    )
+    if df is None:
+        fingerprints.stats["weeks_skipped"] += 1
+        count("weeks_skipped")
+        print(f"{season} week {canonical_week}: every game's payload unchanged, skipped")
+        with timer("read"):
+            return read_parquet(weekly_path, GAME_LINES_SCHEMA)
+    if df.shape[0] == 0:
+        print(f"No game-line data for {season} week {canonical_week} yet")
+        return None
+
+    # Store canonical week
+    df = df.copy()
+    df["week"] = canonical_week
+
+    # Load existing weekly parquet (if any)
+    os.makedirs(os.path.dirname(weekly_path), exist_ok=True)
+    # replay rebuilds the week purely from the archive
+    with timer("read"):
+        current_df = pd.DataFrame() if replay else read_parquet(weekly_path, GAME_LINES_SCHEMA)
+
+    # OPEN (30): frozen per group by the tracker; inferred only for groups it never saw
+    with timer("open_lines"):
+        df = open_lines.fill_open(df, seen=current_df) if open_lines is not None else ensure_open_lines(df)
+
+    # Line movement: the history keeps every change the weekly file overwrites
+    if history is not None:
+        with timer("history"):
+            history.append(df)
+
+    # Dedupe latest per book
+    with timer("dedupe"):
+        merged_week_df = merge_with_existing_and_dedupe(current_df, df, fill_open=False)
+
+    # Save weekly
+    with timer("write"):
+        write_parquet(merged_week_df, weekly_path, GAME_LINES_SCHEMA)
+    count("weeks_saved")
+    count("rows_written", merged_week_df.shape[0])
+    if fingerprints is not None:
+        fingerprints.commit()  # only now are these payloads part of the weekly parquet
+    print(
+        f"Saved {season} week {canonical_week}: {merged_week_df.shape[0]} rows "
+        f"({merged_week_df.book_id.value_counts(dropna=False).to_dict()})"
+    )
+    return merged_week_df
+
+
+# --------------- RUN (src.feed_runner) --------------- #
+FEED = Feed(
+    name=GAME_LINES,
+    title="Game Lines",
+    run_week=run_week,
+    weekly_path_for=weekly_path_for,
+    publish_season=publish_season,
+    line_history=line_history,
+    open_line_tracker=open_line_tracker,
+    weekly_schema=GAME_LINES_SCHEMA,
+    processed_schema=GAME_LINES_SCHEMA,
+    replay_endpoint=SCOREBOARD,
+    start_season=START_SEASON,
+    requests_per_second=BACKFILL_REQUESTS_PER_SECOND,
+)
+
+
 # --------------- MAIN ETL LOOP (weekly + season rollup) --------------- #
 if __name__ == "__main__":
-    root_path = "./data/raw"
-    START_SEASON = 2016
-
-    access_token = os.environ.get("ACTION_NETWORK_ACCESS_TOKEN", None)
-
-    sport_league_pairs = [ESPNSportLeagueTypes.FOOTBALL_NFL]
-
-    for sport_league in sport_league_pairs:
-        sport_str, league_str = sport_league.value.split("/")
-        raw_path = f"{root_path}/{sport_str}/{league_str}/game_lines/"
-        processed_path = f"./data/processed/{sport_str}/{league_str}/game_lines/"
-        os.makedirs(raw_path, exist_ok=True)
-        os.makedirs(processed_path, exist_ok=True)
-
-        league_api = ESPNLeagueAPI(sport_str, league_str)
-        if not league_api.is_active():
-            print("Running in OffSeason")
-
-        # Decide seasons to update based on processed dir
-        update_seasons = get_seasons_to_update(f"./data/processed/{sport_str}/{league_str}", "game_lines")
-        update_seasons = [s for s in update_seasons if s >= START_SEASON]
-        if not update_seasons:
-            print("No seasons to update.")
-            continue
-
-        print(f"Running Game Lines Pump for: {sport_league.value} from {min(update_seasons)} to {max(update_seasons)}")
-
-        for update_season in update_seasons:
-            season_raw_path = os.path.join(raw_path, str(update_season))
-            os.makedirs(season_raw_path, exist_ok=True)
-
-            processed_season_path = os.path.join(processed_path, f"{update_season}.parquet")
-            processed_df = get_dataframe(processed_season_path)  # may be empty
-
-            # Determine weeks
-            if update_season == find_year_for_season():
-                current_week = find_week_for_season()
-                if processed_df.shape[0] != 0:
-                    max_processed_week = 1 if current_week == 1 else current_week - 1
-                    # keep only up to (current_week + 1) snapshot
-                    processed_df = processed_df[processed_df.week <= current_week + 1].copy()
-                else:
-                    max_processed_week = 1
-                update_weeks = list(range(max_processed_week, current_week + 1 + 1))
-            else:
-                update_week_start = processed_df.week.max() if processed_df.shape[0] != 0 else 1
-                update_weeks = list(range(update_week_start, (22 + 1 if update_season >= 2021 else 21 + 1)))
-
-            print(f"Season {update_season} -> weeks: {update_weeks}")
-
-            shift = 18 if update_season >= 2021 else 17
-            season_rows = []
-
-            for canonical_week in update_weeks:
-                polite_sleep_block()  # be nice between weeks
-
-                # Map canonical NFL week -> (season_type, api_week)
-                if canonical_week > shift:
-                    season_type = "post"
-                    season_type_week = canonical_week - shift  # Action uses 1.. for post
-                    if update_season <= 2022 and canonical_week == 22:
-                        # 2021–2022 had different playoff week structure
-                        continue
-                else:
-                    season_type = "reg"
-                    season_type_week = canonical_week
-
-                # Fetch
-                df = get_game_lines(
-                    season=update_season,
-                    week=season_type_week,
-                    season_type=season_type,
-                    access_token=access_token,
-                    book_ids=DEFAULT_BOOK_IDS,
-                    periods=DEFAULT_PERIODS,
-                )
-                if df.shape[0] == 0:
-                    print(f"No game-line data for week {canonical_week} yet")
-                    continue
-
-                # Store canonical week
-                df = df.copy()
-                df["week"] = canonical_week
-
-                # Load existing weekly parquet (if any)
-                week_dir = os.path.join(season_raw_path, str(canonical_week))
-                os.makedirs(week_dir, exist_ok=True)
-                weekly_path = os.path.join(week_dir, "game_lines.parquet")
-                current_df = get_dataframe(weekly_path)
-
-                # Fill OPEN (30) + dedupe latest per book
-                merged_week_df = merge_with_existing_and_dedupe(current_df, df)
-
-                # Save weekly
-                put_dataframe(merged_week_df, weekly_path)
-                print(
-                    f"Saved week {canonical_week}: {merged_week_df.shape[0]} rows "
-                    f"({merged_week_df.book_id.value_counts(dropna=False).to_dict()})"
-                )
-
-                season_rows.append(merged_week_df)
-
-            # Season rollup (already deduped weekly; dedupe again just in case)
-            if season_rows:
-                season_df = pd.concat(season_rows, ignore_index=True)
-                season_df = keep_only_latest_per_book(season_df)
-                season_df = merge_with_existing_and_dedupe(processed_df, season_df)
-
-                os.makedirs(processed_path, exist_ok=True)
-                put_dataframe(season_df, processed_season_path)
-                print(f"Updated processed season parquet: {processed_season_path} ({season_df.shape[0]} rows)")
+    main(FEED, description="Action Network game lines pump")
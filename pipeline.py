@@ -0,0 +1,231 @@
+"""
+One entry point for both feeds: game lines and player props of every planned week run as
+one dependency graph (src.dag), instead of event_odds_runner.py and player_props_runner.py
+each planning, checking ESPN and fetching on their own.
+
+    python pipeline.py [--feeds game_lines player_props] [--replay] [--workers 4]
+
+Tasks, per (season, canonical week):
+    games   the week's scoreboard, fetched once: archived, saved to the games dimension
+    lines   game lines parse / OPEN / merge / weekly parquet from that same payload
+    props   player props, game list read from the games dimension (no scoreboard/markets call)
+and per (feed, season) a rollup once every week of it is written. A week's lines and props
+only wait for its games task, so they run side by side and next to other weeks' tasks:
+with --workers N the graph runs on N worker processes under one request budget shared by
+both feeds (--requests-per-second). Seasons and weeks are planned once, from a single ESPN
+activity check and season/week lookup (src.planning).
+
+Writes the same weekly / season parquets, datasets and state as the two runners; the run
+report goes to <RUN_REPORT_ROOT>/pipeline/. A failed task skips what depends on it (its
+rollup), the rest still runs, and the exit status is 1.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+import event_odds_runner
+import player_props_runner
+from src.dag import TaskGraph
+from src.datasets import GAME_LINES, PLAYER_PROPS
+from src.feed_runner import (
+    SPORT_LEAGUES, SeasonPlan, UnitComponents, add_run_arguments, init_worker, merge_stats, plan_feed, run_unit,
+    start_run,
+)
+from src.metrics import get_metrics, write_run_report
+from src.payload_archive import PayloadArchive
+from src.planning import live_calendar
+from src.resilience import get_resilience
+from src.schemas import read_parquet
+from src.transport import get_transport
+from src.utils import SharedTokenBucket, TokenBucket, api_week_for
+
+load_dotenv()
+
+# ----------------- CONFIG ----------------- #
+PIPELINE = "pipeline"
+PIPELINE_WORKERS = 4
+# one budget for both feeds: about what the props runner alone was allowed
+PIPELINE_REQUESTS_PER_SECOND = 2.0
+
+# feed -> its runner's hooks (src.feed_runner.Feed)
+FEEDS = {
+    GAME_LINES: event_odds_runner.FEED,
+    PLAYER_PROPS: player_props_runner.FEED,
+}
+GAMES_TASK, ROLLUP_TASK = "games", "rollup"
+# counter groups kept per feed in the run report (the rest are summed over both feeds)
+FEED_STATS_GROUPS = ("fingerprints", "history", "open_lines")
+
+
+# --------------- TASKS --------------- #
+def run_task(kind: str, unit: Dict[str, Any], **inputs) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    """
+    One graph task with its own components -> (result, UnitComponents.stats() for this task).
+    Results: games (scoreboard payload, fetched_at) | None, lines / props the weekly parquet
+    path | None (src.feed_runner.run_unit), rollup the rebuilt row count.
+    """
+    if kind in FEEDS:
+        return run_unit(FEEDS[kind], unit, **inputs)
+
+    components = UnitComponents()
+    if kind == GAMES_TASK:
+        api_week = api_week_for(unit["season"], unit["canonical_week"])
+        result = None
+        if api_week is not None:
+            season_type, week = api_week
+            result = event_odds_runner.fetch_scoreboard(
+                season=unit["season"], week=week, season_type=season_type, access_token=unit["access_token"],
+                cache=components.cache, cache_ttl=unit["cache_ttl"], archive=components.archive,
+                replay=unit["replay"], rate_limiter=components.rate_limiter, games=components.games,
+            )
+    else:
+        feed = FEEDS[unit["feed"]]
+        season_rows = [read_parquet(path, feed.weekly_schema) for path in inputs["weekly_paths"] if path is not None]
+        result = 0
+        if season_rows:
+            result = len(feed.publish_season(unit["season"], unit["processed_season_path"], season_rows,
+                                             replace_weeks=unit["replay"], max_week=unit["max_week"]))
+    return result, components.finish()
+
+
+# --------------- PLAN --------------- #
+def plan(feeds: List[str], *, replay: bool, archive: PayloadArchive,
+         access_token: Optional[str]) -> Dict[Tuple[str, int], SeasonPlan]:
+    """(feed, season) -> its SeasonPlan (src.feed_runner.plan_feed)."""
+    sport_str, league_str = SPORT_LEAGUES[0].value.split("/")
+    # once for both feeds
+    calendar = None if replay else live_calendar(sport_str, league_str)
+
+    plans = {}
+    for feed in feeds:
+        season_plans = plan_feed(FEEDS[feed], sport_str, league_str, replay=replay, archive=archive,
+                                 access_token=access_token, calendar=calendar)
+        if not season_plans:
+            print(f"{feed}: no seasons to update.")
+        for p in season_plans:
+            plans[(feed, p.season)] = p
+    return plans
+
+
+def build_graph(plans: Dict[Tuple[str, int], SeasonPlan], *, replay: bool) -> TaskGraph:
+    """
+    games -> lines and games -> props per week (props only wait when lines plan the week too),
+    every week of a (feed, season) -> its rollup. Added season by season, week by week, so a
+    serial run (and the pool's queue) works through weeks in order.
+    """
+    graph = TaskGraph()
+    week_keys: Dict[Tuple[str, int], List[Hashable]] = {key: [] for key in plans}
+    for season in sorted({season for _, season in plans}):
+        weeks = sorted({unit["canonical_week"] for (feed, s), p in plans.items() if s == season for unit in p.units})
+        for week in weeks:
+            games_key = None
+            for feed in FEEDS:
+                if (feed, season) not in plans:
+                    continue
+                units = [u for u in plans[(feed, season)].units if u["canonical_week"] == week]
+                if not units:
+                    continue
+                unit = units[0]
+                if feed == GAME_LINES:
+                    # the week's one scoreboard fetch, shared by both feeds
+                    games_key = graph.add((GAMES_TASK, season, week), run_task, kind=GAMES_TASK,
+                                          unit={k: unit[k] for k in ("season", "canonical_week", "access_token",
+                                                                     "cache_ttl", "replay")})
+                    key = graph.add((feed, season, week), run_task, kind=feed, unit=unit,
+                                    inputs={"scoreboard": games_key})
+                else:
+                    key = graph.add((feed, season, week), run_task, kind=feed, unit=unit,
+                                    after=[games_key] if games_key is not None else [])
+                week_keys[(feed, season)].append(key)
+        for feed in FEEDS:
+            if (feed, season) in plans:
+                p = plans[(feed, season)]
+                # in this process, like the runners: workers only write weekly parquets
+                graph.add((ROLLUP_TASK, feed, season), run_task, kind=ROLLUP_TASK, local=True,
+                          unit={"feed": feed, "season": season, "processed_season_path": p.processed_season_path,
+                                "max_week": p.max_week, "replay": replay},
+                          inputs={"weekly_paths": week_keys[(feed, season)]})
+    return graph
+
+
+# --------------- MAIN --------------- #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Action Network game lines + player props as one task graph")
+    parser.add_argument("--feeds", nargs="+", choices=list(FEEDS), default=list(FEEDS))
+    parser.add_argument("--replay", action="store_true",
+                        help="rebuild weekly + season parquets from the raw payload archive (no network)")
+    parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS,
+                        help="run independent tasks on N worker processes (1: serial, in dependency order)")
+    parser.add_argument("--requests-per-second", type=float, default=PIPELINE_REQUESTS_PER_SECOND,
+                        help="request budget shared by every task of both feeds")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    start_run(args, PIPELINE)
+
+    access_token = os.environ.get("ACTION_NETWORK_ACCESS_TOKEN", None)
+    plans = plan(args.feeds, replay=args.replay, archive=PayloadArchive(), access_token=access_token)
+    graph = build_graph(plans, replay=args.replay)
+    print(f"Pipeline: {len(graph)} tasks over {len(plans)} (feed, season) plans, {args.workers} worker(s)")
+
+    pool = None
+    if args.workers > 1:
+        # spawn, not fork: the parent has already started pyarrow's thread pool
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=args.workers,
+            mp_context=ctx,
+            initializer=init_worker,
+            initargs=(SharedTokenBucket(args.requests_per_second, ctx=ctx),),
+        )
+    else:
+        init_worker(TokenBucket(args.requests_per_second))
+
+    # component counters: shared ones summed over tasks, per-feed ones kept per feed
+    totals: Dict[str, Dict[str, Any]] = {}
+
+    def collect(key: Hashable, value: Tuple[Any, Dict[str, Dict[str, Any]]]) -> Any:
+        result, stats = value
+        feed = key[0] if key[0] in FEEDS else None
+        groups = {"cache": "cache", "games": "games"}
+        if feed is not None:
+            groups.update({group: f"{group}.{feed}" for group in FEED_STATS_GROUPS})
+        if pool is not None and key[0] != ROLLUP_TASK:
+            # from a worker; serial tasks and rollups already counted in this process
+            groups.update(transport="transport", resilience="resilience", metrics="metrics")
+        merge_stats(totals, {name: stats[group] for group, name in groups.items()})
+        return result
+
+    try:
+        graph.run(pool, on_done=collect)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    run_stats = {
+        **totals,
+        "transport": totals.get("transport", {}) if pool is not None else get_transport().stats(),
+        "resilience": totals.get("resilience", {}) if pool is not None else get_resilience().stats,
+        "tasks": graph.stats,
+    }
+    for group in ("cache", "transport", "resilience", "games"):
+        run_stats.setdefault(group, {})
+    print(f"Pipeline tasks (done / failed / skipped): {graph.stats}")
+    print(f"HTTP cache: {run_stats['cache']}")
+    print(f"HTTP transport: {run_stats['transport']}")
+    print(f"HTTP retries: {run_stats['resilience']}")
+    print(f"Games dimension (saved / served / stale / missing): {run_stats['games']}")
+    for feed in args.feeds:
+        print(f"{feed}: payload fingerprints {run_stats.get(f'fingerprints.{feed}', {})}, "
+              f"line history {run_stats.get(f'history.{feed}', {})}, "
+              f"open lines {run_stats.get(f'open_lines.{feed}', {})}")
+    print(f"Stages (seconds / calls): {get_metrics().stages()}")
+    report_path = write_run_report(PIPELINE, run_stats, path=args.run_report, textfile=args.metrics_textfile)
+    print(f"Run report: {report_path}")
+    if graph.failed:
+        print(f"Failed: {sorted(map(str, graph.failed))}; skipped: {len(graph.skipped)} downstream task(s)")
+        sys.exit(1)
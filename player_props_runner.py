@@ -2,16 +2,26 @@ import json
 import os
 import random
 import time
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 from dotenv import load_dotenv
-from espn_api_orm.consts import ESPNSportLeagueTypes
-from espn_api_orm.league.api import ESPNLeagueAPI
-from nfl_data_loader.utils.utils import get_seasons_to_update, get_dataframe, find_year_for_season, find_week_for_season, put_dataframe
 
-from consts import ACTION_NETWORK_ID_MAPPER
-from src.action_props_runner import get_player_props, polite_sleep_block
+from src.action_props_runner import get_player_props
+from src.http_cache import ResponseCache
+from src.payload_archive import PayloadArchive, GAMES, PROPS
+from src.fingerprints import PayloadFingerprints, discards_pending
+from src.games import GameDimension
+from src.history import LineHistory
+from src.open_lines import OpenLineTracker
+from src.player_ids import get_id_map
+from src.metrics import count, timer
+from src.datasets import write_dataset, PLAYER_PROPS
+from src.feed_runner import Feed, main
+from src.rollup import SeasonManifest, incremental_rollup
+from src.schemas import PLAYER_PROPS_RAW_SCHEMA, PLAYER_PROPS_SCHEMA, read_parquet, write_parquet
+from src.dedupe import latest_per_key, merge_latest
+from src.utils import backfill_open_lines, api_week_for
 
 load_dotenv()
 
@@ -23,6 +33,14 @@ UNIQ_KEYS_W_BOOK: List[str] = [
     "period","side","team","player_id","season","week"
 ]
 UNIQ_KEYS_NO_BOOK: List[str] = [k for k in UNIQ_KEYS_W_BOOK if k != "book_id"]
+# A change in any of these is a line movement worth a row in the history store (src.history)
+HISTORY_COLUMNS: List[str] = ["value", "odds"]
+
+# Parallel backfill (--workers > 1): one request budget shared by every worker process
+BACKFILL_REQUESTS_PER_SECOND = 2.0
+
+# First season with Action Network player props
+START_SEASON = 2022
 
 def ensure_open_lines(df: pd.DataFrame) -> pd.DataFrame:
     """If a group lacks book_id=30, duplicate from the first available
@@ -37,73 +55,26 @@ def ensure_open_lines(df: pd.DataFrame) -> pd.DataFrame:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
-    # Make it easy to locate the "best" source row per group
-    df_idx = df.set_index(UNIQ_KEYS_NO_BOOK + ["book_id"], drop=False)
-
-    rows_to_add = []
-    # Group ignoring book_id; find groups missing OPEN
-    present_books_by_group = (
-        df.groupby(UNIQ_KEYS_NO_BOOK, dropna=False)["book_id"]
-          .apply(lambda s: set(pd.to_numeric(s, errors="coerce").dropna().astype(int)))
+    return backfill_open_lines(
+        df,
+        UNIQ_KEYS_NO_BOOK,
+        open_book_id=OPEN_BOOK_ID,
+        fallback_priority=OPEN_FALLBACK_PRIORITY,
     )
-    groups_missing_open = present_books_by_group[~present_books_by_group.apply(lambda s: OPEN_BOOK_ID in s)]
-
-    for group_key, _ in groups_missing_open.items():
-        chosen = None
-        # Try 15 -> 68 -> 69 -> 79
-        for bid in OPEN_FALLBACK_PRIORITY:
-            try:
-                candidate = df_idx.loc[group_key + (bid,)]
-            except KeyError:
-                continue
-            # If multiple rows exist for (group+book), keep latest by last_updated
-            if isinstance(candidate, pd.DataFrame):
-                candidate = candidate.sort_values("last_updated").iloc[-1]
-            chosen = candidate
-            break
-
-        if chosen is not None:
-            r = chosen.to_dict()
-            r["book_id"] = OPEN_BOOK_ID
-            r["open_inferred"] = True
-            r["open_source_book_id"] = int(chosen["book_id"]) if "book_id" in chosen else None
-            rows_to_add.append(r)
-
-    if rows_to_add:
-        add_df = pd.DataFrame(rows_to_add)
-        # Ensure schema alignment
-        for col in df.columns:
-            if col not in add_df.columns:
-                add_df[col] = pd.NA
-        df = pd.concat([df, add_df[df.columns]], ignore_index=True)
-
-    # Flag non-added rows
-    if "open_inferred" not in df.columns:
-        df["open_inferred"] = False
-    if "open_source_book_id" not in df.columns:
-        df["open_source_book_id"] = pd.NA
-    df["open_inferred"] = df["open_inferred"].fillna(False)
-
-    return df
 
 
 def keep_only_latest_per_book(df: pd.DataFrame) -> pd.DataFrame:
-    """Keep only the latest row per composite key including book_id."""
-    if df.empty:
-        return df
-    if "last_updated" not in df.columns:
-        df = df.assign(last_updated=pd.Timestamp("1970-01-01"))
-    return (
-        df.sort_values("last_updated")
-          .drop_duplicates(UNIQ_KEYS_W_BOOK, keep="last")
-          .reset_index(drop=True)
-    )
+    """Keep only the latest row per composite key including book_id (engine: see src.dedupe)."""
+    return latest_per_key(df, UNIQ_KEYS_W_BOOK)
 
 
-def merge_with_existing_and_dedupe(current_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
-    """Combine existing weekly parquet + new pull, fill OPEN, dedupe on latest per book."""
+def merge_with_existing_and_dedupe(current_df: pd.DataFrame, new_df: pd.DataFrame, *,
+                                   fill_open: bool = True) -> pd.DataFrame:
+    """Combine existing weekly parquet + new pull, fill OPEN, dedupe on latest per book.
+    fill_open=False: new_df already carries its OPEN rows (open-line tracker, weekly files)."""
     # Fill OPEN lines **before** merging so current_df may get overwritten by fresher data
-    new_df = ensure_open_lines(new_df)
+    if fill_open:
+        new_df = ensure_open_lines(new_df)
 
     # Guard columns
     for col in UNIQ_KEYS_W_BOOK + ["last_updated", "open_inferred", "open_source_book_id"]:
@@ -111,144 +82,187 @@ def merge_with_existing_and_dedupe(current_df: pd.DataFrame, new_df: pd.DataFram
             new_df[col] = pd.NA
 
     if current_df is None or current_df.empty:
-        combined = new_df
-    else:
-        # Backfill missing columns to align schemas
-        for col in set(new_df.columns) - set(current_df.columns):
-            current_df[col] = pd.NA
-        for col in set(current_df.columns) - set(new_df.columns):
-            new_df[col] = pd.NA
-        combined = pd.concat([current_df[new_df.columns], new_df[current_df.columns]], ignore_index=True)
+        return keep_only_latest_per_book(new_df)
+
+    # Backfill missing columns to align schemas
+    for col in set(new_df.columns) - set(current_df.columns):
+        current_df[col] = pd.NA
+    for col in set(current_df.columns) - set(new_df.columns):
+        new_df[col] = pd.NA
+
+    # Finally, keep only latest per (… + book_id); the numpy engine skips materializing the concat
+    return merge_latest(current_df[new_df.columns], new_df, UNIQ_KEYS_W_BOOK)
+
+def rollup_season(processed_df: pd.DataFrame, season_rows: List[pd.DataFrame], *,
+                  replace_weeks: bool = False) -> pd.DataFrame:
+    """Fold this run's weekly frames into the processed season frame, mapping Action Network
+    player ids. replace_weeks=True (replay) drops the rebuilt weeks from processed_df first."""
+    season_df = pd.concat(season_rows, ignore_index=True)
+    season_df = season_df.rename(columns={'player_id': 'action_network_player_id'})
+    season_df['player_id'] = get_id_map().lookup(season_df['action_network_player_id'].to_numpy())
+    season_df['action_network_player_id'] = season_df['action_network_player_id'].fillna(-1).astype(int).astype(str)
+    # Keep only latest per composite key again just in case multiple runs in same session
+    season_df = keep_only_latest_per_book(season_df)
+    if replace_weeks and processed_df.shape[0] != 0:
+        # rebuilt weeks replace what was there
+        processed_df = processed_df[~processed_df.week.isin(season_df.week.unique())].copy()
+    # weekly frames already carry their OPEN rows
+    return merge_with_existing_and_dedupe(processed_df, season_df, fill_open=False)
+
+
+def publish_season(season: int, processed_season_path: str, season_rows: List[pd.DataFrame], *,
+                   replace_weeks: bool = False, max_week: Optional[int] = None) -> pd.DataFrame:
+    """Incremental rollup of this run's weekly frames into <season>.parquet, then the
+    partitioned dataset copy of the rebuilt weeks. Returns the rebuilt rows."""
+    with timer("rollup"):
+        rebuilt_df, summary = incremental_rollup(
+            season_rows,
+            processed_path=processed_season_path,
+            manifest=SeasonManifest(PLAYER_PROPS, season).load(),
+            rollup=rollup_season,
+            input_schema=PLAYER_PROPS_RAW_SCHEMA,
+            schema=PLAYER_PROPS_SCHEMA,
+            replace_weeks=replace_weeks,
+            max_week=max_week,
+        )
+    print(f"Processed season parquet {processed_season_path}: rebuilt weeks {summary['rebuilt']}, "
+          f"unchanged {summary['unchanged']}, dropped {summary['dropped']}")
+
+    # Partitioned copy for filtered reads (src.datasets): rewrite only the rebuilt weeks
+    with timer("dataset"):
+        write_dataset(rebuilt_df, PLAYER_PROPS)
+    return rebuilt_df
+
+
+def line_history() -> LineHistory:
+    """Change log of every prop's value/odds (src.history)."""
+    return LineHistory(PLAYER_PROPS, keys=UNIQ_KEYS_W_BOOK, tracked=HISTORY_COLUMNS, schema=PLAYER_PROPS_RAW_SCHEMA)
+
+
+def open_line_tracker() -> OpenLineTracker:
+    """First observed line per key; OPEN (30) is inferred once per group and then frozen (src.open_lines)."""
+    return OpenLineTracker(PLAYER_PROPS, keys=UNIQ_KEYS_W_BOOK, group_keys=UNIQ_KEYS_NO_BOOK,
+                           schema=PLAYER_PROPS_RAW_SCHEMA, open_book_id=OPEN_BOOK_ID,
+                           fallback_priority=OPEN_FALLBACK_PRIORITY)
 
-    # Finally, keep only latest per (… + book_id)
-    combined = keep_only_latest_per_book(combined)
-    return combined
 
 def ensure_dir(path: str):
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
 
 
-if __name__ == '__main__':
-    root_path = './data/raw'
-    START_SEASON = 2022
-
-    access_token = os.environ.get("ACTION_NETWORK_ACCESS_TOKEN", None)
-    debug = True
-
-    sport_league_pairs = [
-        ESPNSportLeagueTypes.FOOTBALL_NFL,
-    ]
-
-    for sport_league in sport_league_pairs:
-        sport_str, league_str = sport_league.value.split("/")
-        raw_proj_path = f"{root_path}/{sport_str}/{league_str}/player_props/"
-        processed_proj_path = f"./data/processed/{sport_str}/{league_str}/player_props/"
-        ensure_dir(raw_proj_path)
-        ensure_dir(processed_proj_path)
-
-        league_api = ESPNLeagueAPI(sport_str, league_str)
-        if not league_api.is_active():
-            print("Running in OffSeason")
-
-        update_seasons = get_seasons_to_update(f"./data/processed/{sport_str}/{league_str}", "player_props")
-        update_seasons = [i for i in update_seasons if i >= START_SEASON]
-        if not update_seasons:
-            print("No seasons to update.")
-            continue
-
-        print(f"Running Player Props Pump for: {sport_league.value} from {min(update_seasons)} to {max(update_seasons)}")
-
-        for update_season in update_seasons:
-            season_raw_proj_path = f"{raw_proj_path}{update_season}/"
-            ensure_dir(season_raw_proj_path)
-
-            processed_season_path = f"{processed_proj_path}{update_season}.parquet"
-            processed_df = get_dataframe(processed_season_path)  # may be empty
-
-            # Determine weeks
-            if update_season == find_year_for_season():
-                current_week = find_week_for_season()
-                if processed_df.shape[0] != 0:
-                    max_processed_week = 1 if current_week == 1 else current_week-1
-                    processed_df = processed_df[processed_df.week <= current_week+1].copy()
-                else:
-                    max_processed_week = 1
-                # re/build from max_processed_week through current_week (+1 to also include the current week snapshot)
-                update_weeks = list(range(max_processed_week, current_week + 1 + 1))
-            else:
-                update_week = processed_df.week.max() if processed_df.shape[0] != 0 else 1
-                update_weeks = list(range(update_week, (22 + 1 if update_season >= 2021 else 21 + 1)))
-
-            print(f"Season {update_season} -> weeks: {update_weeks}")
-
-            shift = (18 if update_season >= 2021 else 17)
-            season_rows = []
-
-            for canonical_week in update_weeks:
-
-                polite_sleep_block()
-
-                # Determine season_type + the "API week" used by Action Network
-                if canonical_week > shift:
-                    season_type = "post"
-                    season_type_week = canonical_week - shift
-                    if update_season <= 2022 and canonical_week==22:
-                        continue # No Wild Card Week
-                else:
-                    season_type = "reg"
-                    season_type_week = canonical_week
-
-                # Pull
-                df = get_player_props(
-                    season=update_season,
-                    week=season_type_week,
-                    season_type=season_type,
-                    access_token=access_token,
-                )
-                if df.shape[0] == 0:
-                    print(f"No data for {canonical_week} yet")
-                    continue
-
-                # IMPORTANT: store canonical NFL week number (1..22) for consistency on disk
-                df = df.copy()
-                df["week"] = canonical_week
-
-                # Load existing weekly parquet (if any)
-                week_dir = f"{season_raw_proj_path}{canonical_week}/"
-                ensure_dir(week_dir)
-                weekly_path = f"{week_dir}player_props.parquet"
-                current_df = get_dataframe(weekly_path)  # empty df if not found
-
-                # Merge + fill OPEN + keep latest per (… + book_id)
-                merged_week_df = merge_with_existing_and_dedupe(current_df, df)
-
-                # Save weekly
-                put_dataframe(merged_week_df, weekly_path)
-
-                print(f"Saved week {canonical_week}: {merged_week_df.shape[0]} rows "
-                      f"({merged_week_df.book_id.value_counts(dropna=False).to_dict()})")
-
-                season_rows.append(merged_week_df)
-
-            # Optional: write/refresh season-level processed parquet (concat of weekly files already deduped weekly)
-            if season_rows:
-
-                season_df = pd.concat(season_rows, ignore_index=True)
-                season_df = season_df.rename(columns={'player_id': 'action_network_player_id'})
-                season_df['action_network_player_id'] = season_df['action_network_player_id'].fillna(-1).astype(int).astype(str)
-                season_df['player_id'] = season_df['action_network_player_id'].map(ACTION_NETWORK_ID_MAPPER)
-                # Keep only latest per composite key again just in case multiple runs in same session
-                season_df = keep_only_latest_per_book(season_df)
-                season_df = merge_with_existing_and_dedupe(processed_df, season_df)
-                ensure_dir(processed_proj_path)
-                put_dataframe(season_df, processed_season_path)
-                print(f"Updated processed season parquet: {processed_season_path} "
-                      f"({season_df.shape[0]} rows)")
-
-
-
-
-
+def weekly_path_for(season_raw_path: str, canonical_week: int) -> str:
+    return f"{season_raw_path}{canonical_week}/player_props.parquet"
+
+
+@discards_pending
+def run_week(*, season: int, canonical_week: int, season_raw_path: str, access_token: Optional[str],
+             cache_ttl: Optional[float], cache: Optional[ResponseCache], archive: Optional[PayloadArchive],
+             replay: bool = False, rate_limiter=None,
+             fingerprints: Optional[PayloadFingerprints] = None,
+             game_ids: Optional[List[int]] = None,
+             history: Optional[LineHistory] = None,
+             open_lines: Optional[OpenLineTracker] = None,
+             games: Optional[GameDimension] = None) -> Optional[pd.DataFrame]:
+    """Pull one canonical week, merge into its weekly parquet and save it (None if no data).
+    With `fingerprints`, games whose payload is unchanged are not re-merged; when none
+    changed the weekly parquet is returned untouched. `game_ids` limits the per-game
+    props fetch to those games (the rest of the weekly parquet is kept as is).
+    Props that moved are appended to `history`.
+    With `open_lines`, OPEN (30) rows are the frozen first observation instead of being
+    re-inferred from the latest fallback-book rows. With `games`, the week's game list comes
+    from the games dimension (written by the game-lines run) while it is fresh.
+    Units are independent of each other, so they can run in any order/process."""
+    # Determine season_type + the "API week" used by Action Network
+    api_week = api_week_for(season, canonical_week)
+    if api_week is None:
+        return None  # No Wild Card Week
+    season_type, season_type_week = api_week
+
+    weekly_path = weekly_path_for(season_raw_path, canonical_week)
+    if replay:
+        fingerprints = None  # replay rebuilds every game from the archive
+        history = None  # the archive only holds each week's last fetch: nothing new to log
+    elif fingerprints is not None and not os.path.exists(weekly_path):
+        fingerprints.forget(PROPS, season=season, season_type=season_type, week=season_type_week)
+
+    # Pull
+    df = get_player_props(
+        season=season,
+        week=season_type_week,
+        season_type=season_type,
+        access_token=access_token,
+        rate_limiter=rate_limiter,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        archive=archive,
+        replay=replay,
+        fingerprints=fingerprints,
+        game_ids=game_ids,
+        games=games,
+    )
+    if df is None:
+        fingerprints.stats["weeks_skipped"] += 1
+        count("weeks_skipped")
+        print(f"{season} week {canonical_week}: every game's payload unchanged, skipped")
+        with timer("read"):
+            return read_parquet(weekly_path, PLAYER_PROPS_RAW_SCHEMA)
+    if df.shape[0] == 0:
+        print(f"No data for {season} week {canonical_week} yet")
+        return None
+
+    # IMPORTANT: store canonical NFL week number (1..22) for consistency on disk
+    df = df.copy()
+    df["week"] = canonical_week
+
+    # Load existing weekly parquet (if any)
+    ensure_dir(os.path.dirname(weekly_path))
+    # empty df if not found; replay rebuilds the week purely from the archive
+    with timer("read"):
+        current_df = pd.DataFrame() if replay else read_parquet(weekly_path, PLAYER_PROPS_RAW_SCHEMA)
+
+    # OPEN (30): frozen per group by the tracker; inferred only for groups it never saw
+    with timer("open_lines"):
+        df = open_lines.fill_open(df, seen=current_df) if open_lines is not None else ensure_open_lines(df)
+
+    # Line movement: the history keeps every change the weekly file overwrites
+    if history is not None:
+        with timer("history"):
+            history.append(df)
+
+    # Merge + keep latest per (… + book_id)
+    with timer("dedupe"):
+        merged_week_df = merge_with_existing_and_dedupe(current_df, df, fill_open=False)
+
+    # Save weekly
+    with timer("write"):
+        write_parquet(merged_week_df, weekly_path, PLAYER_PROPS_RAW_SCHEMA)
+    count("weeks_saved")
+    count("rows_written", merged_week_df.shape[0])
+    if fingerprints is not None:
+        fingerprints.commit()  # only now are these payloads part of the weekly parquet
+
+    print(f"Saved {season} week {canonical_week}: {merged_week_df.shape[0]} rows "
+          f"({merged_week_df.book_id.value_counts(dropna=False).to_dict()})")
+    return merged_week_df
+
+
+# --------------- RUN (src.feed_runner) --------------- #
+FEED = Feed(
+    name=PLAYER_PROPS,
+    title="Player Props",
+    run_week=run_week,
+    weekly_path_for=weekly_path_for,
+    publish_season=publish_season,
+    line_history=line_history,
+    open_line_tracker=open_line_tracker,
+    weekly_schema=PLAYER_PROPS_RAW_SCHEMA,
+    processed_schema=PLAYER_PROPS_SCHEMA,
+    replay_endpoint=GAMES,
+    start_season=START_SEASON,
+    requests_per_second=BACKFILL_REQUESTS_PER_SECOND,
+)
 
 
+if __name__ == '__main__':
+    main(FEED, description="Action Network player props pump")
@@ -0,0 +1,384 @@
+"""
+Adaptive polling daemon: keeps the current and next week's game lines and player props
+up to date with one long-running process instead of fixed cron snapshots.
+
+    python poll_daemon.py [--feeds game_lines player_props] [--once] [--max-hours 24]
+
+Kickoff times and statuses come from the scoreboard (`start_time` / `status` of
+GameLinesClient's games). Every game is polled on its own clock (see poll_interval):
+once a day a week out, every 5 minutes in the last half hour, every 15 minutes
+while live, never again once final. Player props are fetched for the due game only;
+the scoreboard has no per-game endpoint, so game lines are one request per week,
+due whenever the week's most urgent game is (the payload fingerprints still only
+re-merge games whose lines moved).
+
+Weekly parquets are written after every poll; season rollups (publish_season) are
+batched every ROLLUP_EVERY seconds, before long idle sleeps, and on exit (SIGTERM / ^C).
+Meant for a long-running host; the scheduled workflows keep running the one-shot pipeline.py.
+"""
+import argparse
+import heapq
+import itertools
+import os
+import signal
+import sys
+import time
+import traceback
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+
+import event_odds_runner
+import player_props_runner
+from src.action_games_runner import GameLinesClient
+from src.action_props_runner import SimpleGamesClient
+from src.datasets import GAME_LINES, PLAYER_PROPS
+from src.fingerprints import PayloadFingerprints
+from src.games import FINAL_STATUSES, GameDimension
+from src.http_cache import ResponseCache
+from src.metrics import get_metrics
+from src.payload_archive import PayloadArchive
+from src.resilience import get_resilience
+from src.schemas import GAME_LINES_SCHEMA, PLAYER_PROPS_RAW_SCHEMA, read_parquet
+from src.transport import get_transport
+from src.utils import TokenBucket, api_week_for
+
+load_dotenv()
+
+# ----------------- CONFIG ----------------- #
+MINUTE, HOUR, DAY = 60.0, 3600.0, 86400.0
+
+# (time to kickoff above, poll every): the first matching row wins
+POLL_TIERS: List[Tuple[float, float]] = [
+    (7 * DAY, 24 * HOUR),
+    (2 * DAY, 6 * HOUR),
+    (1 * DAY, 2 * HOUR),
+    (6 * HOUR, 1 * HOUR),
+    (2 * HOUR, 20 * MINUTE),
+    (30 * MINUTE, 10 * MINUTE),
+    (0.0, 5 * MINUTE),
+]
+LIVE_INTERVAL = 15 * MINUTE
+LIVE_GIVE_UP = 6 * HOUR          # past kickoff and still not final: stop anyway
+
+SCHEDULE_TTL = 10 * MINUTE       # kickoff times / statuses are re-read at most this often per week
+MARKETS_TTL = 30 * MINUTE        # props' game list (scoreboard/markets) barely moves within a day
+WEEKS_REFRESH = 6 * HOUR         # re-check which weeks are current
+ROLLUP_EVERY = 15 * MINUTE       # batch season rollups
+SUMMARY_EVERY = 1 * HOUR
+ERROR_RETRY = 5 * MINUTE         # a failed poll (or week reschedule) is retried after this
+DAEMON_REQUESTS_PER_SECOND = 1.0
+
+RAW_ROOT = "./data/raw/football/nfl"
+PROCESSED_ROOT = "./data/processed/football/nfl"
+
+# feed -> (runner module, schema of its weekly parquets)
+FEEDS = {
+    GAME_LINES: (event_odds_runner, GAME_LINES_SCHEMA),
+    PLAYER_PROPS: (player_props_runner, PLAYER_PROPS_RAW_SCHEMA),
+}
+
+JobKey = Tuple[str, int, int, Optional[int]]  # (feed, season, canonical week, game id | None for the whole week)
+SCHEDULE = "schedule"  # JobKey "feed" of a week whose reschedule failed: it is retried, not polled
+
+
+# --------------- POLL CADENCE --------------- #
+def poll_interval(seconds_to_kickoff: Optional[float], status: Optional[str]) -> Optional[float]:
+    """Seconds until a game's next poll; None once it no longer needs polling."""
+    if status is not None and str(status).lower() in FINAL_STATUSES:
+        return None
+    if seconds_to_kickoff is None:
+        return POLL_TIERS[0][1]  # no kickoff time yet: slowest cadence
+    if seconds_to_kickoff <= 0:
+        return LIVE_INTERVAL if -seconds_to_kickoff < LIVE_GIVE_UP else None
+    for above, every in POLL_TIERS:
+        if seconds_to_kickoff > above:
+            return every
+    return POLL_TIERS[-1][1]
+
+
+def _kickoff_ts(start_time) -> Optional[float]:
+    if start_time is None or pd.isna(start_time):
+        return None
+    try:
+        return pd.Timestamp(start_time).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def daemon_ttl(url: str, params: Dict) -> float:
+    """ResponseCache TTL policy: only the props' game list is served from cache between polls."""
+    return MARKETS_TTL if url == SimpleGamesClient.BASE_URL else 0.0
+
+
+class PollSchedule:
+    """Min-heap of (due, key); re-scheduling a key just records its new due time and
+    the stale heap entry is skipped when it surfaces."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, JobKey]] = []
+        self._due: Dict[JobKey, float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def set(self, key: JobKey, due: Optional[float]) -> None:
+        """Schedule `key` at `due` (None drops it)."""
+        if due is None:
+            self._due.pop(key, None)
+            return
+        if self._due.get(key) == due:
+            return
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, next(self._seq), key))
+
+    def next_due(self) -> Optional[float]:
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[JobKey]:
+        keys = []
+        while (due := self.next_due()) is not None and due <= now:
+            _, _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            keys.append(key)
+        return keys
+
+
+# --------------- DAEMON --------------- #
+class PollDaemon:
+    """
+    Per-game adaptive polling for `feeds` over the current and next canonical week.
+    `clock` (wall-clock seconds, compared with kickoff times) and `sleep` are injectable.
+    """
+
+    def __init__(
+        self,
+        feeds: Iterable[str] = tuple(FEEDS),
+        *,
+        access_token: Optional[str] = None,
+        requests_per_second: float = DAEMON_REQUESTS_PER_SECOND,
+        cache: Optional[ResponseCache] = None,
+        archive: Optional[PayloadArchive] = None,
+        fingerprints: Optional[PayloadFingerprints] = None,
+        games: Optional[GameDimension] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.feeds = list(feeds)
+        self.access_token = access_token
+        self.cache = cache or ResponseCache(ttl_policy=daemon_ttl)
+        self.archive = archive or PayloadArchive()
+        self.fingerprints = fingerprints or PayloadFingerprints()
+        # lines polls keep each week's games table current; props polls read their game list from it
+        self.games = games or GameDimension()
+        # every poll logs what moved: the point of polling near kickoff is the line movement
+        self.history = {feed: runner.line_history() for feed, (runner, _) in FEEDS.items()}
+        self.open_lines = {feed: runner.open_line_tracker() for feed, (runner, _) in FEEDS.items()}
+        # one budget for every request the daemon makes (schedule, lines, props)
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self.clock = clock
+        self.sleep = sleep
+        self.schedule = PollSchedule()
+        self.stats = {"polls": 0, "unchanged": 0, "errors": 0, "rollups": 0}
+        self._weeks: Set[Tuple[int, int]] = set()
+        self._last_poll: Dict[JobKey, float] = {}
+        self._retry_at: Dict[JobKey, float] = {}  # failed polls wait ERROR_RETRY before the next attempt
+        self._dirty: Set[Tuple[str, int, int]] = set()  # (feed, season, week) with weekly changes not rolled up
+
+    # ----------- schedule -----------
+    def tracked_weeks(self) -> List[Tuple[int, int]]:
+        """(season, canonical week) pairs worth polling: the current week and the next one."""
+        from nfl_data_loader.utils.utils import find_year_for_season, find_week_for_season
+        season, week = find_year_for_season(), find_week_for_season()
+        return [(season, w) for w in (week, week + 1) if api_week_for(season, w) is not None]
+
+    def week_games(self, season: int, canonical_week: int) -> pd.DataFrame:
+        """Kickoff times and statuses of one week (scoreboard, cached for SCHEDULE_TTL)."""
+        season_type, week = api_week_for(season, canonical_week)
+        hdrs = {"access_token": self.access_token} if self.access_token else None
+        client = GameLinesClient(default_headers=hdrs, cache=self.cache, rate_limiter=self.rate_limiter)
+        # same params as event_odds_runner.get_game_lines: a lines poll refreshes this cache entry
+        payload = client.fetch_payload(season=season, week=week, season_type=season_type,
+                                       book_ids=event_odds_runner.DEFAULT_BOOK_IDS,
+                                       periods=event_odds_runner.DEFAULT_PERIODS, cache_ttl=SCHEDULE_TTL)
+        games_df, _ = client.parse_payload(payload)
+        return games_df
+
+    def _next_due(self, key: JobKey, interval: Optional[float], now: float) -> Optional[float]:
+        if interval is None:
+            return None
+        last = self._last_poll.get(key)
+        due = now if last is None else max(now, last + interval)
+        return max(due, self._retry_at.get(key, due))
+
+    def reschedule_week(self, season: int, canonical_week: int) -> None:
+        now = self.clock()
+        games_df = self.week_games(season, canonical_week)
+        intervals: Dict[int, Optional[float]] = {}
+        for g in games_df.to_dict("records") if not games_df.empty else []:
+            kickoff = _kickoff_ts(g.get("start_time"))
+            intervals[int(g["id"])] = poll_interval(None if kickoff is None else kickoff - now, g.get("status"))
+
+        if PLAYER_PROPS in self.feeds:
+            for game_id, interval in intervals.items():
+                key = (PLAYER_PROPS, season, canonical_week, game_id)
+                self.schedule.set(key, self._next_due(key, interval, now))
+        if GAME_LINES in self.feeds:
+            # one scoreboard request covers the week: due as soon as its most urgent game is
+            live = [i for i in intervals.values() if i is not None]
+            key = (GAME_LINES, season, canonical_week, None)
+            self.schedule.set(key, self._next_due(key, min(live), now) if live else None)
+
+    def refresh_weeks(self, weeks: Optional[Iterable[Tuple[int, int]]] = None) -> None:
+        """Re-read kickoff times / statuses of `weeks` (default: the tracked weeks) and reschedule."""
+        if weeks is None:
+            weeks = self.tracked_weeks()
+            for season, week in set(weeks) - self._weeks:
+                print(f"Tracking {season} week {week}")
+            self._weeks = set(weeks)
+        for season, week in weeks:
+            retry_key = (SCHEDULE, season, week, None)
+            try:
+                self.reschedule_week(season, week)
+            except Exception as e:
+                self._failed(f"Schedule for {season} week {week}", e)
+                self.schedule.set(retry_key, self.clock() + ERROR_RETRY)
+            else:
+                self.schedule.set(retry_key, None)
+
+    # ----------- poll -----------
+    def poll(self, key: JobKey) -> None:
+        feed, season, canonical_week, game_id = key
+        runner, _ = FEEDS[feed]
+        season_raw_path = os.path.join(RAW_ROOT, feed, str(season), "")
+        os.makedirs(season_raw_path, exist_ok=True)
+        common = dict(season=season, canonical_week=canonical_week, season_raw_path=season_raw_path,
+                      access_token=self.access_token, cache_ttl=None, cache=self.cache, archive=self.archive, rate_limiter=self.rate_limiter,
+                      fingerprints=self.fingerprints, history=self.history[feed],
+                      open_lines=self.open_lines[feed], games=self.games)
+
+        skipped_before = self.fingerprints.stats["weeks_skipped"]
+        try:
+            if feed == PLAYER_PROPS:
+                merged = runner.run_week(**common, game_ids=[game_id])
+            else:
+                merged = runner.run_week(**common)
+        except Exception as e:
+            self._failed(f"Poll {key}", e)
+            self._retry_at[key] = self.clock() + ERROR_RETRY
+            self.schedule.set(key, self._retry_at[key])
+            return
+        self.stats["polls"] += 1
+        self._last_poll[key] = self.clock()
+        self._retry_at.pop(key, None)
+        if merged is not None and self.fingerprints.stats["weeks_skipped"] == skipped_before:
+            self._dirty.add((feed, season, canonical_week))
+        elif merged is not None:
+            self.stats["unchanged"] += 1
+
+    def _failed(self, what: str, e: Exception) -> None:
+        """Count and log a failed poll / reschedule; one bad game or payload must not stop the daemon."""
+        self.stats["errors"] += 1
+        print(f"{what} failed: {e!r}")
+        if not isinstance(e, requests.RequestException):
+            traceback.print_exc()  # not the network: a payload / schema / merge problem worth the stack
+
+    def poll_due(self, now: float) -> None:
+        """Run every due poll, then reschedule the weeks they touched from fresh statuses."""
+        # lines first: their scoreboard fetch is what the reschedule below reads back from cache
+        due = sorted(self.schedule.pop_due(now), key=lambda key: key[0] != GAME_LINES)
+        for key in due:
+            if key[0] != SCHEDULE:  # a failed reschedule only needs the refresh below
+                self.poll(key)
+        self.refresh_weeks(sorted({(season, week) for _, season, week, _ in due}))
+
+    # ----------- rollup -----------
+    def flush(self) -> None:
+        """Roll every week changed since the last flush into its season parquet."""
+        by_season: Dict[Tuple[str, int], List[int]] = {}
+        for feed, season, week in sorted(self._dirty):
+            by_season.setdefault((feed, season), []).append(week)
+        for (feed, season), weeks in by_season.items():
+            runner, schema = FEEDS[feed]
+            season_raw_path = os.path.join(RAW_ROOT, feed, str(season), "")
+            season_rows = [read_parquet(runner.weekly_path_for(season_raw_path, w), schema) for w in weeks]
+            season_rows = [rows for rows in season_rows if not rows.empty]
+            if season_rows:
+                processed_path = os.path.join(PROCESSED_ROOT, feed)
+                os.makedirs(processed_path, exist_ok=True)
+                runner.publish_season(season, os.path.join(processed_path, f"{season}.parquet"), season_rows)
+                self.stats["rollups"] += 1
+        self._dirty.clear()
+
+    def print_summary(self) -> None:
+        print(f"Daemon: {self.stats}, {len(self.schedule)} polls scheduled, next at "
+              f"{pd.Timestamp(self.schedule.next_due(), unit='s') if self.schedule.next_due() else None}")
+        print(f"HTTP cache: {self.cache.stats}")
+        print(f"HTTP transport: {get_transport().stats()}")
+        print(f"HTTP retries: {get_resilience().stats}")
+        print(f"Payload fingerprints (games; weeks skipped): {self.fingerprints.stats}")
+        history_stats = {feed: h.stats for feed, h in self.history.items()}
+        print(f"Line history (rows seen / appended): {history_stats}")
+        open_stats = {feed: t.stats for feed, t in self.open_lines.items()}
+        print(f"Open lines (first observed / frozen OPEN served / inferred): {open_stats}")
+        print(f"Games dimension (saved / served / stale / missing): {self.games.stats}")
+        print(f"Stages (seconds / calls): {get_metrics().stages()}")
+
+    # ----------- main loop -----------
+    def run(self, *, once: bool = False, max_seconds: Optional[float] = None) -> None:
+        """Poll until `max_seconds` elapse (forever by default) or, with once=True, after one
+        pass over everything due now. Pending rollups are always flushed on the way out."""
+        started = self.clock()
+        last_weeks = last_flush = last_summary = float("-inf")
+        try:
+            while True:
+                now = self.clock()
+                if now - last_weeks >= WEEKS_REFRESH:
+                    self.refresh_weeks()
+                    last_weeks = now
+                self.poll_due(now)
+                now = self.clock()
+                if once:
+                    break
+                if now - last_summary >= SUMMARY_EVERY:
+                    self.print_summary()
+                    last_summary = now
+
+                deadline = None if max_seconds is None else started + max_seconds
+                next_due = self.schedule.next_due()
+                wake = min(t for t in (next_due, last_weeks + WEEKS_REFRESH, deadline) if t is not None)
+                if self._dirty and (now - last_flush >= ROLLUP_EVERY or wake - now >= ROLLUP_EVERY):
+                    self.flush()  # due, or the daemon is about to idle for a while
+                    last_flush = self.clock()
+                if deadline is not None and now >= deadline:
+                    break
+                if wake > now:
+                    self.sleep(wake - now)
+        finally:
+            self.flush()
+            self.print_summary()
+
+
+# --------------- MAIN --------------- #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adaptive per-game polling of Action Network lines + props")
+    parser.add_argument("--feeds", nargs="+", choices=list(FEEDS), default=list(FEEDS))
+    parser.add_argument("--once", action="store_true", help="poll everything due now, roll up and exit")
+    parser.add_argument("--max-hours", type=float, help="stop (after a final rollup) after this many hours")
+    parser.add_argument("--requests-per-second", type=float, default=DAEMON_REQUESTS_PER_SECOND)
+    args = parser.parse_args()
+
+    # SIGTERM (service stop) unwinds like ^C so the finally-block rollup still runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    daemon = PollDaemon(args.feeds, access_token=os.environ.get("ACTION_NETWORK_ACCESS_TOKEN", None),
+                        requests_per_second=args.requests_per_second)
+    try:
+        daemon.run(once=args.once, max_seconds=None if args.max_hours is None else args.max_hours * HOUR)
+    except KeyboardInterrupt:
+        pass
@@ -2,6 +2,12 @@ import requests
 import pandas as pd
 from typing import Dict, Any, Iterable, Optional, List, Tuple
 
+from src.http_cache import ResponseCache
+from src.metrics import timed, timer
+from src.resilience import Resilience, get_resilience
+from src.transport import DEFAULT_HEADERS, get_session
+from src.utils import to_numeric_or_keep, TokenBucket
+
 class GameLinesClient:
     BASE_URL = "https://api.actionnetwork.com/web/v2/scoreboard/nfl"
     PERIOD_KEYS_DEFAULT = (
@@ -13,19 +19,15 @@ class GameLinesClient:
         default_headers: Optional[Dict[str, str]] = None,
         session: Optional[requests.Session] = None,
         team_abbr_map: Optional[Dict[str, str]] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        resilience: Optional[Resilience] = None,
     ):
-        self.session = session or requests.Session()
-        self.headers = {
-            "Accept": "application/json",
-            "Accept-Language": "en-US,en;q=0.9",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/119.0.0.0 Safari/537.36"
-            ),
-            "Origin": "https://www.actionnetwork.com",
-            "Referer": "https://www.actionnetwork.com/",
-        }
+        self.session = session or get_session()  # shared keep-alive pool (src.transport)
+        self.cache = cache
+        self.rate_limiter = rate_limiter  # anything with .acquire(); may be shared across workers
+        self.resilience = resilience or get_resilience()
+        self.headers = dict(DEFAULT_HEADERS)
         if default_headers:
             self.headers.update(default_headers)
         self.team_abbr_map = team_abbr_map or {}
@@ -42,9 +44,10 @@ class GameLinesClient:
         extra_params: Optional[Dict[str, Any]] = None,
         extra_headers: Optional[Dict[str, str]] = None,
         timeout: int = 20,
+        cache_ttl: Optional[float] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Single GET → (games_df, game_lines_df) across requested periods & books."""
-        payload = self._fetch_payload(
+        payload = self.fetch_payload(
             season=season,
             week=week,
             season_type=season_type,
@@ -53,12 +56,49 @@ class GameLinesClient:
             extra_params=extra_params,
             extra_headers=extra_headers,
             timeout=timeout,
+            cache_ttl=cache_ttl,
         )
+        return self.parse_payload(payload)
+
+    # ----------- PUBLIC: raw payload / offline parse (archive + replay) -----------
+    def fetch_payload(
+        self,
+        *,
+        season: int,
+        week: int,
+        season_type: str = "reg",
+        book_ids: Optional[Iterable[int]] = None,
+        periods: Optional[Iterable[str]] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        timeout: int = 20,
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Raw scoreboard JSON for one week; `parse_payload` turns it into DataFrames."""
+        return self._fetch_payload(
+            season=season,
+            week=week,
+            season_type=season_type,
+            book_ids=book_ids,
+            periods=periods,
+            extra_params=extra_params,
+            extra_headers=extra_headers,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+        )
+
+    @timed("parse")
+    def parse_payload(self, payload: Dict[str, Any]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Scoreboard JSON → (games_df, game_lines_df); no network."""
         games = payload.get("games", []) or []
         games_df = self._parse_games_flat(games)
         game_lines_df = self._parse_game_markets_flat(games)
         return games_df, game_lines_df
 
+    def parse_games(self, payload: Dict[str, Any]) -> pd.DataFrame:
+        """Scoreboard JSON → games_df only (ids, teams, kickoff, status, num_bets); no network."""
+        return self._parse_games_flat(payload.get("games", []) or [])
+
     # ----------- INTERNAL: one GET -----------
     def _fetch_payload(
         self,
@@ -71,6 +111,7 @@ class GameLinesClient:
         extra_params: Optional[Dict[str, Any]],
         extra_headers: Optional[Dict[str, str]],
         timeout: int,
+        cache_ttl: Optional[float] = None,
     ) -> Dict[str, Any]:
         params = {
             "week": week,
@@ -91,10 +132,22 @@ class GameLinesClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = self.session.get(self.BASE_URL, params=params, headers=headers, timeout=timeout)
+        if self.cache is not None:
+            return self.cache.fetch_json(
+                self.BASE_URL, params=params, headers=headers, ttl=cache_ttl,
+                send=lambda h: self._get(self.BASE_URL, params=params, headers=h, timeout=timeout),
+            )
+
+        resp = self._get(self.BASE_URL, params=params, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             raise requests.HTTPError(f"{resp.status_code} for {resp.url}\n{resp.text[:800]}")
-        return resp.json() or {}
+        with timer("json_decode"):
+            return resp.json() or {}
+
+    def _get(self, url: str, *, params: Dict[str, Any], headers: Dict[str, str], timeout: int) -> requests.Response:
+        # retries, backoff, circuit breaker and deadline: src.resilience
+        return self.resilience.get(self.session, url, params=params, headers=headers, timeout=timeout,
+                                   rate_limiter=self.rate_limiter)
 
     # ----------- INTERNAL: parse flat games -----------
     def _parse_games_flat(self, games: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -136,12 +189,33 @@ class GameLinesClient:
         for col in ("id", "season", "week", "num_bets", "home_team_id", "away_team_id",
                     "home_rotation_number", "away_rotation_number", "core_id"):
             if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="ignore")
+                df[col] = to_numeric_or_keep(df[col])
         return df
 
     # ----------- INTERNAL: parse flat game market lines (all periods) -----------
+    # One column buffer per output field (in output order); avoids a dict per outcome.
+    MARKET_COLUMNS = (
+        "type", "line_type",
+        "market_id", "outcome_id",
+        "event_id", "book_id",
+        "player_id", "option_type_id",
+        "period", "side",
+        "value", "odds", "is_live",
+        "line_status", "deeplink_id",
+        "odds_coefficient_score",
+        "team_id", "team",
+        "competitor_id",
+        "season", "week", "total_bets_on_event",
+        "tickets_value", "tickets_percent", "money_value", "money_percent",
+    )
+    MARKET_NUMERIC_COLUMNS = ("event_id", "book_id", "team_id", "player_id", "competitor_id", "season", "week")
+
     def _parse_game_markets_flat(self, games: List[Dict[str, Any]]) -> pd.DataFrame:
-        rows: List[Dict[str, Any]] = []
+        cols: Dict[str, List[Any]] = {c: [] for c in self.MARKET_COLUMNS}
+        (type_, line_type, market_id, outcome_id, event_id_, book_id_, player_id, option_type_id,
+         period, side, value, odds, is_live, line_status, deeplink_id, odds_coefficient_score,
+         team_id_, team, competitor_id, season, week, total_bets_on_event,
+         tickets_value, tickets_percent, money_value, money_percent) = (cols[c].append for c in self.MARKET_COLUMNS)
 
         for g in games:
             event_id = g.get("id")
@@ -181,79 +255,52 @@ class GameLinesClient:
                                 continue
 
                             team_id = o.get("team_id", 0)
-                            team_abbr = id_to_abbr.get(team_id)
-
                             bet_info = o.get("bet_info") or {}
                             tickets = bet_info.get("tickets") or {}
                             money = bet_info.get("money") or {}
 
-                            rows.append({
-                                # IDs
-                                "event_id": o.get("event_id", event_id),
-                                "market_id": o.get("market_id"),
-                                "outcome_id": o.get("outcome_id"),
-                                "book_id": book_id,
-
-                                # Market typing (flat)
-                                "type": o.get("type", market_type),     # moneyline | spread | total
-                                "line_type": o.get("type", market_type),
-
-                                # Period: prefer payload's explicit period, fall back to the block we iterated
-                                "period": o.get("period", period_key),
-
-                                "side": o.get("side"),
-
-                                # Price/line
-                                "value": o.get("value"),
-                                "odds": o.get("odds"),
-                                "is_live": o.get("is_live"),
-                                "line_status": o.get("line_status"),
-                                "deeplink_id": o.get("deeplink_id"),
-                                "odds_coefficient_score": o.get("odds_coefficient_score"),
-
-                                # Participant
-                                "team_id": team_id,
-                                "team": team_abbr,
-                                "player_id": o.get("player_id", 0),
-                                "competitor_id": o.get("competitor_id", 0),
-                                "option_type_id": o.get("option_type_id", None),
-
-                                # Meta
-                                "season": season_g,
-                                "week": week_g,
-                                "total_bets_on_event": num_bets,
-
-                                # Splits (if present)
-                                "tickets_value": tickets.get("value"),
-                                "tickets_percent": tickets.get("percent"),
-                                "money_value": money.get("value"),
-                                "money_percent": money.get("percent"),
-                            })
-
-        df = pd.DataFrame(rows)
+                            # Market typing (flat): moneyline | spread | total
+                            type_(o.get("type", market_type))
+                            line_type(o.get("type", market_type))
+                            # IDs
+                            market_id(o.get("market_id"))
+                            outcome_id(o.get("outcome_id"))
+                            event_id_(o.get("event_id", event_id))
+                            book_id_(book_id)
+                            player_id(o.get("player_id", 0))
+                            option_type_id(o.get("option_type_id", None))
+                            # Period: prefer payload's explicit period, fall back to the block we iterated
+                            period(o.get("period", period_key))
+                            side(o.get("side"))
+                            # Price/line
+                            value(o.get("value"))
+                            odds(o.get("odds"))
+                            is_live(o.get("is_live"))
+                            line_status(o.get("line_status"))
+                            deeplink_id(o.get("deeplink_id"))
+                            odds_coefficient_score(o.get("odds_coefficient_score"))
+                            # Participant
+                            team_id_(team_id)
+                            team(id_to_abbr.get(team_id))
+                            competitor_id(o.get("competitor_id", 0))
+                            # Meta
+                            season(season_g)
+                            week(week_g)
+                            total_bets_on_event(num_bets)
+                            # Splits (if present)
+                            tickets_value(tickets.get("value"))
+                            tickets_percent(tickets.get("percent"))
+                            money_value(money.get("value"))
+                            money_percent(money.get("percent"))
+
+        if not cols["event_id"]:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(cols)
 
         # dtype hygiene
-        for col in ["event_id", "book_id", "team_id", "player_id", "competitor_id", "season", "week"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="ignore")
-
-        order = [
-            "type", "line_type",
-            "market_id", "outcome_id",
-            "event_id", "book_id",
-            "player_id", "option_type_id",
-            "period", "side",
-            "value", "odds", "is_live",
-            "line_status", "deeplink_id",
-            "odds_coefficient_score",
-            "team_id", "team",
-            "competitor_id",
-            "season", "week", "total_bets_on_event",
-            "tickets_value", "tickets_percent", "money_value", "money_percent",
-        ]
-        if not df.empty:
-            cols = [c for c in order if c in df.columns] + [c for c in df.columns if c not in order]
-            df = df[cols].reset_index(drop=True)
+        for col in self.MARKET_NUMERIC_COLUMNS:
+            df[col] = to_numeric_or_keep(df[col])
         return df
 
     # ----------- small helper -----------
@@ -1,20 +1,24 @@
 import datetime
-import random
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import pandas as pd
 from typing import Dict, Any, Iterable, Optional, Tuple, List
 
 import unicodedata
-from nfl_data_loader.api.sources.players.general.players import collect_players
-from nfl_data_loader.api.sources.players.rosters.rosters import collect_roster
 from nfl_data_loader.schemas.players.position import POSITION_MAPPER
 from nfl_data_loader.utils.formatters.general import df_rename_fold
 from nfl_data_loader.utils.formatters.reformat_team_name import team_id_repl
 
-from consts import ACTION_NETWORK_ID_MAPPER
-from src.utils import clean_player_names
+from src.http_cache import ResponseCache
+from src.metrics import count, timed, timer
+from src.resilience import Resilience, get_resilience
+from src.transport import DEFAULT_HEADERS, get_session
+from src.payload_archive import PayloadArchive, GAMES, PROPS
+from src.player_ids import get_resolver
+from src.fingerprints import PayloadFingerprints
+from src.games import GameDimension, markets_payload
+from src.utils import clean_player_names, to_numeric_or_keep, TokenBucket
 
 MY_LINES = {
     15: "CONSENSUS",
@@ -24,6 +28,10 @@ MY_LINES = {
     79: "BET365"
 }  # Consensus, Open Line, DK NJ, FD NJ, bet365 NJ
 
+# Per-game props requests: max in flight + shared request budget (requests / second)
+PROPS_MAX_WORKERS = 4
+PROPS_REQUESTS_PER_SECOND = 2.0
+
 PROP_COLS = [
     #'scope',
     'bet_type',
@@ -141,19 +149,15 @@ class SimpleGamesClient:
         default_headers: Optional[Dict[str, str]] = None,
         session: Optional[requests.Session] = None,
         team_abbr_map: Optional[Dict[str, str]] = None,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        resilience: Optional[Resilience] = None,
     ):
-        self.session = session or requests.Session()
-        self.headers = {
-            "Accept": "application/json",
-            "Accept-Language": "en-US,en;q=0.9",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/119.0.0.0 Safari/537.36"
-            ),
-            "Origin": "https://www.actionnetwork.com",
-            "Referer": "https://www.actionnetwork.com/",
-        }
+        self.session = session or get_session()  # shared keep-alive pool (src.transport)
+        self.cache = cache
+        self.rate_limiter = rate_limiter  # anything with .acquire(); may be shared across workers
+        self.resilience = resilience or get_resilience()
+        self.headers = dict(DEFAULT_HEADERS)
         if default_headers:
             self.headers.update(default_headers)
         self.team_abbr_map = team_abbr_map or {}
@@ -169,7 +173,35 @@ class SimpleGamesClient:
         extra_params: Optional[Dict[str, Any]] = None,
         extra_headers: Optional[Dict[str, str]] = None,
         timeout: int = 20,
+        cache_ttl: Optional[float] = None,
     ) -> pd.DataFrame:
+        data = self.fetch_payload(
+            line_type=line_type,
+            season=season,
+            week=week,
+            season_type=season_type,
+            book_ids=book_ids,
+            extra_params=extra_params,
+            extra_headers=extra_headers,
+            timeout=timeout,
+            cache_ttl=cache_ttl,
+        )
+        return self.parse_payload(data)
+
+    def fetch_payload(
+        self,
+        *,
+        line_type: str,
+        season: int,
+        week: int,
+        season_type: str = "reg",
+        book_ids: Optional[Iterable[int]] = None,
+        extra_params: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        timeout: int = 20,
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Raw scoreboard/markets JSON for one week; `parse_payload` turns it into games_df."""
         params = {
             "week": week,
             "season": season,
@@ -185,11 +217,24 @@ class SimpleGamesClient:
         if extra_headers:
             headers.update(extra_headers)
 
-        resp = self.session.get(self.BASE_URL, params=params, headers=headers, timeout=timeout)
+        if self.cache is not None:
+            return self.cache.fetch_json(
+                self.BASE_URL, params=params, headers=headers, ttl=cache_ttl,
+                send=lambda h: self._get(self.BASE_URL, params=params, headers=h, timeout=timeout),
+            )
+        resp = self._get(self.BASE_URL, params=params, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             raise requests.HTTPError(f"{resp.status_code} for {resp.url}\n{resp.text[:800]}")
+        with timer("json_decode"):
+            return resp.json()
 
-        data = resp.json()
+    def _get(self, url: str, *, params: Dict[str, Any], headers: Dict[str, str], timeout: int) -> requests.Response:
+        # retries, backoff, circuit breaker and deadline: src.resilience
+        return self.resilience.get(self.session, url, params=params, headers=headers, timeout=timeout,
+                                   rate_limiter=self.rate_limiter)
+
+    @timed("parse")
+    def parse_payload(self, data: Dict[str, Any]) -> pd.DataFrame:
         games = data.get("games", []) or []
         rows = []
         for g in games:
@@ -209,7 +254,7 @@ class SimpleGamesClient:
         df = pd.DataFrame(rows)
         for col in ("id", "season", "week", "num_bets", "home_team_id", "away_team_id"):
             if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="ignore")
+                df[col] = to_numeric_or_keep(df[col])
         return df
 
 
@@ -224,53 +269,28 @@ class GamePropsClient:
         default_headers: Optional[Dict[str, str]] = None,
         session: Optional[requests.Session] = None,
         bet_type_map: Optional[Dict[str, str]] = None,
+        max_workers: int = 1,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        resilience: Optional[Resilience] = None,
     ):
-        self.session = session or requests.Session()
-        self.headers = {
-            "Accept": "application/json",
-            "Accept-Language": "en-US,en;q=0.9",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/119.0.0.0 Safari/537.36"
-            ),
-            "Origin": "https://www.actionnetwork.com",
-            "Referer": "https://www.actionnetwork.com/",
-        }
+        self.session = session or get_session()  # shared keep-alive pool (src.transport)
+        self.cache = cache
+        self.resilience = resilience or get_resilience()
+        self.headers = dict(DEFAULT_HEADERS)
         if default_headers:
             self.headers.update(default_headers)
 
         self.bet_type_map = bet_type_map or BET_TYPE_MAP
+        # max_workers > 1 fetches games concurrently; rate_limiter is shared by all workers
+        # (a TokenBucket, or a SharedTokenBucket when the budget spans processes)
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = rate_limiter
 
-    def _get_with_retry(self, url, *, params=None, headers=None, timeout=20, max_retries=5,
-                        base_sleep=0.5, max_sleep=8.0):
-        """GET with exponential backoff + full jitter; honors Retry-After when present."""
-        for attempt in range(max_retries):
-            resp = self.session.get(url, params=params, headers=headers, timeout=timeout)
-
-            # Success
-            if resp.status_code < 400:
-                return resp
-
-            # If told to back off, do so
-            if resp.status_code in (429, 500, 502, 503, 504):
-                retry_after = resp.headers.get("Retry-After")
-                if retry_after:
-                    try:
-                        sleep_s = float(retry_after)
-                    except ValueError:
-                        sleep_s = base_sleep
-                else:
-                    # Exponential backoff with FULL JITTER
-                    sleep_s = min(max_sleep, base_sleep * (2 ** attempt)) * random.random()
-                time.sleep(sleep_s)
-                continue
-
-            # Other errors: raise immediately
-            resp.raise_for_status()
-
-        # If we fell out of the loop, last response still errored
-        resp.raise_for_status()
+    def _get(self, url: str, *, params: Dict[str, Any], headers: Dict[str, str], timeout: int) -> requests.Response:
+        # retries, backoff, circuit breaker and deadline: src.resilience
+        return self.resilience.get(self.session, url, params=params, headers=headers, timeout=timeout,
+                                   rate_limiter=self.rate_limiter)
 
     def fetch_props_for_games(
         self,
@@ -281,20 +301,72 @@ class GamePropsClient:
         extra_params: Optional[Dict[str, Any]] = None,
         extra_headers: Optional[Dict[str, str]] = None,
         timeout: int = 20,
+        max_workers: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        all_player_rows: List[Dict[str, Any]] = []
-        all_game_rows: List[Dict[str, Any]] = []
-        all_players: List[Dict[str, Any]] = []
+        game_ids = list(game_ids)
+        blobs = self.fetch_game_payloads(
+            game_ids,
+            state_code=state_code,
+            book_ids=book_ids,
+            extra_params=extra_params,
+            extra_headers=extra_headers,
+            timeout=timeout,
+            max_workers=max_workers,
+            cache_ttl=cache_ttl,
+        )
+        return self.props_from_payloads(game_ids, blobs)
+
+    def fetch_game_payloads(
+        self,
+        game_ids: Iterable[int],
+        *,
+        state_code: str,
+        book_ids: Iterable[int],
+        extra_params: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        timeout: int = 20,
+        max_workers: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Raw props JSON for every game, in game_ids order. With max_workers > 1 the
+        per-game GETs run on a thread pool (bounded in-flight requests, shared
+        rate_limiter); the result matches the serial path exactly.
+        """
+        game_ids = list(game_ids)
+        book_ids = list(book_ids)
 
-        for game_id in game_ids:
-            p_df, g_df, players = self._fetch_one_game(
+        def fetch(game_id: int) -> Dict[str, Any]:
+            return self._fetch_game_payload(
                 game_id=game_id,
                 state_code=state_code,
                 book_ids=book_ids,
                 extra_params=extra_params,
                 extra_headers=extra_headers,
                 timeout=timeout,
+                cache_ttl=cache_ttl,
             )
+
+        workers = min(max_workers or self.max_workers, len(game_ids))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(fetch, game_ids))  # map() preserves input order
+        return [fetch(game_id) for game_id in game_ids]
+
+    @timed("parse")
+    def props_from_payloads(
+        self,
+        game_ids: Iterable[int],
+        blobs: Iterable[Dict[str, Any]],
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Per-game props JSON (aligned with game_ids) → (player_props_df, game_props_df, players_df); no network."""
+        all_player_rows: List[Dict[str, Any]] = []
+        all_game_rows: List[Dict[str, Any]] = []
+        all_players: List[Dict[str, Any]] = []
+
+        for game_id, blob in zip(game_ids, blobs):
+            p_df, g_df, players = self._parse_game_payload(game_id, blob)
             if not p_df.empty:
                 all_player_rows.extend(p_df.to_dict("records"))
             if not g_df.empty:
@@ -324,7 +396,7 @@ class GamePropsClient:
 
         return player_props_df, game_props_df, players_df
 
-    def _fetch_one_game(
+    def _fetch_game_payload(
         self,
         *,
         game_id: int,
@@ -333,7 +405,8 @@ class GamePropsClient:
         extra_params: Optional[Dict[str, Any]],
         extra_headers: Optional[Dict[str, str]],
         timeout: int,
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]]]:
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
         params = {"stateCode": state_code, "bookIds": ",".join(map(str, book_ids))}
         if extra_params:
             params.update(extra_params)
@@ -343,11 +416,22 @@ class GamePropsClient:
             headers.update(extra_headers)
 
         url = self.BASE_URL_TMPL.format(game_id=game_id)
-        resp = self._get_with_retry(url, params=params, headers=headers, timeout=timeout)
+        if self.cache is not None:
+            return self.cache.fetch_json(
+                url, params=params, headers=headers, ttl=cache_ttl,
+                send=lambda h: self._get(url, params=params, headers=h, timeout=timeout),
+            )
+        resp = self._get(url, params=params, headers=headers, timeout=timeout)
         if resp.status_code != 200:
             raise requests.HTTPError(f"{resp.status_code} for {resp.url}\n{resp.text[:800]}")
-        blob = resp.json() or {}
+        with timer("json_decode"):
+            return resp.json() or {}
 
+    def _parse_game_payload(
+        self,
+        game_id: int,
+        blob: Dict[str, Any],
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]]]:
         # players can be a dict keyed by player_id
         players_blob = blob.get("players") or {}
         if isinstance(players_blob, dict):
@@ -368,6 +452,30 @@ class GamePropsClient:
 
         return player_props_df, game_props_df, players
 
+    # One column buffer per field, in the order the old dict-per-row path produced them
+    PROP_ROW_COLUMNS = (
+        "market_id", "type", "bet_type", "line_type",
+        "custom_pick_type_name", "custom_pick_type_display_name", "scope",
+        "book_id", "event_id", "option_type_id", "side", "period", "player_id", "team_id",
+        "competitor_id", "value", "odds", "is_live", "line_status", "deeplink_id",
+        "prop_type_id", "odds_coefficient_score", "outcome_id",
+        "tickets_value", "tickets_percent", "money_value", "money_percent",
+    )
+    PROP_EXTRA_COLUMNS = ("edge", "edge_grade", "projection", "bet_quality")
+    PROP_COLUMN_ORDER = [
+        "scope", "bet_type", "type", "line_type", "market_id",
+        "game_id", "event_id",
+        "book_id", "player_id", "team_id", "competitor_id",
+        "period", "option_type_id", "side",
+        "value", "odds",
+        "tickets_value", "tickets_percent", "money_value", "money_percent",
+        "is_live", "line_status", "deeplink_id",
+        "prop_type_id", "odds_coefficient_score",
+        "edge", "edge_grade", "projection", "bet_quality",
+        "custom_pick_type_name", "custom_pick_type_display_name",
+    ]
+
+    @timed("props_blob")
     def _props_blob_to_df(self, props_blob: Dict[str, Any], scope: str) -> pd.DataFrame:
         """
         props_blob shape:
@@ -381,7 +489,15 @@ class GamePropsClient:
             ...
           }
         """
-        rows: List[Dict[str, Any]] = []
+        cols: Dict[str, List[Any]] = {c: [] for c in self.PROP_ROW_COLUMNS}
+        (market_id_, type_, bet_type, line_type, custom_pick_type_name, custom_pick_type_display_name,
+         scope_, book_id_, event_id, option_type_id, side, period, player_id, team_id,
+         competitor_id, value, odds, is_live, line_status, deeplink_id,
+         prop_type_id, odds_coefficient_score, outcome_id,
+         tickets_value, tickets_percent, money_value, money_percent) = (cols[c].append for c in self.PROP_ROW_COLUMNS)
+        # optional fields get a buffer on first sight, back-filled with NaN like missing dict keys
+        extras: Dict[str, List[Any]] = {}
+        n_rows = 0
 
         for line_type_key, markets in props_blob.items():
             if not isinstance(markets, list):
@@ -394,16 +510,9 @@ class GamePropsClient:
                 market_id = m.get("market_id") or m.get("id")
                 raw_type  = m.get("type") or line_type_key  # fallback to key
                 mapped_bt = mapped or self.bet_type_map.get(raw_type) or self.bet_type_map.get(m.get("line_type")) or raw_type
-
-                base_row = {
-                    "market_id": market_id,
-                    "type": raw_type,               # keep original
-                    "bet_type": mapped_bt,          # <-- mapped column you asked for
-                    "line_type": m.get("line_type"),
-                    "custom_pick_type_name": m.get("custom_pick_type_name"),
-                    "custom_pick_type_display_name": m.get("custom_pick_type_display_name"),
-                    "scope": scope,  # "player" or "game"
-                }
+                m_line_type = m.get("line_type")
+                m_pick_name = m.get("custom_pick_type_name")
+                m_pick_display = m.get("custom_pick_type_display_name")
 
                 lines = m.get("lines") or {}
                 if not isinstance(lines, dict):
@@ -422,58 +531,59 @@ class GamePropsClient:
                         if not isinstance(o, dict):
                             continue
 
-                        r = dict(base_row)
-                        r.update({
-                            "book_id": book_id or o.get("book_id"),
-                            "event_id": o.get("event_id"),
-                            "option_type_id": o.get("option_type_id"),
-                            "side": o.get("side"),
-                            "period": o.get("period"),
-                            "player_id": o.get("player_id"),
-                            "team_id": o.get("team_id"),
-                            "competitor_id": o.get("competitor_id"),
-                            "value": o.get("value"),
-                            "odds": o.get("odds"),
-                            "is_live": o.get("is_live"),
-                            "line_status": o.get("line_status"),
-                            "deeplink_id": o.get("deeplink_id"),
-                            "prop_type_id": o.get("prop_type_id"),
-                            "odds_coefficient_score": o.get("odds_coefficient_score"),
-                            "outcome_id": o.get("outcome_id"),
-                        })
+                        market_id_(market_id)
+                        type_(raw_type)                 # keep original
+                        bet_type(mapped_bt)             # <-- mapped column you asked for
+                        line_type(m_line_type)
+                        custom_pick_type_name(m_pick_name)
+                        custom_pick_type_display_name(m_pick_display)
+                        scope_(scope)                   # "player" or "game"
+                        book_id_(book_id or o.get("book_id"))
+                        event_id(o.get("event_id"))
+                        option_type_id(o.get("option_type_id"))
+                        side(o.get("side"))
+                        period(o.get("period"))
+                        player_id(o.get("player_id"))
+                        team_id(o.get("team_id"))
+                        competitor_id(o.get("competitor_id"))
+                        value(o.get("value"))
+                        odds(o.get("odds"))
+                        is_live(o.get("is_live"))
+                        line_status(o.get("line_status"))
+                        deeplink_id(o.get("deeplink_id"))
+                        prop_type_id(o.get("prop_type_id"))
+                        odds_coefficient_score(o.get("odds_coefficient_score"))
+                        outcome_id(o.get("outcome_id"))
+
                         bet_info = o.get("bet_info") or {}
                         tickets = bet_info.get("tickets") or {}
                         money = bet_info.get("money") or {}
-                        r["tickets_value"] = tickets.get("value")
-                        r["tickets_percent"] = tickets.get("percent")
-                        r["money_value"] = money.get("value")
-                        r["money_percent"] = money.get("percent")
+                        tickets_value(tickets.get("value"))
+                        tickets_percent(tickets.get("percent"))
+                        money_value(money.get("value"))
+                        money_percent(money.get("percent"))
 
-                        for extra in ("edge", "edge_grade", "projection", "bet_quality"):
+                        for extra in self.PROP_EXTRA_COLUMNS:
                             if extra in o:
-                                r[extra] = o.get(extra)
-
-                        rows.append(r)
-
-        df = pd.DataFrame(rows)
-        order = [
-            "scope", "bet_type", "type", "line_type", "market_id",
-            "game_id", "event_id",
-            "book_id", "player_id", "team_id", "competitor_id",
-            "period", "option_type_id", "side",
-            "value", "odds",
-            "tickets_value", "tickets_percent", "money_value", "money_percent",
-            "is_live", "line_status", "deeplink_id",
-            "prop_type_id", "odds_coefficient_score",
-            "edge", "edge_grade", "projection", "bet_quality",
-            "custom_pick_type_name", "custom_pick_type_display_name",
-        ]
-        if not df.empty:
-            cols = [c for c in order if c in df.columns] + [c for c in df.columns if c not in order]
-            df = df[cols]
-        return df
-
-def _get_games(season, week, season_type, access_token=None):
+                                if extra not in extras:
+                                    extras[extra] = [float("nan")] * n_rows
+                                extras[extra].append(o.get(extra))
+                            elif extra in extras:
+                                extras[extra].append(float("nan"))
+                        n_rows += 1
+
+        if not n_rows:
+            return pd.DataFrame()
+
+        cols.update(extras)
+        df = pd.DataFrame(cols)
+        order = self.PROP_COLUMN_ORDER
+        ordered = [c for c in order if c in df.columns] + [c for c in df.columns if c not in order]
+        return df[ordered]
+
+def _get_games(season, week, season_type, access_token=None, cache=None, cache_ttl=None,
+               archive: Optional[PayloadArchive] = None, replay=False, rate_limiter=None,
+               games: Optional[GameDimension] = None):
     if access_token:
         default_headers = {
             "access_token": access_token
@@ -481,77 +591,54 @@ def _get_games(season, week, season_type, access_token=None):
     else:
         default_headers = None
     line_type = "core_bet_type_62_anytime_touchdown_scorer"
-    games_client = SimpleGamesClient(default_headers=default_headers)
-    games_df = games_client.fetch_games_df(
-        line_type=line_type,
-        season=season,
-        week=week,
-        season_type=season_type,
-        book_ids=MY_LINES.keys(),
-    )
+    games_client = SimpleGamesClient(default_headers=default_headers, cache=cache, rate_limiter=rate_limiter)
+    if replay:
+        archived = archive.load(GAMES, season=season, season_type=season_type, week=week)
+        if archived is None:
+            return pd.DataFrame()
+        payload, _ = archived
+    else:
+        fresh = games.fresh(season=season, season_type=season_type, week=week) if games is not None else None
+        if fresh is not None:
+            # the game-lines run already has this week's games: no scoreboard/markets call.
+            # Archived in the markets shape, so a replay parses exactly what this run used.
+            payload = markets_payload(fresh)
+            fetched_at = fresh["fetched_at"].max().to_pydatetime()
+        else:
+            payload = games_client.fetch_payload(
+                line_type=line_type,
+                season=season,
+                week=week,
+                season_type=season_type,
+                book_ids=MY_LINES.keys(),
+                cache_ttl=cache_ttl,
+            )
+            fetched_at = None
+        if archive is not None:
+            archive.save(GAMES, payload, season=season, season_type=season_type, week=week, fetched_at=fetched_at)
+    games_df = games_client.parse_payload(payload)
     games_df = games_df.copy()
     return games_df
 
 def hunt_player_merge_ids(players_df, season, week, season_type):
-    players_df = players_df[['player_id', 'join_name', 'position', 'team']].rename(columns={'player_id': 'action_network_player_id'}).copy()
-    players_df['season'] = season
-    players_df['week'] = week
-    players_df['position_group'] = players_df.position
-    players_df['position_group'] = players_df.position_group.map(POSITION_MAPPER)
-
-    import os
-    def ensure_dir(path: str):
-        if not os.path.exists(path):
-            os.makedirs(path, exist_ok=True)
-    ensure_dir(f'./data/raw/football/nfl/players/{season}/')
-    shift = (18 if season >= 2021 else 17)
-    if season_type=='post':
-        save_week = week + shift
-    else:
-        save_week = week
-
-    roster_df = collect_roster(season)
-    roster_df = roster_df[((roster_df['season'] == season) & (roster_df['week'] == save_week))].copy()
-    roster_df['join_name'] = roster_df['name']
-    roster_df['join_name'] = clean_player_names(roster_df['join_name'], lowercase=True)
-    roster_df['join_name'] = roster_df['join_name'].str[0] + '.' + roster_df['join_name'].str.split(' ').str[1]
-
-    team_df = players_df[players_df.position == 'D'].copy()
-    p_id = collect_players(include_teams_as_players=True)
-    p_id = p_id[p_id.position == 'D'].copy()
-    p_id = p_id[['player_id', 'latest_team']].rename(columns={'latest_team': 'team'})
-    team_df = pd.merge(team_df, p_id, on=['team'], how='left')
-
-    players_df = players_df[players_df.position != 'D'].copy()
-    players_df = pd.merge(players_df, roster_df[['season', 'week', 'team', 'player_id', 'position_group', 'join_name']], how='left', on=['season', 'week', 'team', 'position_group', 'join_name'], )
-    round_2_without_team = players_df[players_df.player_id.isnull()].copy().drop(columns=['player_id'])
-    round_2_without_team = pd.merge(round_2_without_team, roster_df[['season', 'week', 'player_id', 'position_group', 'join_name']], how='left', on=['season', 'week', 'position_group', 'join_name'], )
-
-    round_3_without_pos_group = round_2_without_team[round_2_without_team.player_id.isnull()].copy().drop(columns=['player_id'])
-
-    round_3_without_pos_group = pd.merge(round_3_without_pos_group, roster_df[['season', 'week', 'player_id', 'join_name', 'team']], how='left', on=['season', 'week', 'join_name', 'team'], )
-    master = pd.concat([
-        players_df[players_df.player_id.notnull()].copy(),
-        round_2_without_team[round_2_without_team.player_id.notnull()].copy(),
-        round_3_without_pos_group[round_3_without_pos_group.player_id.notnull()].copy(),
-    ], ignore_index=True).drop_duplicates(subset=['action_network_player_id'], keep='first')
-    cant_match = players_df[~players_df.action_network_player_id.isin(master['action_network_player_id'].unique())].copy()
-
-    master['action_network_player_id'] = master['action_network_player_id'].astype(int).astype(str)
-
-    master = master[~master.action_network_player_id.isin(ACTION_NETWORK_ID_MAPPER.keys())].copy()
-
-    res = dict(zip(list(master['action_network_player_id']), list(master['player_id'])))
-    print(f"{len(res)} New Players found on hunt")
-    print(res)
-
-
-    if cant_match.shape[0] !=0:
-        cant_match.to_parquet(f'./data/raw/football/nfl/players/{season}/{save_week}.parquet', index=False)
-
-        print(f"------------ {cant_match.shape[0]} Players need manual Merge ----------")
-
-def get_player_props(season, week, season_type, access_token=None):
+    """Match a week of Action Network players to nflverse ids (see src.player_ids); returns the new mappings."""
+    return get_resolver(season).hunt(players_df, week, season_type)
+
+
+def get_player_props(season, week, season_type, access_token=None,
+                     max_workers=PROPS_MAX_WORKERS, rate_limiter=None, cache=None, cache_ttl=None,
+                     archive: Optional[PayloadArchive] = None, replay=False,
+                     fingerprints: Optional[PayloadFingerprints] = None, game_ids: Optional[Iterable[int]] = None,
+                     games: Optional[GameDimension] = None):
+    """
+    Pull + flatten one week of props. Every raw payload is written to `archive`
+    when given; with replay=True payloads are read from `archive` instead of the
+    API (no network) and last_updated is the archived fetch time.
+    With `fingerprints`, only games whose props payload (or game summary) changed
+    since the last commit are parsed; returns None when none did. `game_ids`
+    restricts the per-game props requests to those games of the week. With `games`, the
+    week's game list is read from the games dimension while it is fresh (see src.games).
+    """
     if access_token:
         default_headers = {
             "access_token": access_token
@@ -559,49 +646,93 @@ def get_player_props(season, week, season_type, access_token=None):
     else:
         default_headers = None
 
-    games_df = _get_games(season, week, season_type, access_token)
+    rate_limiter = rate_limiter or TokenBucket(PROPS_REQUESTS_PER_SECOND)
+    games_df = _get_games(season, week, season_type, access_token, cache=cache, cache_ttl=cache_ttl,
+                          archive=archive, replay=replay, rate_limiter=rate_limiter, games=games)
     # 2) For each game, fetch props (ALL line types) in the specified state and books
 
     if games_df.shape[0] == 0:
         return pd.DataFrame()
 
-    game_ids = games_df["id"].tolist()  # limit for testing
-    props_client = GamePropsClient(default_headers=default_headers)
-    player_props_df, game_props_df, players_df = props_client.fetch_props_for_games(
-        game_ids,
-        state_code="NJ",
-        book_ids=MY_LINES.keys(),
+    week_game_ids = games_df["id"].tolist()
+    if game_ids is not None:
+        wanted = set(game_ids)
+        week_game_ids = [game_id for game_id in week_game_ids if game_id in wanted]
+    game_ids = week_game_ids
+    if not game_ids:
+        return pd.DataFrame()
+    props_client = GamePropsClient(
+        default_headers=default_headers,
+        max_workers=max_workers,
+        rate_limiter=rate_limiter,
+        cache=cache,
     )
+    if replay:
+        archived = [(game_id, archive.load(PROPS, season=season, season_type=season_type, week=week, game_id=game_id))
+                    for game_id in game_ids]
+        archived = [(game_id, a) for game_id, a in archived if a is not None]
+        if not archived:
+            return pd.DataFrame()
+        game_ids = [game_id for game_id, _ in archived]
+        blobs = [payload for _, (payload, _) in archived]
+        last_updated = max(fetched_at for _, (_, fetched_at) in archived)
+    else:
+        blobs = props_client.fetch_game_payloads(
+            game_ids,
+            state_code="NJ",
+            book_ids=MY_LINES.keys(),
+            cache_ttl=cache_ttl,
+        )
+        last_updated = datetime.datetime.now()
+        if archive is not None:
+            for game_id, blob in zip(game_ids, blobs):
+                archive.save(PROPS, blob, season=season, season_type=season_type, week=week,
+                             game_id=game_id, fetched_at=last_updated)
+    if fingerprints is not None:
+        # only the props payload: the game list may come from scoreboard or the games dimension
+        changed = [
+            (game_id, blob) for game_id, blob in zip(game_ids, blobs)
+            if not fingerprints.check(PROPS, blob, season=season, season_type=season_type, week=week,
+                                      game_id=game_id)
+        ]
+        if not changed:
+            return None
+        game_ids = [game_id for game_id, _ in changed]
+        blobs = [blob for _, blob in changed]
+    player_props_df, game_props_df, players_df = props_client.props_from_payloads(game_ids, blobs)
     if player_props_df.shape[0] == 0:
         return pd.DataFrame()
 
-    team_id_df = df_rename_fold(games_df, t1_prefix="home_", t2_prefix="away_")
-    team_id_df = team_id_repl(team_id_df)
-    id_to_team = team_id_df[['team_abbr', 'team_id']].rename(columns={'team_abbr': 'team'})
-    id_to_team = pd.concat([id_to_team, pd.DataFrame([{'team': 'FA', 'team_id': 0}])], ignore_index=True)
-
-    game_props_df = pd.merge(game_props_df, id_to_team, on=['team_id'], how='left' )
-    game_props_df = game_props_df[PROP_COLS+['team']]
-
-    players_df.team_id = players_df.team_id.fillna(0).astype(int)
-    players_df = pd.merge(players_df, id_to_team, how='left', on='team_id')
-    players_df['position'] = players_df['display_text'].str.split('- ').str[1]
-    players_df['position_group'] = players_df.position
-    players_df['position_group'] = players_df.position_group.map(POSITION_MAPPER)
-
-    players_df = players_df[['player_id', 'abbr', 'position','position_group', 'team']].rename(columns={ 'abbr': 'join_name'}).copy()
-    players_df['join_name'] = clean_player_names(players_df['join_name'], lowercase=True)
-    players_df['join_name'] = players_df['join_name'].str[0] + '.' + players_df['join_name'].str[1:]
-
-    player_props_df = pd.merge(player_props_df[PROP_COLS], players_df[['team','player_id','join_name','position','position_group']], on=['player_id'], how='left')
-
-    player_props_df = pd.concat([player_props_df, game_props_df], ignore_index=True)
-    player_props_df = player_props_df[player_props_df.book_id.isin(MY_LINES.keys())].copy()
-    player_props_df = pd.merge(player_props_df, games_df[['id','num_bets']].rename(columns={'id':'event_id','num_bets':'total_bets_on_event'}), on=['event_id'], how='left')
-    player_props_df['season'] = season
-    player_props_df['week'] = week
-    player_props_df = player_props_df.drop(columns=['market_id','outcome_id','option_type_id'])
-    player_props_df['last_updated'] = datetime.datetime.now()
+    # team / player joins, name cleaning
+    with timer("enrich"):
+        team_id_df = df_rename_fold(games_df, t1_prefix="home_", t2_prefix="away_")
+        team_id_df = team_id_repl(team_id_df)
+        id_to_team = team_id_df[['team_abbr', 'team_id']].rename(columns={'team_abbr': 'team'})
+        id_to_team = pd.concat([id_to_team, pd.DataFrame([{'team': 'FA', 'team_id': 0}])], ignore_index=True)
+
+        game_props_df = pd.merge(game_props_df, id_to_team, on=['team_id'], how='left' )
+        game_props_df = game_props_df[PROP_COLS+['team']]
+
+        players_df.team_id = players_df.team_id.fillna(0).astype(int)
+        players_df = pd.merge(players_df, id_to_team, how='left', on='team_id')
+        players_df['position'] = players_df['display_text'].str.split('- ').str[1]
+        players_df['position_group'] = players_df.position
+        players_df['position_group'] = players_df.position_group.map(POSITION_MAPPER)
+
+        players_df = players_df[['player_id', 'abbr', 'position','position_group', 'team']].rename(columns={ 'abbr': 'join_name'}).copy()
+        players_df['join_name'] = clean_player_names(players_df['join_name'], lowercase=True)
+        players_df['join_name'] = players_df['join_name'].str[0] + '.' + players_df['join_name'].str[1:]
+
+        player_props_df = pd.merge(player_props_df[PROP_COLS], players_df[['team','player_id','join_name','position','position_group']], on=['player_id'], how='left')
+
+        player_props_df = pd.concat([player_props_df, game_props_df], ignore_index=True)
+        player_props_df = player_props_df[player_props_df.book_id.isin(MY_LINES.keys())].copy()
+        player_props_df = pd.merge(player_props_df, games_df[['id','num_bets']].rename(columns={'id':'event_id','num_bets':'total_bets_on_event'}), on=['event_id'], how='left')
+        player_props_df['season'] = season
+        player_props_df['week'] = week
+        player_props_df = player_props_df.drop(columns=['market_id','outcome_id','option_type_id'])
+        player_props_df['last_updated'] = last_updated
+    count("rows_parsed", len(player_props_df))
     return player_props_df
 
 
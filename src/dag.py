@@ -0,0 +1,121 @@
+import heapq
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+# Dependency graph of tasks, run serially or on an executor (pipeline.py).
+# A task is a function plus keyword arguments; with a process pool the function must be
+# module-level (picklable), like any pool task, and local=True keeps a task in the calling
+# thread anyway (season rollups: the runners keep those in the parent too). `inputs` maps
+# more keyword arguments to the key (or list of keys) of tasks whose results they take;
+# `after` only orders. A task can only depend on tasks added before it, so the graph is
+# acyclic by construction and insertion order is a valid serial order (and the tie-break
+# among ready tasks).
+# A task that raises fails alone: everything downstream of it is skipped, the rest runs.
+Inputs = Dict[str, Union[Hashable, List[Hashable]]]
+
+
+class TaskGraph:
+    def __init__(self):
+        self._tasks: Dict[Hashable, Tuple[Callable[..., Any], Dict[str, Any], Inputs]] = {}
+        self._local: Set[Hashable] = set()
+        self._deps: Dict[Hashable, Set[Hashable]] = {}
+        self._dependents: Dict[Hashable, List[Hashable]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self.results: Dict[Hashable, Any] = {}
+        self.failed: Dict[Hashable, BaseException] = {}
+        self.skipped: List[Hashable] = []
+        self.stats = {"tasks": 0, "done": 0, "failed": 0, "skipped": 0}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def add(self, key: Hashable, fn: Callable[..., Any], *, inputs: Optional[Inputs] = None,
+            after: Iterable[Hashable] = (), local: bool = False, **kwargs) -> Hashable:
+        """Add task `key`: fn(**kwargs, **<results of inputs>) once `inputs` and `after` are done."""
+        if key in self._tasks:
+            raise ValueError(f"duplicate task {key!r}")
+        inputs = dict(inputs or {})
+        deps = set(after)
+        for value in inputs.values():
+            deps.update(value if isinstance(value, list) else [value])
+        unknown = [dep for dep in deps if dep not in self._tasks]
+        if unknown:
+            raise ValueError(f"task {key!r} depends on unknown tasks {unknown!r}")
+        self._tasks[key] = (fn, kwargs, inputs)
+        self._deps[key] = deps
+        self._dependents[key] = []
+        for dep in deps:
+            self._dependents[dep].append(key)
+        self._order[key] = len(self._order)
+        if local:
+            self._local.add(key)
+        self.stats["tasks"] += 1
+        return key
+
+    def _call(self, key: Hashable) -> Tuple[Callable[..., Any], Dict[str, Any]]:
+        fn, kwargs, inputs = self._tasks[key]
+        for name, value in inputs.items():
+            kwargs = {**kwargs, name: [self.results[k] for k in value] if isinstance(value, list)
+                      else self.results[value]}
+        return fn, kwargs
+
+    def run(self, executor: Optional[Executor] = None,
+            on_done: Optional[Callable[[Hashable, Any], Any]] = None) -> Dict[Hashable, Any]:
+        """
+        Run every task: in this thread in insertion order, or with `executor` each as soon as
+        its dependencies are done. `on_done(key, value)` is called here as every task lands and
+        returns what its dependents get as its result (default: the value). Returns the results.
+        """
+        waiting = {key: set(deps) for key, deps in self._deps.items()}
+        ready = [(self._order[key], key) for key, deps in waiting.items() if not deps]
+        heapq.heapify(ready)
+        running: Dict[Future, Hashable] = {}
+
+        def skip(key: Hashable) -> None:
+            for dependent in self._dependents[key]:
+                if dependent not in self.skipped:
+                    self.skipped.append(dependent)
+                    self.stats["skipped"] += 1
+                    skip(dependent)
+
+        def finish(key: Hashable, value: Any = None, error: Optional[BaseException] = None) -> None:
+            if error is None:
+                try:
+                    self.results[key] = on_done(key, value) if on_done is not None else value
+                except Exception as e:
+                    error = e
+            if error is not None:
+                print(f"Task {key!r} failed: {error!r}")
+                self.failed[key] = error
+                self.stats["failed"] += 1
+                skip(key)
+                return
+            self.stats["done"] += 1
+            for dependent in self._dependents[key]:
+                waiting[dependent].discard(key)
+                if not waiting[dependent] and dependent not in self.skipped:
+                    heapq.heappush(ready, (self._order[dependent], dependent))
+
+        while ready or running:
+            while ready:
+                _, key = heapq.heappop(ready)
+                fn, kwargs = self._call(key)
+                if executor is not None and key not in self._local:
+                    running[executor.submit(fn, **kwargs)] = key
+                    continue
+                try:
+                    value = fn(**kwargs)
+                except Exception as e:
+                    finish(key, error=e)
+                else:
+                    finish(key, value)
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: self._order[running[f]]):
+                    key = running.pop(future)
+                    error = future.exception()
+                    finish(key, None if error is not None else future.result(), error)
+        return self.results
@@ -0,0 +1,165 @@
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.schemas import (
+    GAME_LINES_SCHEMA, PLAYER_PROPS_SCHEMA, COMPRESSION, COMPRESSION_LEVEL, to_table, to_pandas,
+)
+
+# Hive-partitioned copies of the processed seasons, laid out for filtered reads.
+# Kept outside data/processed: get_seasons_to_update() expects only <season>.parquet there.
+DATASET_ROOT = "./data/datasets/football/nfl"
+GAME_LINES = "game_lines"
+PLAYER_PROPS = "player_props"
+SCHEMAS: Dict[str, pa.Schema] = {GAME_LINES: GAME_LINES_SCHEMA, PLAYER_PROPS: PLAYER_PROPS_SCHEMA}
+
+# Directories are season=<s>/week=<w>, one file per week. A week is only a few thousand
+# game lines / tens of thousands of props, so splitting further by line_type or
+# bet_type (~80 a week) would mostly add tiny files. Rows are sorted by line_type /
+# bet_type first instead, so row-group statistics prune on them.
+PARTITION_FIELDS = [GAME_LINES_SCHEMA.field("season"), GAME_LINES_SCHEMA.field("week")]
+SORT_KEYS: Dict[str, List[str]] = {
+    GAME_LINES: ["line_type", "book_id", "period", "event_id"],
+    PLAYER_PROPS: ["bet_type", "book_id", "event_id"],
+}
+ROW_GROUP_SIZE = 8_192
+PARTITIONING = ds.partitioning(pa.schema(PARTITION_FIELDS), flavor="hive")
+PARQUET_FORMAT = ds.ParquetFileFormat()
+
+
+def dataset_path(name: str, root: str = DATASET_ROOT) -> str:
+    return os.path.join(root, name)
+
+
+# --------------- WRITE --------------- #
+def write_dataset(df: pd.DataFrame, name: str, root: str = DATASET_ROOT) -> int:
+    """
+    Write `df` into the `name` dataset, replacing every (season, week) partition it
+    contains; other weeks are left alone. Returns the number of rows written.
+    """
+    if df.empty:
+        return 0
+    path = dataset_path(name, root)
+    if "season" not in df.columns or "week" not in df.columns:
+        raise ValueError(f"{name} dataset needs season and week columns")
+
+    # a week is always rewritten whole
+    for season, week in df[["season", "week"]].drop_duplicates().itertuples(index=False):
+        week_dir = os.path.join(path, f"season={int(season)}", f"week={int(week)}")
+        if os.path.isdir(week_dir):
+            shutil.rmtree(week_dir)
+
+    sort_keys = [k for k in ["season", "week"] + SORT_KEYS[name] if k in df.columns]
+    df = df.sort_values(sort_keys, kind="stable", na_position="last")
+    table = to_table(df, SCHEMAS[name])
+
+    ds.write_dataset(
+        table,
+        path,
+        format=PARQUET_FORMAT,
+        file_options=PARQUET_FORMAT.make_write_options(compression=COMPRESSION, compression_level=COMPRESSION_LEVEL),
+        partitioning=PARTITIONING,
+        existing_data_behavior="overwrite_or_ignore",
+        basename_template="part-{i}.parquet",
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=min(ROW_GROUP_SIZE, len(df)),
+    )
+    return len(df)
+
+
+# --------------- READ --------------- #
+def open_dataset(name: str, root: str = DATASET_ROOT, filter: Optional[ds.Expression] = None) -> Optional[ds.Dataset]:
+    """
+    Dataset over the files whose season/week partitions can satisfy `filter`
+    (None if nothing is there).
+    """
+    path = dataset_path(name, root)
+    if not os.path.isdir(path):
+        return None
+    # the declared schema means no footer has to be opened just to plan the scan
+    dataset = ds.dataset(path, schema=SCHEMAS[name], format=PARQUET_FORMAT, partitioning=PARTITIONING)
+    fragments = list(dataset.get_fragments(filter=filter))
+    if not fragments:
+        return None
+    return ds.FileSystemDataset(fragments, dataset.schema, PARQUET_FORMAT, filesystem=dataset.filesystem)
+
+
+def read_dataset(
+    name: str,
+    *,
+    seasons: Optional[Iterable[int]] = None,
+    weeks: Optional[Iterable[int]] = None,
+    book_ids: Optional[Iterable[int]] = None,
+    periods: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Iterable]] = None,
+    root: str = DATASET_ROOT,
+) -> pd.DataFrame:
+    """
+    Read a filtered slice of the `name` dataset. season/week prune whole files;
+    book_id/period and any extra `filters` ({column: values}) are pushed down to
+    parquet row-group statistics. Only `columns` are decoded. Returns an empty
+    frame when nothing matches.
+    """
+    wanted = {"season": seasons, "week": weeks, "book_id": book_ids, "period": periods, **(filters or {})}
+    expr = None
+    for col, values in wanted.items():
+        if values is None:
+            continue
+        cond = ds.field(col).isin(list(values))
+        expr = cond if expr is None else expr & cond
+
+    dataset = open_dataset(name, root, filter=expr)
+    if dataset is None:
+        print(f"No {name} data at {dataset_path(name, root)} for {expr}")
+        return pd.DataFrame()
+
+    table = dataset.to_table(columns=columns, filter=expr)
+    return to_pandas(table)
+
+
+def read_game_lines(
+    *,
+    seasons: Optional[Iterable[int]] = None,
+    weeks: Optional[Iterable[int]] = None,
+    book_ids: Optional[Iterable[int]] = None,
+    periods: Optional[Iterable[str]] = None,
+    line_types: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+    root: str = DATASET_ROOT,
+) -> pd.DataFrame:
+    return read_dataset(GAME_LINES, seasons=seasons, weeks=weeks, book_ids=book_ids, periods=periods,
+                        columns=columns, filters={"line_type": line_types}, root=root)
+
+
+def read_player_props(
+    *,
+    seasons: Optional[Iterable[int]] = None,
+    weeks: Optional[Iterable[int]] = None,
+    book_ids: Optional[Iterable[int]] = None,
+    periods: Optional[Iterable[str]] = None,
+    bet_types: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+    root: str = DATASET_ROOT,
+) -> pd.DataFrame:
+    return read_dataset(PLAYER_PROPS, seasons=seasons, weeks=weeks, book_ids=book_ids, periods=periods,
+                        columns=columns, filters={"bet_type": bet_types}, root=root)
+
+
+# --------------- ONE-OFF: build from the processed seasons --------------- #
+if __name__ == "__main__":
+    from src.schemas import read_parquet
+
+    processed_root = "./data/processed/football/nfl"
+    for name in (GAME_LINES, PLAYER_PROPS):
+        season_dir = os.path.join(processed_root, name)
+        if not os.path.isdir(season_dir):
+            continue
+        for fname in sorted(os.listdir(season_dir)):
+            season_df = read_parquet(os.path.join(season_dir, fname), SCHEMAS[name])
+            n = write_dataset(season_df, name)
+            print(f"{name}: {fname} -> {n} rows")
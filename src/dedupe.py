@@ -0,0 +1,149 @@
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.metrics import timed
+
+# Latest-row-per-key selection used by keep_only_latest_per_book / merge_with_existing_and_dedupe.
+#   pandas: stable sort on the order column + drop_duplicates(keep="last") over the concat
+#   numpy:  one int64 group id per row from factorized key codes, a stable argsort and a
+#           last-occurrence pass; the frames are only gathered once, for the surviving rows
+# Both engines return identical frames (same rows, order, index and dtypes).
+PANDAS = "pandas"
+NUMPY = "numpy"
+ENGINES = (PANDAS, NUMPY)
+
+# Read per call, so spawned backfill workers inherit the parent's choice
+DEDUPE_ENGINE_ENV = "ODDS_DEDUPE_ENGINE"
+DEFAULT_ENGINE = NUMPY
+
+EPOCH = pd.Timestamp("1970-01-01")
+
+
+def default_engine() -> str:
+    engine = os.environ.get(DEDUPE_ENGINE_ENV, DEFAULT_ENGINE)
+    if engine not in ENGINES:
+        raise ValueError(f"{DEDUPE_ENGINE_ENV}={engine!r}; expected one of {ENGINES}")
+    return engine
+
+
+def set_default_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown dedupe engine {engine!r}; expected one of {ENGINES}")
+    os.environ[DEDUPE_ENGINE_ENV] = engine
+
+
+# --------------- NUMPY ENGINE --------------- #
+def _group_ids(key_columns: List[pd.Series]) -> np.ndarray:
+    """Exact int64 id per distinct key tuple (NA equals NA, as in drop_duplicates)."""
+    n = len(key_columns[0]) if key_columns else 0
+    gid = np.zeros(n, dtype=np.int64)
+    size = 1
+    for col in key_columns:
+        values = col.array
+        if isinstance(values, (pd.arrays.StringArray, pd.arrays.NumpyExtensionArray)):
+            # hash the backing ndarray: skips the copy + isna pass StringArray.factorize makes,
+            # and pandas 2.2 warns on factorize(NumpyExtensionArray) for object columns
+            values = np.asarray(values)
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        k = len(uniques) + 1  # +1 for the NA sentinel
+        if size * k >= 2**62:
+            # re-densify before the mixed radix overflows int64
+            gid, uniq = pd.factorize(gid)
+            size = len(uniq)
+        gid = gid * k + (codes + 1)
+        size *= k
+    return gid
+
+
+def _stable_order(order_col: pd.Series) -> np.ndarray:
+    """Positions in stable ascending order of `order_col`, missing values last (sort_values semantics)."""
+    if order_col.dtype.kind == "M":
+        ticks = order_col.to_numpy().view("i8").copy()
+        ticks[ticks == np.iinfo(np.int64).min] = np.iinfo(np.int64).max  # NaT sorts last
+        return np.argsort(ticks, kind="stable")
+    return order_col.reset_index(drop=True).sort_values(kind="stable", na_position="last").index.to_numpy()
+
+
+def _latest_positions(key_columns: List[pd.Series], order_col: pd.Series) -> np.ndarray:
+    """Positions of the surviving rows, in the order the pandas engine returns them."""
+    order = _stable_order(order_col)
+    gid = _group_ids(key_columns)[order]
+    # first occurrence in the reversed walk == last occurrence in sorted order
+    _, first_rev = np.unique(gid[::-1], return_index=True)
+    return order[np.sort(len(gid) - 1 - first_rev)]
+
+
+# --------------- PUBLIC --------------- #
+@timed("latest_per_key")
+def latest_per_key(df: pd.DataFrame, keys: List[str], *, order_col: str = "last_updated",
+                   engine: Optional[str] = None) -> pd.DataFrame:
+    """Keep the row with the latest `order_col` per `keys` (ties: the later row wins)."""
+    if df.empty:
+        return df
+    if order_col not in df.columns:
+        df = df.assign(**{order_col: EPOCH})
+    if (engine or default_engine()) == PANDAS:
+        return (
+            df.sort_values(order_col, kind="stable")
+              .drop_duplicates(keys, keep="last")
+              .reset_index(drop=True)
+        )
+    rows = _latest_positions([df[k] for k in keys], df[order_col])
+    return df.take(rows).reset_index(drop=True)
+
+
+def key_isin(df: pd.DataFrame, other: pd.DataFrame, keys: List[str]) -> np.ndarray:
+    """Boolean mask over `df`: rows whose `keys` tuple also occurs in `other` (NA equals NA)."""
+    if df.empty or other.empty:
+        return np.zeros(len(df), dtype=bool)
+    n = len(other)
+    gid = _group_ids([pd.concat([other[k], df[k]], ignore_index=True) for k in keys])
+    return np.isin(gid[n:], gid[:n])
+
+
+def align_dtypes(a: pd.DataFrame, b: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Cast columns whose dtypes differ to the dtype pd.concat would give them, on both sides."""
+    cast_a, cast_b = {}, {}
+    for col in a.columns.intersection(b.columns):
+        if a[col].dtype != b[col].dtype:
+            target = pd.concat([a[col].iloc[:0], b[col].iloc[:0]]).dtype
+            if a[col].dtype != target:
+                cast_a[col] = target
+            if b[col].dtype != target:
+                cast_b[col] = target
+    return (a.astype(cast_a) if cast_a else a), (b.astype(cast_b) if cast_b else b)
+
+
+@timed("merge_latest")
+def merge_latest(current_df: pd.DataFrame, new_df: pd.DataFrame, keys: List[str], *,
+                 order_col: str = "last_updated", engine: Optional[str] = None) -> pd.DataFrame:
+    """
+    latest_per_key over current_df + new_df (same columns; result uses current_df's order).
+    The numpy engine never builds the full concatenation: it concatenates only the key
+    and order columns, then gathers the surviving rows from each side.
+    """
+    new_df = new_df[current_df.columns]
+    current_df, new_df = align_dtypes(current_df, new_df)
+    if (engine or default_engine()) == PANDAS or order_col not in current_df.columns:
+        return latest_per_key(pd.concat([current_df, new_df], ignore_index=True), keys,
+                              order_col=order_col, engine=engine)
+    if current_df.empty or new_df.empty:
+        return latest_per_key(new_df if current_df.empty else current_df, keys, order_col=order_col, engine=engine)
+
+    n0 = len(current_df)
+    rows = _latest_positions(
+        [pd.concat([current_df[k], new_df[k]], ignore_index=True) for k in keys],
+        pd.concat([current_df[order_col], new_df[order_col]], ignore_index=True),
+    )
+    from_current = rows < n0
+    gathered = pd.concat(
+        [current_df.take(rows[from_current]), new_df.take(rows[~from_current] - n0)],
+        ignore_index=True,
+    )
+    # back into sorted order: current rows come first in `gathered`, new rows after them
+    n_current = int(from_current.sum())
+    pos = np.where(from_current, np.cumsum(from_current) - 1, n_current + np.cumsum(~from_current) - 1)
+    return gathered.take(pos).reset_index(drop=True)
@@ -0,0 +1,286 @@
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from espn_api_orm.consts import ESPNSportLeagueTypes
+
+from src import profiling
+from src.dedupe import ENGINES, set_default_engine
+from src.fingerprints import PayloadFingerprints
+from src.games import GameDimension
+from src.history import LineHistory
+from src.http_cache import ResponseCache
+from src.metrics import get_metrics, profile_dir, write_run_report
+from src.open_lines import OpenLineTracker
+from src.payload_archive import PayloadArchive
+from src.planning import (
+    live_calendar, seasons_to_update, replay_seasons, replay_weeks, weeks_to_update, cache_ttl_for,
+)
+from src.resilience import get_resilience
+from src.schemas import read_parquet
+from src.transport import get_transport, diff_stats
+from src.utils import SharedTokenBucket, polite_sleep_block
+
+# What the one-shot runners (event_odds_runner.py, player_props_runner.py) have in common,
+# parametrized by their Feed: planning (season, week) units, running one unit with its own
+# components in a pool worker, summing the counters workers report back, and the main loop.
+# pipeline.py runs the same units as graph tasks.
+RAW_ROOT = "./data/raw"
+PROCESSED_ROOT = "./data/processed"
+SPORT_LEAGUES = [ESPNSportLeagueTypes.FOOTBALL_NFL]
+
+# Counter groups of a unit (UnitComponents.stats), in run-report order
+STATS_GROUPS = ("cache", "transport", "resilience", "fingerprints", "history", "open_lines", "games")
+
+
+class Feed(NamedTuple):
+    """A runner module's hooks. Its functions are module-level, so a Feed pickles into pool workers."""
+    name: str  # src.datasets feed: game_lines | player_props
+    title: str
+    run_week: Callable[..., Optional[pd.DataFrame]]
+    weekly_path_for: Callable[[str, int], str]
+    publish_season: Callable[..., pd.DataFrame]
+    line_history: Callable[[], LineHistory]
+    open_line_tracker: Callable[[], OpenLineTracker]
+    weekly_schema: pa.Schema
+    processed_schema: pa.Schema
+    replay_endpoint: str  # the archived endpoint a replay plans seasons and weeks from
+    start_season: int
+    requests_per_second: float  # request budget shared by all workers (--workers > 1)
+
+
+class SeasonPlan(NamedTuple):
+    season: int
+    processed_season_path: str
+    max_week: Optional[int]
+    units: List[Dict[str, Any]]  # run_week kwargs, one per canonical week
+
+
+# --------------- ONE UNIT --------------- #
+# The run's request budget in this process: the pool's SharedTokenBucket, handed to each
+# worker once via the initializer (pipeline.py also sets a TokenBucket for a serial run)
+_RATE_LIMITER = None
+
+
+def init_worker(rate_limiter) -> None:
+    global _RATE_LIMITER
+    _RATE_LIMITER = rate_limiter
+
+
+class UnitComponents:
+    """
+    The components a unit of work runs with (the serial runners keep one set for the whole
+    run), and what they counted since they were created: stats() ->
+    {"cache" | "fingerprints" | "history" | "open_lines" | "games" | "transport" | "resilience" | "metrics"}.
+    """
+
+    def __init__(self, feed: Optional[Feed] = None):
+        self.cache = ResponseCache()
+        self.archive = PayloadArchive()
+        self.fingerprints = PayloadFingerprints()
+        self.history = feed.line_history() if feed is not None else None
+        self.open_lines = feed.open_line_tracker() if feed is not None else None
+        self.games = GameDimension()
+        self.rate_limiter = _RATE_LIMITER
+        self._transport_before = get_transport().stats()
+        self._resilience_before = dict(get_resilience().stats)
+        self._metrics_before = get_metrics().snapshot()
+
+    def run_week_kwargs(self) -> Dict[str, Any]:
+        return dict(cache=self.cache, archive=self.archive, rate_limiter=self.rate_limiter,
+                    fingerprints=self.fingerprints, history=self.history, open_lines=self.open_lines,
+                    games=self.games)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "cache": self.cache.stats,
+            "fingerprints": self.fingerprints.stats,
+            "history": self.history.stats if self.history is not None else {},
+            "open_lines": self.open_lines.stats if self.open_lines is not None else {},
+            "games": self.games.stats,
+            "transport": diff_stats(get_transport().stats(), self._transport_before),
+            "resilience": diff_stats(get_resilience().stats, self._resilience_before),
+            "metrics": get_metrics().since(self._metrics_before),
+        }
+
+    def finish(self) -> Dict[str, Dict[str, Any]]:
+        """stats() of a finished task; dumps this process's <stage>-<pid> profiles (cumulative)."""
+        profiling.dump()
+        return self.stats()
+
+
+def run_unit(feed: Feed, unit: Dict[str, Any], **inputs) -> Tuple[Optional[str], Dict[str, Dict[str, Any]]]:
+    """Pool task: one (season, week) unit of `feed` with its own components, under the shared
+    rate budget -> (weekly parquet path | None, UnitComponents.stats())."""
+    components = UnitComponents(feed)
+    merged = feed.run_week(**unit, **components.run_week_kwargs(), **inputs)
+    weekly_path = None if merged is None else feed.weekly_path_for(unit["season_raw_path"], unit["canonical_week"])
+    return weekly_path, components.finish()
+
+
+def merge_stats(totals: Dict[str, Dict[str, Any]], stats: Dict[str, Dict[str, Any]]) -> None:
+    """Sum a task's counters into `totals` (group -> counters); its "metrics" go to this process's RunMetrics."""
+    for group, counters in stats.items():
+        if group == "metrics":
+            get_metrics().merge(counters)
+            continue
+        bucket = totals.setdefault(group, {})
+        for k, v in counters.items():
+            bucket[k] = bucket.get(k, 0) + v
+
+
+# --------------- PLAN --------------- #
+def plan_feed(feed: Feed, sport_str: str, league_str: str, *, replay: bool, archive: PayloadArchive,
+              access_token: Optional[str], calendar: Optional[Tuple[int, int]] = None) -> List[SeasonPlan]:
+    """
+    The (season, week) units of a run, season by season: every archived week on replay, else
+    from what data/processed holds and `calendar` (live_calendar's current season and week).
+    """
+    raw_path = f"{RAW_ROOT}/{sport_str}/{league_str}/{feed.name}/"
+    processed_path = f"{PROCESSED_ROOT}/{sport_str}/{league_str}/{feed.name}/"
+    os.makedirs(raw_path, exist_ok=True)
+    os.makedirs(processed_path, exist_ok=True)
+    if replay:
+        update_seasons = replay_seasons(archive, feed.replay_endpoint, feed.start_season)
+    else:
+        update_seasons = seasons_to_update(sport_str, league_str, feed.name, feed.start_season)
+
+    plans = []
+    for season in update_seasons:
+        season_raw_path = f"{raw_path}{season}/"
+        os.makedirs(season_raw_path, exist_ok=True)
+        processed_season_path = f"{processed_path}{season}.parquet"
+        if replay:
+            update_weeks, week_now, max_week = replay_weeks(archive, feed.replay_endpoint, season), None, None
+        else:
+            # planning only needs the weeks; the rollup reads the rest itself
+            processed_df = read_parquet(processed_season_path, feed.processed_schema, columns=["week"])  # may be empty
+            current_season, current_week = calendar
+            update_weeks, week_now, max_week = weeks_to_update(season, processed_df, current_season=current_season,
+                                                               current_week=current_week)
+        print(f"{feed.name} season {season} -> weeks: {update_weeks}")
+        units = [
+            dict(
+                season=season,
+                canonical_week=canonical_week,
+                season_raw_path=season_raw_path,
+                access_token=access_token,
+                cache_ttl=cache_ttl_for(canonical_week, week_now),
+                replay=replay,
+            )
+            for canonical_week in update_weeks
+        ]
+        plans.append(SeasonPlan(season, processed_season_path, max_week, units))
+    return plans
+
+
+# --------------- MAIN --------------- #
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """The flags every entry point shares: --dedupe-engine, the run report and the profiler."""
+    parser.add_argument("--dedupe-engine", choices=ENGINES,
+                        help="latest-per-book selection engine (default: src.dedupe.DEFAULT_ENGINE)")
+    parser.add_argument("--run-report",
+                        help="JSON run report path (default: src.metrics.RUN_REPORT_ROOT/<run>/<start>.json)")
+    parser.add_argument("--metrics-textfile",
+                        help="also write the run's metrics as a Prometheus textfile (e.g. for node_exporter)")
+    parser.add_argument("--profile", nargs="+", metavar="STAGE",
+                        help="profile these src.metrics stages (or 'all'); output lands next to the run report")
+    parser.add_argument("--profile-mode", choices=profiling.MODES,
+                        help="cprofile (deterministic, .prof) or sample (stack sampler, flame-graph .folded)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="tracemalloc peak per stage, plus top allocation sites of the biggest call")
+
+
+def start_run(args: argparse.Namespace, run: str) -> None:
+    get_metrics()  # the run's clock starts here
+    # via the environment (like ODDS_PROFILE=...), so workers profile the same stages
+    profiling.configure(args.profile, mode=args.profile_mode, memory=args.profile_memory,
+                        out_dir=profile_dir(run, args.run_report))
+    if args.dedupe_engine:
+        set_default_engine(args.dedupe_engine)  # via the environment, so workers see it too
+
+
+def main(feed: Feed, description: str) -> None:
+    """A runner's __main__: plan, run every week (serially or on --workers processes), roll up seasons."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--replay", action="store_true",
+                        help="rebuild weekly + season parquets from the raw payload archive (no network)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="fan (season, week) units out to N worker processes (default: serial)")
+    parser.add_argument("--requests-per-second", type=float, default=feed.requests_per_second,
+                        help="request budget shared by all workers when --workers > 1")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    start_run(args, feed.name)
+
+    access_token = os.environ.get("ACTION_NETWORK_ACCESS_TOKEN", None)
+    archive = PayloadArchive()
+    # a serial run shares these across weeks; pool workers build their own per unit
+    components = UnitComponents(feed)
+    # counters reported back by pool workers
+    totals: Dict[str, Dict[str, Any]] = {}
+
+    pool = None
+    if args.workers > 1:
+        # The shared bucket replaces polite_sleep_block(): workers draw from one budget
+        # spawn, not fork: the parent has already started pyarrow's thread pool
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=args.workers,
+            mp_context=ctx,
+            initializer=init_worker,
+            initargs=(SharedTokenBucket(args.requests_per_second, ctx=ctx),),
+        )
+
+    for sport_league in SPORT_LEAGUES:
+        sport_str, league_str = sport_league.value.split("/")
+        calendar = None if args.replay else live_calendar(sport_str, league_str)
+        plans = plan_feed(feed, sport_str, league_str, replay=args.replay, archive=archive,
+                          access_token=access_token, calendar=calendar)
+        if not plans:
+            print("No seasons to update.")
+            continue
+        print(f"Running {feed.title} Pump for: {sport_league.value} from {plans[0].season} to {plans[-1].season}")
+
+        # Submit every season up front so a pool can work across season boundaries
+        futures = {p.season: [pool.submit(run_unit, feed, unit) for unit in p.units] for p in plans} if pool else {}
+        for p in plans:
+            season_rows = []
+            if pool is not None:
+                # Workers already wrote the weekly parquets; read them back for the rollup
+                for future in futures[p.season]:
+                    weekly_path, stats = future.result()
+                    merge_stats(totals, stats)
+                    if weekly_path is not None:
+                        season_rows.append(read_parquet(weekly_path, feed.weekly_schema))
+            else:
+                for unit in p.units:
+                    if not args.replay:
+                        polite_sleep_block()  # be nice between weeks
+                    merged_week_df = feed.run_week(**unit, **components.run_week_kwargs())
+                    if merged_week_df is not None:
+                        season_rows.append(merged_week_df)
+
+            # Season rollup: only weeks whose weekly content changed are re-merged and rewritten
+            if season_rows:
+                feed.publish_season(p.season, p.processed_season_path, season_rows,
+                                    replace_weeks=args.replay, max_week=p.max_week)
+
+    if pool is not None:
+        pool.shutdown()
+    stats = totals if pool is not None else components.stats()
+    run_stats = {group: stats.get(group, {}) for group in STATS_GROUPS}
+    print(f"HTTP cache: {run_stats['cache']}")
+    print(f"HTTP transport: {run_stats['transport']}")
+    print(f"HTTP retries: {run_stats['resilience']}")
+    print(f"Payload fingerprints (games; weeks skipped): {run_stats['fingerprints']}")
+    print(f"Line history (rows seen / appended): {run_stats['history']}")
+    print(f"Open lines (first observed / frozen OPEN served / inferred): {run_stats['open_lines']}")
+    print(f"Games dimension (saved / served / stale / missing): {run_stats['games']}")
+    print(f"Stages (seconds / calls): {get_metrics().stages()}")
+    report_path = write_run_report(feed.name, run_stats, path=args.run_report, textfile=args.metrics_textfile)
+    print(f"Run report: {report_path}")
@@ -0,0 +1,96 @@
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from src.metrics import timed
+from src.utils import atomic_write
+
+FINGERPRINT_ROOT = "./data/state/fingerprints/football/nfl"
+
+
+@timed("fingerprint")
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON payload: key order and whitespace do not matter."""
+    canon = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canon.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PayloadFingerprints:
+    """
+    Fingerprints of the per-game payloads already merged into the weekly parquets,
+    so a payload identical to last time skips parse/merge/dedupe/write.
+
+    Layout: <root>/<endpoint>/<season>/<season_type>/<week>.json = {"<game_id>": "<hash>"}
+    A week is one unit of work, so pool workers never share a file. `check()` only
+    stages new hashes; `commit()` persists them once the weekly parquet is written,
+    so a run that dies half way re-merges those games next time.
+    """
+
+    def __init__(self, root: str = FINGERPRINT_ROOT):
+        self.root = root
+        self.stats = {"changed": 0, "unchanged": 0, "weeks_skipped": 0}
+        self._stored: Dict[str, Dict[str, str]] = {}
+        self._pending: Dict[str, Dict[str, str]] = {}
+
+    def _path(self, endpoint: str, season: int, season_type: str, week: int) -> str:
+        return os.path.join(self.root, endpoint, str(season), season_type, f"{week}.json")
+
+    def _load(self, path: str) -> Dict[str, str]:
+        if path not in self._stored:
+            try:
+                with open(path) as f:
+                    self._stored[path] = json.load(f)
+            except (OSError, ValueError):
+                self._stored[path] = {}
+        return self._stored[path]
+
+    # ----------- PUBLIC -----------
+    def check(self, endpoint: str, payload: Any, *, season: int, season_type: str, week: int,
+              game_id: Optional[int] = None) -> bool:
+        """True when `payload` is unchanged since the last commit; a changed one is staged."""
+        path = self._path(endpoint, season, season_type, week)
+        key = str(game_id) if game_id is not None else endpoint
+        digest = fingerprint(payload)
+        if self._load(path).get(key) == digest:
+            self.stats["unchanged"] += 1
+            return True
+        self._pending.setdefault(path, {})[key] = digest
+        self.stats["changed"] += 1
+        return False
+
+    def forget(self, endpoint: str, *, season: int, season_type: str, week: int) -> None:
+        """Treat every payload of the week as new (e.g. its weekly parquet is gone)."""
+        self._stored[self._path(endpoint, season, season_type, week)] = {}
+
+    def commit(self) -> None:
+        for path, digests in self._pending.items():
+            stored = {**self._load(path), **digests}
+
+            def write(tmp: str) -> None:
+                with open(tmp, "w") as f:
+                    json.dump(stored, f, sort_keys=True, separators=(",", ":"))
+
+            atomic_write(path, write)
+            self._stored[path] = stored
+        self._pending.clear()
+
+    def discard(self) -> None:
+        self._pending.clear()
+
+
+def discards_pending(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    For a week's run function taking `fingerprints=`: digests it staged but did not commit
+    (it returned early, found no rows, or raised) are dropped when it returns, so the next
+    week's commit() cannot persist hashes of payloads that were never merged.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, fingerprints: Optional[PayloadFingerprints] = None, **kwargs):
+        try:
+            return fn(*args, fingerprints=fingerprints, **kwargs)
+        finally:
+            if fingerprints is not None:
+                fingerprints.discard()
+    return wrapper
@@ -0,0 +1,119 @@
+import datetime as dt
+import os
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.metrics import timed
+from src.schemas import COMPRESSION, COMPRESSION_LEVEL, GAMES_SCHEMA, read_parquet, to_table
+from src.utils import atomic_write
+
+# Games dimension shared by both pipelines: one row per game of a (season, season_type, api
+# week) with ids, teams, kickoff, status and num_bets, as of `fetched_at`.
+#   game lines  write it from the scoreboard they fetch anyway (get_game_lines: runner and daemon)
+#   props       read it instead of calling scoreboard/markets for the week's game list, and
+#               only make that call when the table is missing or stale
+# A week is stale once it is older than max_age, unless every game in it is final (then it
+# never changes again). save() keeps whichever snapshot is newer, so a replay of old payloads
+# never overwrites a fresher live one.
+#
+# Layout: <root>/<season>/<season_type>/<week>.parquet
+GAMES_ROOT = "./data/state/games/football/nfl"
+GAMES_MAX_AGE = 60 * 60.0
+FINAL_STATUSES = frozenset({"complete", "closed", "final", "cancelled", "canceled"})
+
+
+def is_final(status: Any) -> bool:
+    return status is not None and not pd.isna(status) and str(status).lower() in FINAL_STATUSES
+
+
+def from_scoreboard(games_df: pd.DataFrame, *, season_type: str, fetched_at: dt.datetime) -> pd.DataFrame:
+    """GameLinesClient's games_df -> dimension rows."""
+    df = pd.DataFrame({col: games_df[col] if col in games_df.columns else pd.NA
+                       for col in ("id", "season", "week", "home_team_id", "away_team_id",
+                                   "home_team_abbr", "away_team_abbr", "status", "num_bets")},
+                      index=games_df.index)
+    df["season_type"] = season_type
+    if "start_time" in games_df.columns:
+        # "2023-09-08T00:20:00.000Z" -> naive UTC
+        df["start_time"] = pd.to_datetime(games_df["start_time"], utc=True, errors="coerce").dt.tz_convert(None)
+    else:
+        df["start_time"] = pd.NaT
+    df["fetched_at"] = pd.Timestamp(fetched_at)
+    return df[GAMES_SCHEMA.names].reset_index(drop=True)
+
+
+def markets_payload(df: pd.DataFrame) -> Dict[str, Any]:
+    """Dimension rows as the scoreboard/markets JSON SimpleGamesClient.parse_payload reads (and the archive keeps)."""
+    def value(v):
+        return None if pd.isna(v) else (v.item() if hasattr(v, "item") else v)
+
+    return {
+        "source": "games_dimension",
+        "games": [
+            {
+                "id": value(g["id"]),
+                "season": value(g["season"]),
+                "week": value(g["week"]),
+                "num_bets": value(g["num_bets"]),
+                "home_team": {"id": value(g["home_team_id"]), "abbr": value(g["home_team_abbr"])},
+                "away_team": {"id": value(g["away_team_id"]), "abbr": value(g["away_team_abbr"])},
+            }
+            for g in df.to_dict("records")
+        ],
+    }
+
+
+class GameDimension:
+    """Per-week games tables under `root`; `max_age` (seconds) is when a week with unfinished games goes stale."""
+
+    def __init__(self, root: str = GAMES_ROOT, max_age: float = GAMES_MAX_AGE):
+        self.root = root
+        self.max_age = max_age
+        self.stats = {"saved": 0, "served": 0, "stale": 0, "missing": 0}
+
+    def _path(self, season: int, season_type: str, week: int) -> str:
+        return os.path.join(self.root, str(int(season)), season_type, f"{int(week)}.parquet")
+
+    def load(self, *, season: int, season_type: str, week: int) -> pd.DataFrame:
+        """The week's games (empty frame when never saved)."""
+        path = self._path(season, season_type, week)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=GAMES_SCHEMA.names)
+        return read_parquet(path, GAMES_SCHEMA)
+
+    def is_fresh(self, df: pd.DataFrame, now: Optional[dt.datetime] = None) -> bool:
+        if df.empty:
+            return False
+        if all(is_final(s) for s in df["status"]):
+            return True
+        age = (pd.Timestamp(now or dt.datetime.now()) - df["fetched_at"].max()).total_seconds()
+        return age <= self.max_age
+
+    def fresh(self, *, season: int, season_type: str, week: int,
+              now: Optional[dt.datetime] = None) -> Optional[pd.DataFrame]:
+        """The week's games when saved and not stale, else None (the caller fetches them)."""
+        df = self.load(season=season, season_type=season_type, week=week)
+        if df.empty:
+            self.stats["missing"] += 1
+            return None
+        if not self.is_fresh(df, now):
+            self.stats["stale"] += 1
+            return None
+        self.stats["served"] += 1
+        return df
+
+    @timed("games")
+    def save(self, df: pd.DataFrame, *, season: int, season_type: str, week: int) -> bool:
+        """Store the week's games unless the saved snapshot is newer; True when written."""
+        if df.empty:
+            return False
+        current = self.load(season=season, season_type=season_type, week=week)
+        if not current.empty and current["fetched_at"].max() > df["fetched_at"].max():
+            return False
+        atomic_write(self._path(season, season_type, week),
+                     lambda tmp: pq.write_table(to_table(df, GAMES_SCHEMA), tmp, compression=COMPRESSION,
+                                                compression_level=COMPRESSION_LEVEL))
+        self.stats["saved"] += 1
+        return True
@@ -0,0 +1,191 @@
+import datetime as dt
+import os
+import uuid
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.dedupe import latest_per_key
+from src.schemas import COMPRESSION, COMPRESSION_LEVEL, ROW_GROUP_SIZE, to_pandas, to_table
+from src.utils import atomic_write
+
+# Line-movement history: the weekly parquets keep only the latest row per key, so every
+# earlier price is lost. The history keeps one row per *change*: a row is appended only
+# when its tracked values (price, line, splits) differ from the key's last stored state,
+# i.e. each row starts a run that lasts until the key's next row (run-length over time).
+# Re-fetching unchanged lines, the common case, stores nothing.
+#
+# Layout: <root>/<name>/season=<s>/week=<w>/part-<utc stamp>-<id>.parquet, append-only:
+# every append writes a new part and never touches the old ones. Parts are sorted by
+# event_id so as-of reads for one event prune row groups. A week with more than
+# MAX_PARTS parts is compacted into one.
+HISTORY_ROOT = "./data/history/football/nfl"
+MAX_PARTS = 32
+
+
+class LineHistory:
+    """
+    Append-only change log of one feed (game_lines | player_props).
+
+    `keys` identify a line (the runner's UNIQ_KEYS_W_BOOK), `tracked` are the columns
+    whose change is a movement. A row's last_updated is when that state was first seen.
+    A line that disappears from the feed keeps its last state.
+    """
+
+    def __init__(self, name: str, *, keys: Sequence[str], tracked: Sequence[str], schema: pa.Schema,
+                 root: str = HISTORY_ROOT):
+        self.name = name
+        self.keys = list(keys)
+        self.tracked = list(tracked)
+        self.schema = schema
+        self.path = os.path.join(root, name)
+        self.stats = {"seen": 0, "appended": 0, "compacted": 0}
+        self._latest: Dict[Tuple[int, int], pd.DataFrame] = {}  # state per week, as of the last append
+
+    def _week_dir(self, season: int, week: int) -> str:
+        return os.path.join(self.path, f"season={int(season)}", f"week={int(week)}")
+
+    def _parts(self, season: int, week: int) -> List[str]:
+        week_dir = self._week_dir(season, week)
+        if not os.path.isdir(week_dir):
+            return []
+        return sorted(os.path.join(week_dir, f) for f in os.listdir(week_dir) if f.endswith(".parquet"))
+
+    def _write_part(self, df: pd.DataFrame, season: int, week: int) -> str:
+        week_dir = self._week_dir(season, week)
+        order = [c for c in ["event_id"] + self.keys + ["last_updated"] if c in df.columns]
+        table = to_table(df.sort_values(order, kind="stable", na_position="last"), self.schema)
+        stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(week_dir, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet")
+        atomic_write(path, lambda tmp: pq.write_table(table, tmp, compression=COMPRESSION,
+                                                      compression_level=COMPRESSION_LEVEL,
+                                                      row_group_size=ROW_GROUP_SIZE))
+        return path
+
+    # ----------- READ -----------
+    def read(
+        self,
+        *,
+        season: Optional[int] = None,
+        week: Optional[int] = None,
+        event_ids: Optional[Iterable[int]] = None,
+        until: Optional[dt.datetime] = None,
+    ) -> pd.DataFrame:
+        """
+        Change rows, oldest first. season + week read one week's parts; without them
+        every week is scanned and event_ids / until are pushed down to row groups.
+        """
+        if season is not None and week is not None:
+            paths = self._parts(season, week)
+        elif os.path.isdir(self.path):
+            paths = sorted(os.path.join(d, f) for d, _, files in os.walk(self.path)
+                           for f in files if f.endswith(".parquet"))
+        else:
+            paths = []
+        if not paths:
+            return pd.DataFrame()
+
+        expr = None
+        for cond in (
+            ds.field("season") == season if season is not None else None,
+            ds.field("week") == week if week is not None else None,
+            ds.field("event_id").isin(list(event_ids)) if event_ids is not None else None,
+            ds.field("last_updated") <= pa.scalar(pd.Timestamp(until).to_datetime64(), type=pa.timestamp("ns"))
+            if until is not None else None,
+        ):
+            if cond is not None:
+                expr = cond if expr is None else expr & cond
+        # the declared schema means no footer has to be opened just to plan the scan
+        table = ds.dataset(paths, schema=self.schema, format="parquet").to_table(filter=expr)
+        df = to_pandas(table)
+        return df.sort_values("last_updated", kind="stable").reset_index(drop=True)
+
+    def as_of(
+        self,
+        when: Optional[dt.datetime] = None,
+        *,
+        event_id: Optional[int] = None,
+        season: Optional[int] = None,
+        week: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Every book's state at `when` (default: now): the last change per key at or
+        before it. Pass season + week when known; otherwise every week is scanned.
+        """
+        rows = self.read(season=season, week=week, event_ids=None if event_id is None else [event_id], until=when)
+        return latest_per_key(rows, self.keys)
+
+    def closing(self, season: int, week: int, kickoffs: Dict[int, dt.datetime]) -> pd.DataFrame:
+        """
+        Closing line per key: its last change at or before its event's kickoff
+        ({event_id: start_time}; events without one get their latest state).
+        Aware kickoffs are compared in local time, which is how last_updated is stamped.
+        """
+        rows = self.read(season=season, week=week)
+        if rows.empty:
+            return rows
+        local = {int(e): pd.Timestamp(dt.datetime.fromtimestamp(pd.Timestamp(t).timestamp()))
+                 if pd.Timestamp(t).tzinfo is not None else pd.Timestamp(t) for e, t in kickoffs.items()}
+        kickoff = rows["event_id"].map(local).astype("datetime64[ns]")
+        before = (kickoff.isna() | (rows["last_updated"] <= kickoff)).fillna(False).to_numpy(dtype=bool)
+        return latest_per_key(rows[before], self.keys)
+
+    def latest(self, season: int, week: int) -> pd.DataFrame:
+        """The week's current state, i.e. what keep_only_latest_per_book keeps (last_updated = first seen)."""
+        if (season, week) not in self._latest:
+            self._latest[(season, week)] = self.as_of(season=season, week=week)
+        return self._latest[(season, week)]
+
+    # ----------- WRITE -----------
+    def changes(self, df: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+        """Rows of `df` (one snapshot, on the schema) that start a new run against `previous`."""
+        df = latest_per_key(df, self.keys)
+        if previous.empty:
+            return df
+        prev = previous[self.keys + self.tracked + ["last_updated"]]
+        merged = df.merge(prev, on=self.keys, how="left", suffixes=("", "_prev"), indicator=True)
+        moved = (merged["_merge"] == "left_only").to_numpy()
+        for col in self.tracked:
+            a, b = merged[col], merged[f"{col}_prev"]
+            same = (a == b).fillna(False).to_numpy(dtype=bool) | (a.isna() & b.isna()).to_numpy()
+            moved |= ~same
+        # a snapshot older than the stored state (replays, late writes) is not a movement
+        # (a key with no stored state compares False against NaT, so it is newer explicitly)
+        newer = (merged["last_updated_prev"].isna()
+                 | (merged["last_updated"] > merged["last_updated_prev"])).to_numpy(dtype=bool)
+        return df[moved & newer]
+
+    def append(self, df: pd.DataFrame) -> int:
+        """Append the rows of `df` that moved since the stored state; returns how many were written."""
+        if df is None or df.empty:
+            return 0
+        df = to_pandas(to_table(df, self.schema))  # compare on the stored dtypes
+        self.stats["seen"] += len(df)
+        written = 0
+        for (season, week), snapshot in df.groupby(["season", "week"], sort=True):
+            previous = self.latest(season, week)
+            moved = self.changes(snapshot, previous)
+            if moved.empty:
+                continue
+            self._write_part(moved, season, week)
+            written += len(moved)
+            self._latest[(season, week)] = latest_per_key(
+                pd.concat([previous, moved], ignore_index=True) if not previous.empty else moved, self.keys)
+            if len(self._parts(season, week)) > MAX_PARTS:
+                self.compact(season, week)
+        self.stats["appended"] += written
+        return written
+
+    def compact(self, season: int, week: int) -> None:
+        """Rewrite a week's parts as one (same rows); the old parts are removed after the new one is in place."""
+        parts = self._parts(season, week)
+        if len(parts) < 2:
+            return
+        rows = self.read(season=season, week=week)
+        self._write_part(rows, season, week)
+        for path in parts:
+            os.remove(path)
+        self.stats["compacted"] += 1
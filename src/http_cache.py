@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from src.metrics import timed, timer
+from src.utils import atomic_write
+
+# TTL (seconds) meaning "never expires": completed weeks do not change upstream
+IMMUTABLE = float("inf")
+DEFAULT_CACHE_DIR = "./.cache/http"
+
+TTLPolicy = Callable[[str, Dict[str, Any]], float]
+
+
+class ResponseCache:
+    """
+    On-disk JSON response cache keyed by (url, params), one gzip file per key.
+
+    An entry younger than its TTL is served without touching the network. An
+    expired entry is revalidated with If-None-Match / If-Modified-Since; a 304
+    refreshes it in place, a 200 replaces it. The TTL comes from the `ttl`
+    argument of `fetch_json`, else `ttl_policy(url, params)`, else `default_ttl`
+    (0 = always revalidate, IMMUTABLE = never expire).
+    """
+
+    def __init__(
+        self,
+        root: str = DEFAULT_CACHE_DIR,
+        *,
+        ttl_policy: Optional[TTLPolicy] = None,
+        default_ttl: float = 0.0,
+    ):
+        self.root = root
+        self.ttl_policy = ttl_policy
+        self.default_ttl = default_ttl
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    # ----------- keys / files -----------
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        canon = json.dumps([url, sorted((str(k), str(v)) for k, v in (params or {}).items())])
+        return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json.gz")
+
+    @timed("cache_io")
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @timed("cache_io")
+    def store(self, key: str, entry: Dict[str, Any]) -> None:
+        def write(tmp: str) -> None:
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+
+        # concurrent readers never see a partial file
+        atomic_write(self._path(key), write)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    # ----------- PUBLIC -----------
+    def fetch_json(
+        self,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        send: Callable[[Dict[str, str]], requests.Response],
+        ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Return the decoded JSON body for (url, params); `send(headers)` performs the GET."""
+        params = params or {}
+        if ttl is None:
+            ttl = self.ttl_policy(url, params) if self.ttl_policy else self.default_ttl
+
+        key = self.key(url, params)
+        entry = self.load(key)
+        now = time.time()
+        if entry is not None and now - entry["fetched_at"] < ttl:
+            self._count("hits")
+            return entry["body"]
+
+        req_headers = dict(headers)
+        if entry is not None:
+            if entry.get("etag"):
+                req_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                req_headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = send(req_headers)
+        if resp.status_code == 304 and entry is not None:
+            entry["fetched_at"] = now
+            self.store(key, entry)
+            self._count("revalidated")
+            return entry["body"]
+        if resp.status_code != 200:
+            raise requests.HTTPError(f"{resp.status_code} for {resp.url}\n{resp.text[:800]}")
+
+        with timer("json_decode"):
+            body = resp.json() or {}
+        self.store(key, {
+            "url": url,
+            "params": {str(k): str(v) for k, v in params.items()},
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "body": body,
+        })
+        self._count("misses")
+        return body
@@ -0,0 +1,240 @@
+import datetime as dt
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src import profiling
+
+# Per-stage timers and counters for one run, reported as a JSON run report and, optionally,
+# a Prometheus textfile (node_exporter's textfile collector). One RunMetrics per process,
+# like the transport and the retry policy: deep code (HTTP, JSON decode, parse) times
+# itself through timer()/timed() without the runners threading an object through.
+#
+# Stages (seconds are summed over threads, so concurrent props fetches can exceed wall time):
+#   rate_limit   waiting on the request budget       http         one GET attempt (incl. body)
+#   json_decode  response body -> dict               cache_io     on-disk response cache
+#   archive      raw payload archive read/write      fingerprint  payload hashing
+#   parse        payload -> rows                     enrich       props: team/player joins
+#   read         weekly parquet read                 open_lines   OPEN (30) fill
+#   history      line-movement append                dedupe       merge + keep latest per book
+#   write        weekly parquet write                rollup       season parquet
+#   dataset      partitioned dataset copy        games        games dimension write
+# Function-level stages, for profiling one hot function (src.profiling): props_blob
+# (GamePropsClient._props_blob_to_df), clean_names, hunt_ids (PlayerIdResolver.resolve),
+# latest_per_key, merge_latest.
+RUN_REPORT_ROOT = "./data/state/runs"
+PROMETHEUS_PREFIX = "action_network"
+
+
+class RunMetrics:
+    """Thread-safe stage timers (seconds, calls) and counters of one run."""
+
+    def __init__(self):
+        self.started_at = dt.datetime.now()
+        self._started = time.perf_counter()
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, float] = {}
+        self.peak_bytes: Dict[str, int] = {}  # tracemalloc peak per stage, when profiling memory
+        self._lock = threading.Lock()
+
+    def add_time(self, stage: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            self.calls[stage] = self.calls.get(stage, 0) + calls
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_peak(self, stage: str, peak: int) -> None:
+        with self._lock:
+            self.peak_bytes[stage] = max(self.peak_bytes.get(stage, 0), peak)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time the block as one call of `stage` (an exception still counts its time)."""
+        if not profiling.active():
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.add_time(stage, time.perf_counter() - start)
+            return
+        hook = profiling.StageProfile(stage)
+        start = time.perf_counter()
+        try:
+            with hook:
+                yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+            if hook.peak is not None:
+                self.add_peak(stage, hook.peak)
+
+    def wall_seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {"seconds": dict(self.seconds), "calls": dict(self.calls), "counters": dict(self.counters),
+                    "peak_bytes": dict(self.peak_bytes)}
+
+    def since(self, before: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """What was recorded after `before` (a snapshot()): one unit's share of a worker's totals."""
+        now = self.snapshot()
+        out = {part: {k: v - before[part].get(k, 0) for k, v in now[part].items() if v != before[part].get(k, 0)}
+               for part in ("seconds", "calls", "counters")}
+        out["peak_bytes"] = {k: v for k, v in now["peak_bytes"].items() if v != before["peak_bytes"].get(k)}
+        return out
+
+    def merge(self, snapshot: Dict[str, Dict[str, float]]) -> None:
+        """Add a (worker's) snapshot to these totals."""
+        with self._lock:
+            for part, totals in (("seconds", self.seconds), ("calls", self.calls), ("counters", self.counters)):
+                for k, v in snapshot.get(part, {}).items():
+                    totals[k] = totals.get(k, 0) + v
+            for k, v in snapshot.get("peak_bytes", {}).items():
+                self.peak_bytes[k] = max(self.peak_bytes.get(k, 0), v)
+
+    def stages(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: {"seconds": round(self.seconds[stage], 6), "calls": self.calls.get(stage, 0)}
+                    for stage in sorted(self.seconds, key=self.seconds.get, reverse=True)}
+
+
+_METRICS: Optional[RunMetrics] = None
+_METRICS_LOCK = threading.Lock()
+
+
+def get_metrics() -> RunMetrics:
+    """The process-wide metrics (created on first use; spawned workers build their own)."""
+    global _METRICS
+    with _METRICS_LOCK:
+        if _METRICS is None:
+            _METRICS = RunMetrics()
+        return _METRICS
+
+
+def timer(stage: str):
+    """`with timer("parse"):` on the process-wide metrics."""
+    return get_metrics().timer(stage)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator: every call of the function is one call of `stage`."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_metrics().timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name: str, n: float = 1) -> None:
+    get_metrics().count(name, n)
+
+
+# --------------- RUN REPORT --------------- #
+def _write_atomic(path: str, text: str) -> None:
+    # the textfile collector must never scrape a half-written file
+    # (imported here: src.utils imports this module for `timed`)
+    from src.utils import atomic_write
+
+    def write(tmp: str) -> None:
+        with open(tmp, "w") as f:
+            f.write(text)
+
+    atomic_write(path, write)
+
+
+def run_report(run: str, stats: Dict[str, Dict[str, Any]], metrics: Optional[RunMetrics] = None) -> Dict[str, Any]:
+    """The run as one JSON-able dict: stage timings, counters and the components' own stats."""
+    metrics = metrics or get_metrics()
+    snapshot = metrics.snapshot()
+    return {
+        "run": run,
+        "argv": sys.argv[1:],
+        "started_at": metrics.started_at.isoformat(),
+        "finished_at": dt.datetime.now().isoformat(),
+        "wall_seconds": round(metrics.wall_seconds(), 3),
+        "stages": metrics.stages(),
+        "counters": snapshot["counters"],
+        "peak_bytes": snapshot["peak_bytes"],
+        "stats": stats,
+    }
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def prometheus_text(report: Dict[str, Any], prefix: str = PROMETHEUS_PREFIX) -> str:
+    """A run report in the Prometheus text exposition format (gauges of the last run)."""
+    run = f'run="{_label(report["run"])}"'
+    lines = []
+
+    def gauge(name: str, help_text: str, samples) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.extend(f"{prefix}_{name}{{{labels}}} {float(value)!r}" for labels, value in samples)
+
+    gauge("run_wall_seconds", "Wall-clock duration of the last run.", [(run, report["wall_seconds"])])
+    gauge("run_finished_timestamp_seconds", "Unix time the last run finished.",
+          [(run, dt.datetime.fromisoformat(report["finished_at"]).timestamp())])
+    stages = report["stages"]
+    gauge("stage_seconds", "Seconds spent per stage in the last run (summed over threads).",
+          [(f'{run},stage="{_label(s)}"', v["seconds"]) for s, v in stages.items()])
+    gauge("stage_calls", "Calls per stage in the last run.",
+          [(f'{run},stage="{_label(s)}"', v["calls"]) for s, v in stages.items()])
+    gauge("stage_peak_bytes", "tracemalloc peak per stage in the last run (memory profiling only).",
+          [(f'{run},stage="{_label(s)}"', v) for s, v in sorted(report.get("peak_bytes", {}).items())])
+    gauge("run_count", "Counters of the last run (rows, weeks, ...).",
+          [(f'{run},name="{_label(k)}"', v) for k, v in sorted(report["counters"].items())])
+    gauge("run_stat", "Component stats of the last run (cache, transport, retries, ...).",
+          [(f'{run},component="{_label(c)}",name="{_metric_name(k)}"', v)
+           for c, values in sorted(report["stats"].items()) for k, v in sorted(values.items())
+           if isinstance(v, (int, float)) and not isinstance(v, bool)])
+    return "\n".join(lines) + "\n"
+
+
+def report_path(run: str, path: Optional[str] = None, root: str = RUN_REPORT_ROOT) -> str:
+    """Where this run's report goes: `path`, else <root>/<run>/<start stamp>.json."""
+    return path or os.path.join(root, run, f"{get_metrics().started_at:%Y%m%dT%H%M%S}.json")
+
+
+def profile_dir(run: str, path: Optional[str] = None, root: str = RUN_REPORT_ROOT) -> str:
+    """Profiler output next to the run report: <report without .json>.profile/."""
+    return os.path.splitext(report_path(run, path, root))[0] + ".profile"
+
+
+def write_run_report(run: str, stats: Dict[str, Dict[str, Any]], *, path: Optional[str] = None,
+                     textfile: Optional[str] = None, root: str = RUN_REPORT_ROOT) -> str:
+    """
+    Write the JSON run report (default <root>/<run>/<start stamp>.json, plus latest.json)
+    and, with `textfile`, the Prometheus textfile. Profiles collected in this process
+    (src.profiling) are dumped first. Returns the report path.
+    """
+    metrics = get_metrics()
+    report = run_report(run, stats, metrics)
+    profiling.dump()
+    if profiling.active():
+        report["profile_dir"] = profiling.settings()[3]  # workers dump there too
+    text = json.dumps(report, indent=2, default=str)
+    if path is None:
+        _write_atomic(os.path.join(root, run, "latest.json"), text)
+    path = report_path(run, path, root)
+    _write_atomic(path, text)
+    if textfile:
+        _write_atomic(textfile, prometheus_text(report))
+    return path
@@ -0,0 +1,158 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.dedupe import key_isin
+from src.schemas import COMPRESSION, COMPRESSION_LEVEL, ROW_GROUP_SIZE, read_parquet, to_pandas, to_table
+from src.utils import atomic_write, backfill_open_lines
+
+# Opening lines, frozen. ensure_open_lines() re-derives the OPEN book (30) from the latest
+# CONSENSUS/DK/FD/bet365 row on every merge, so the "open" moved whenever those books did.
+# The tracker records the first row ever observed per line (every book, OPEN included) and
+# never rewrites it: a synthesized OPEN is inferred once, the first time its group shows up,
+# and is served from here afterwards. backfill_open_lines only runs for never-seen groups,
+# i.e. not at all on a steady-state run.
+#
+# Layout: <root>/<name>/<season>/<week>.parquet, one row per line key (first observation).
+# Delete a week's file to re-open it from the next snapshot (or from its weekly parquet).
+OPEN_LINES_ROOT = "./data/state/open_lines/football/nfl"
+
+
+class OpenLineTracker:
+    """
+    First observed row per line for one feed.
+
+    `keys` are the runner's UNIQ_KEYS_W_BOOK, `group_keys` the same without book_id;
+    `open_book_id` / `fallback_priority` are what backfill_open_lines infers from.
+    """
+
+    def __init__(self, name: str, *, keys: Sequence[str], group_keys: Sequence[str], schema: pa.Schema,
+                 open_book_id: int, fallback_priority: Sequence[int], root: str = OPEN_LINES_ROOT):
+        self.name = name
+        self.keys = list(keys)
+        self.group_keys = list(group_keys)
+        self.schema = schema
+        self.open_book_id = open_book_id
+        self.fallback_priority = list(fallback_priority)
+        self.path = os.path.join(root, name)
+        self.stats = {"observed": 0, "served": 0, "inferred": 0}
+        self._opening: Dict[Tuple[int, int], pd.DataFrame] = {}
+
+    def _week_path(self, season: int, week: int) -> str:
+        return os.path.join(self.path, str(int(season)), f"{int(week)}.parquet")
+
+    def _save(self, season: int, week: int, df: pd.DataFrame) -> None:
+        table = to_table(df, self.schema)
+        atomic_write(self._week_path(season, week),
+                     lambda tmp: pq.write_table(table, tmp, compression=COMPRESSION,
+                                                compression_level=COMPRESSION_LEVEL, row_group_size=ROW_GROUP_SIZE))
+
+    # ----------- PUBLIC -----------
+    def opening(self, season: int, week: int) -> pd.DataFrame:
+        """First observed row per line of the week (empty if never observed)."""
+        if (season, week) not in self._opening:
+            path = self._week_path(season, week)
+            self._opening[(season, week)] = read_parquet(path, self.schema) if os.path.exists(path) else pd.DataFrame()
+        return self._opening[(season, week)]
+
+    def observe(self, df: pd.DataFrame, season: int, week: int) -> pd.DataFrame:
+        """Record the rows of `df` whose line was never observed; returns those rows."""
+        opening = self.opening(season, week)
+        new = df[~key_isin(df, opening, self.keys)]
+        if new.empty:
+            return new
+        if "last_updated" in new.columns:
+            new = new.sort_values("last_updated", kind="stable", na_position="last")
+        new = to_pandas(to_table(new.drop_duplicates(self.keys, keep="first"), self.schema))
+        opening = new if opening.empty else pd.concat([opening, new], ignore_index=True)
+        self._save(season, week, opening)
+        self._opening[(season, week)] = opening
+        self.stats["observed"] += len(new)
+        return new
+
+    def fill_open(self, df: pd.DataFrame, *, seen: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        `df` (one pull) plus an OPEN row for every group it has no OPEN row for: the frozen
+        one when the group was opened before, else inferred once (backfill_open_lines) and
+        frozen. `seen` (the week's stored rows) seeds a week the tracker has never observed.
+        Served OPEN rows carry the pull's last_updated, so they replace older OPEN rows in
+        the keep-latest merge while their values stay put.
+        """
+        if df.empty:
+            return df
+        df = _with_open_columns(df)
+        parts = [df]
+        for (season, week), pull in df.groupby(["season", "week"], sort=True):
+            season, week = int(season), int(week)
+            if seen is not None and not seen.empty and self.opening(season, week).empty:
+                self.observe(seen, season, week)  # earliest rows we still have for this week
+            self.observe(pull, season, week)
+
+            opening = self.opening(season, week)
+            is_open = (pull["book_id"] == self.open_book_id).fillna(False).to_numpy(dtype=bool)
+            missing = pull[~key_isin(pull, pull[is_open], self.group_keys)]
+            if missing.empty:
+                continue
+            frozen = opening[(opening["book_id"] == self.open_book_id).fillna(False).to_numpy(dtype=bool)]
+            frozen = frozen[key_isin(frozen, missing, self.group_keys)]
+            if "last_updated" in pull.columns:
+                frozen = frozen.assign(last_updated=pull["last_updated"].max())
+            parts.append(frozen)
+            self.stats["served"] += len(frozen)
+
+            # groups never opened: infer from the fallback books, once
+            unopened = missing[~key_isin(missing, frozen, self.group_keys)]
+            if not unopened.empty:
+                inferred = backfill_open_lines(unopened, self.group_keys, open_book_id=self.open_book_id,
+                                               fallback_priority=self.fallback_priority)
+                inferred = inferred[(inferred["book_id"] == self.open_book_id).fillna(False).to_numpy(dtype=bool)]
+                if not inferred.empty:
+                    parts.append(self.observe(inferred, season, week))
+                    self.stats["inferred"] += len(inferred)
+        if len(parts) == 1:
+            return df
+        return _concat_like(df, parts[1:])
+
+    def open_current_close(self, current: pd.DataFrame, closing: Optional[pd.DataFrame] = None,
+                           columns: Sequence[str] = ("value", "odds")) -> pd.DataFrame:
+        """
+        `current` rows with open_<col> (first observed) and, when `closing` is given (e.g.
+        LineHistory.closing), close_<col> for each of `columns`; one join each, per week.
+        """
+        out = []
+        for (season, week), rows in current.groupby(["season", "week"], sort=True):
+            rows = self._join(rows, self.opening(int(season), int(week)), columns, "open_")
+            if closing is not None:
+                rows = self._join(rows, closing, columns, "close_")
+            out.append(rows)
+        return pd.concat(out, ignore_index=True) if out else current
+
+    def _join(self, rows: pd.DataFrame, other: pd.DataFrame, columns: Sequence[str], prefix: str) -> pd.DataFrame:
+        rows = rows.reset_index(drop=True)
+        if other.empty:
+            return rows.assign(**{f"{prefix}{c}": pd.NA for c in columns})
+        # both sides on the stored key dtypes, so e.g. int64 event ids meet Int32 ones
+        key_schema = pa.schema([self.schema.field(k) for k in self.keys])
+        left = to_pandas(to_table(rows[self.keys], key_schema))
+        right = to_pandas(to_table(other[self.keys], key_schema)).assign(
+            **{f"{prefix}{c}": other[c].to_numpy() for c in columns})
+        joined = left.merge(right, on=self.keys, how="left", validate="many_to_one")
+        return pd.concat([rows, joined[[f"{prefix}{c}" for c in columns]]], axis=1)
+
+
+def _with_open_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """open_inferred / open_source_book_id filled in as backfill_open_lines leaves them."""
+    return df.assign(
+        open_inferred=df["open_inferred"].astype("boolean").fillna(False) if "open_inferred" in df.columns else False,
+        open_source_book_id=df["open_source_book_id"].astype("Int64") if "open_source_book_id" in df.columns
+        else pd.Series(pd.NA, index=df.index, dtype="Int64"),
+    )
+
+
+def _concat_like(df: pd.DataFrame, extra: List[pd.DataFrame]) -> pd.DataFrame:
+    """df + extra rows, projected onto df's columns."""
+    extra = [e.reindex(columns=df.columns) for e in extra if not e.empty]
+    return pd.concat([df] + extra, ignore_index=True) if extra else df
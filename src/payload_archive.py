@@ -0,0 +1,82 @@
+import datetime as dt
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import zstandard
+
+from src.metrics import timed
+from src.utils import atomic_write
+
+ARCHIVE_ROOT = "./data/raw/football/nfl/payloads"
+
+# endpoint names used as the first path component
+SCOREBOARD = "scoreboard"   # GameLinesClient: one payload per (season, season_type, week)
+GAMES = "games"             # SimpleGamesClient: one payload per (season, season_type, week)
+PROPS = "props"             # GamePropsClient: one payload per game
+
+
+class PayloadArchive:
+    """
+    zstd-compressed JSON archive of raw Action Network payloads.
+
+    Layout: <root>/<endpoint>/<season>/<season_type>/<week>/<game_id|endpoint>.json.zst
+    Each file holds {"fetched_at": iso8601, "payload": <response json>}; the
+    latest fetch for a key overwrites the previous one.
+    """
+
+    def __init__(self, root: str = ARCHIVE_ROOT, level: int = 10):
+        self.root = root
+        self.level = level
+
+    def path(self, endpoint: str, *, season: int, season_type: str, week: int,
+             game_id: Optional[int] = None) -> str:
+        name = str(game_id) if game_id is not None else endpoint
+        return os.path.join(self.root, endpoint, str(season), season_type, str(week), f"{name}.json.zst")
+
+    @timed("archive")
+    def save(self, endpoint: str, payload: Dict[str, Any], *, season: int, season_type: str, week: int,
+             game_id: Optional[int] = None, fetched_at: Optional[dt.datetime] = None) -> str:
+        path = self.path(endpoint, season=season, season_type=season_type, week=week, game_id=game_id)
+        envelope = {
+            "fetched_at": (fetched_at or dt.datetime.now()).isoformat(),
+            "payload": payload,
+        }
+        data = zstandard.ZstdCompressor(level=self.level).compress(
+            json.dumps(envelope, separators=(",", ":")).encode("utf-8")
+        )
+
+        def write(tmp: str) -> None:
+            with open(tmp, "wb") as f:
+                f.write(data)
+
+        atomic_write(path, write)
+        return path
+
+    @timed("archive")
+    def load(self, endpoint: str, *, season: int, season_type: str, week: int,
+             game_id: Optional[int] = None) -> Optional[Tuple[Dict[str, Any], dt.datetime]]:
+        """(payload, fetched_at) or None when the key was never archived."""
+        path = self.path(endpoint, season=season, season_type=season_type, week=week, game_id=game_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            envelope = json.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+        return envelope["payload"], dt.datetime.fromisoformat(envelope["fetched_at"])
+
+    # ----------- discovery (replay planning) -----------
+    def seasons(self, endpoint: str) -> List[int]:
+        base = os.path.join(self.root, endpoint)
+        if not os.path.isdir(base):
+            return []
+        return sorted(int(s) for s in os.listdir(base) if s.isdigit())
+
+    def weeks(self, endpoint: str, season: int) -> List[Tuple[str, int]]:
+        """Archived (season_type, api_week) pairs for a season, regular season first."""
+        base = os.path.join(self.root, endpoint, str(season))
+        out = []
+        for season_type in ("reg", "post"):
+            st_dir = os.path.join(base, season_type)
+            if os.path.isdir(st_dir):
+                out.extend((season_type, w) for w in sorted(int(w) for w in os.listdir(st_dir) if w.isdigit()))
+        return out
@@ -0,0 +1,70 @@
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from src.http_cache import IMMUTABLE
+from src.payload_archive import PayloadArchive
+from src.utils import canonical_week_for
+
+# Which (season, canonical week) units a run rebuilds. Shared by the one-shot runners and
+# pipeline.py, which plans both feeds from one ESPN activity check and one season/week lookup.
+# The ESPN league client and nfl_data_loader's season utils are imported inside the live-only
+# helpers: replays never load them (see benchmarks/bench_startup.py).
+PROCESSED_ROOT = "./data/processed"
+
+
+def live_calendar(sport_str: str, league_str: str) -> Tuple[int, int]:
+    """(current season, current canonical week) for a live run, after the ESPN activity check."""
+    from espn_api_orm.league.api import ESPNLeagueAPI
+    from nfl_data_loader.utils.utils import find_year_for_season, find_week_for_season
+
+    if not ESPNLeagueAPI(sport_str, league_str).is_active():
+        print("Running in OffSeason")
+    return find_year_for_season(), find_week_for_season()
+
+
+def seasons_to_update(sport_str: str, league_str: str, feed: str, start_season: int) -> List[int]:
+    """Seasons of `feed` a live run rebuilds (from what data/processed already holds)."""
+    from nfl_data_loader.utils.utils import get_seasons_to_update
+
+    seasons = get_seasons_to_update(f"{PROCESSED_ROOT}/{sport_str}/{league_str}", feed)
+    return [s for s in seasons if s >= start_season]
+
+
+def replay_seasons(archive: PayloadArchive, endpoint: str, start_season: int) -> List[int]:
+    """Every archived season of `endpoint`."""
+    return [s for s in archive.seasons(endpoint) if s >= start_season]
+
+
+def replay_weeks(archive: PayloadArchive, endpoint: str, season: int) -> List[int]:
+    """Canonical weeks of `season` archived for `endpoint`."""
+    return [canonical_week_for(season, st, w) for st, w in archive.weeks(endpoint, season)]
+
+
+def weeks_to_update(season: int, processed_df: pd.DataFrame, *, current_season: int,
+                    current_week: int) -> Tuple[List[int], Optional[int], Optional[int]]:
+    """
+    (canonical weeks to rebuild, current week | None, max_week for the rollup | None) of a live run.
+    The current season re-pulls last week through next week (the next week's snapshot is
+    kept only up to current_week + 1); a past season resumes at its last processed week.
+    `processed_df` is the processed season parquet (only its week column is read; may be empty).
+    """
+    if season == current_season:
+        max_week = None
+        if processed_df.shape[0] != 0:
+            max_processed_week = 1 if current_week == 1 else current_week - 1
+            max_week = current_week + 1
+        else:
+            max_processed_week = 1
+        return list(range(max_processed_week, current_week + 1 + 1)), current_week, max_week
+    update_week_start = processed_df.week.max() if processed_df.shape[0] != 0 else 1
+    return list(range(update_week_start, (22 + 1 if season >= 2021 else 21 + 1))), None, None
+
+
+def cache_ttl_for(canonical_week: int, current_week: Optional[int]) -> float:
+    """
+    Weeks before last week never change upstream: serve them from cache. Last week is
+    re-pulled for its closing lines and late games, and its cache entry was stored while
+    it was still the current week, so it revalidates like the open weeks.
+    """
+    return IMMUTABLE if current_week is None or canonical_week < current_week - 1 else 0
@@ -0,0 +1,320 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from nfl_data_loader.schemas.players.position import POSITION_MAPPER
+
+from src.metrics import count, timer
+from src.schemas import PLAYER_ID_MAP_SCHEMA, write_parquet
+from src.utils import atomic_write, clean_player_names
+
+# Action Network player id -> nflverse (gsis) player_id, for one season at a time.
+# The roster is loaded and its join names cleaned once per season; each match round is a
+# hashed multi-key index over that roster, so a week of Action Network players resolves in
+# one vectorized lookup per round instead of three pandas merges against a fresh roster.
+# Rounds, in priority order (the first hit wins, first roster row per key like the merges):
+#   team_position  week + team + position_group + join_name
+#   position       week + position_group + join_name
+#   team           week + join_name + team
+#   defense        team units (position 'D') -> the team's player id
+# Mappings found here that the id map does not have yet are appended to it; unmatched
+# players go to ./data/raw/football/nfl/players/<season>/<week>.parquet for a manual merge.
+#
+# The id map (formerly the consts.ACTION_NETWORK_ID_MAPPER dict literal) is a two-column
+# parquet sorted by the integer Action Network id, read on first use: a lookup is one
+# searchsorted over the whole id column. Add ids with PlayerIdMap.add() (or a hunt) and
+# commit the file; nothing needs editing in source.
+ID_MAP_PATH = "./data/reference/football/nfl/action_network_player_ids.parquet"
+CANT_MATCH_ROOT = "./data/raw/football/nfl/players"
+
+ROUNDS: List[Tuple[str, List[str]]] = [
+    ("team_position", ["week", "team", "position_group", "join_name"]),
+    ("position", ["week", "position_group", "join_name"]),
+    ("team", ["week", "join_name", "team"]),
+]
+DEFENSE = "defense"
+PLAYER_COLS = ["action_network_player_id", "join_name", "position", "team", "season", "week", "position_group"]
+
+
+def _collect_roster(season: int) -> pd.DataFrame:
+    # the roster / player collectors are only imported by a hunt, not by every importer of the runners
+    from nfl_data_loader.api.sources.players.rosters.rosters import collect_roster
+    return collect_roster(season)
+
+
+def _collect_players(**kwargs) -> pd.DataFrame:
+    from nfl_data_loader.api.sources.players.general.players import collect_players
+    return collect_players(**kwargs)
+
+
+def roster_week(season: int, week: int, season_type: str) -> int:
+    """The roster's week number for an Action Network week (post season continues the count)."""
+    if season_type == "post":
+        return week + (18 if season >= 2021 else 17)
+    return week
+
+
+def roster_join_names(names: pd.Series) -> pd.Series:
+    """'Ja'Marr Chase Jr.' -> 'j.chase': first initial + second word of the cleaned name."""
+    names = clean_player_names(names, lowercase=True)
+    return names.str[0] + "." + names.str.split(" ").str[1]
+
+
+class PlayerIdMap:
+    """Sorted Action Network ids (int64) and their nflverse player ids, loaded from `path` on first use."""
+
+    def __init__(self, path: str = ID_MAP_PATH):
+        self.path = path
+        self._keys: Optional[np.ndarray] = None
+        self._values: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            if self._keys is None:
+                try:
+                    table = pq.read_table(self.path)
+                except FileNotFoundError:
+                    table = PLAYER_ID_MAP_SCHEMA.empty_table()
+                keys = table.column("action_network_player_id").to_numpy().astype(np.int64)
+                values = np.asarray(table.column("player_id").to_pylist(), dtype=object)
+                order = np.argsort(keys, kind="stable")  # written sorted; cheap to make sure
+                self._keys, self._values = keys[order], values[order]
+            return self._keys, self._values
+
+    def lookup(self, ids) -> np.ndarray:
+        """
+        nflverse player id per Action Network id in `ids` (ints or digit strings); None where
+        unknown or where the id itself is missing (None / NaN / pd.NA).
+        """
+        keys, values = self._arrays()
+        ids = np.asarray(ids)
+        out = np.full(len(ids), None, dtype=object)
+        present = np.flatnonzero(~pd.isna(ids))  # a null id must not be cast to an arbitrary int64
+        if not len(keys) or not len(present):
+            return out
+        an_ids = ids[present].astype(np.int64)
+        pos = np.minimum(np.searchsorted(keys, an_ids), len(keys) - 1)
+        hit = keys[pos] == an_ids
+        out[present[hit]] = values[pos[hit]]
+        return out
+
+    def __contains__(self, an_id) -> bool:
+        return self.lookup([an_id])[0] is not None
+
+    def __len__(self) -> int:
+        return len(self._arrays()[0])
+
+    def to_dict(self) -> Dict[str, str]:
+        """The old consts.ACTION_NETWORK_ID_MAPPER shape: {"<action network id>": "<player id>"}."""
+        keys, values = self._arrays()
+        return dict(zip(keys.astype(str).tolist(), values.tolist()))
+
+    def add(self, mappings: Dict[str, str]) -> int:
+        """Append the ids not mapped yet (existing entries win) and rewrite the file; returns how many."""
+        keys, values = self._arrays()
+        new_keys = np.array([int(k) for k in mappings], dtype=np.int64)
+        new_values = np.array(list(mappings.values()), dtype=object)
+        fresh = ~np.isin(new_keys, keys)
+        if not fresh.any():
+            return 0
+        keys = np.concatenate([keys, new_keys[fresh]])
+        values = np.concatenate([values, new_values[fresh]])
+        order = np.argsort(keys, kind="stable")
+        df = pd.DataFrame({"action_network_player_id": keys[order], "player_id": values[order]})
+        atomic_write(self.path, lambda tmp: write_parquet(df, tmp, PLAYER_ID_MAP_SCHEMA))
+        with self._lock:
+            self._keys, self._values = keys[order], values[order]
+        return int(fresh.sum())
+
+
+_ID_MAP: Optional[PlayerIdMap] = None
+_ID_MAP_LOCK = threading.Lock()
+
+
+def get_id_map() -> PlayerIdMap:
+    """The process-wide id map (the file is read on the first lookup, not here)."""
+    global _ID_MAP
+    with _ID_MAP_LOCK:
+        if _ID_MAP is None:
+            _ID_MAP = PlayerIdMap()
+        return _ID_MAP
+
+
+def _key_values(col: pd.Series) -> np.ndarray:
+    values = col.to_numpy(dtype=object, copy=True)
+    values[pd.isna(values)] = np.nan  # None / pd.NA / NaN hash alike, so NA equals NA as in the merges
+    return values
+
+
+class _KeyIndex:
+    """
+    Hashed multi-key index over the roster: each key column's distinct values (a hash
+    index per level) and, per distinct key tuple, the position of its first roster row.
+    """
+
+    def __init__(self, roster: pd.DataFrame, keys: List[str]):
+        self.keys = keys
+        self._levels: List[pd.Index] = []
+        gid = np.zeros(len(roster), dtype=np.int64)
+        for k in keys:
+            codes, uniques = pd.factorize(_key_values(roster[k]), use_na_sentinel=False)
+            self._levels.append(pd.Index(uniques, dtype=object))
+            gid = gid * len(uniques) + codes
+        gids, self._first = np.unique(gid, return_index=True)
+        self._gids = pd.Index(gids)
+
+    def lookup(self, df: pd.DataFrame) -> np.ndarray:
+        """Roster position for each row of `df`, -1 where its key tuple is not in the roster."""
+        if df.empty or not len(self._first):
+            return np.full(len(df), -1, dtype=np.int64)
+        gid = np.zeros(len(df), dtype=np.int64)
+        missing = np.zeros(len(df), dtype=bool)
+        for k, level in zip(self.keys, self._levels):
+            codes = level.get_indexer(_key_values(df[k]))
+            missing |= codes < 0
+            gid = gid * len(level) + codes
+        pos = self._gids.get_indexer(gid)
+        return np.where(missing | (pos < 0), -1, self._first[pos])
+
+
+class PlayerIdResolver:
+    """
+    Resolves Action Network players to nflverse player ids for one `season`.
+
+    The roster, the defense (team) ids and the round indexes are built on first use and
+    kept for every later week; new mappings go into `ids` (the process-wide id map by default).
+    """
+
+    def __init__(self, season: int, *, ids: Optional[PlayerIdMap] = None, cant_match_root: str = CANT_MATCH_ROOT,
+                 roster_loader: Callable[[int], pd.DataFrame] = _collect_roster,
+                 players_loader: Callable[..., pd.DataFrame] = _collect_players):
+        self.season = int(season)
+        self.ids = ids or get_id_map()
+        self.cant_match_root = cant_match_root
+        self.stats = {"roster_loads": 0, "resolved": 0, "unresolved": 0, "found": 0}
+        self._roster_loader = roster_loader
+        self._players_loader = players_loader
+        self._roster: Optional[pd.DataFrame] = None
+        self._indexes: Dict[str, _KeyIndex] = {}
+        self._defenses: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    # ----------- LOOKUP TABLES -----------
+    @property
+    def roster(self) -> pd.DataFrame:
+        """The season's roster, every week, with cleaned join names (loaded once)."""
+        if self._roster is None:
+            with timer("read"):
+                roster = self._roster_loader(self.season)
+            self.stats["roster_loads"] += 1
+            if roster.empty:
+                roster = pd.DataFrame(columns=["season", "week", "team", "player_id", "position_group", "name"])
+            roster = roster[roster["season"] == self.season]
+            roster = roster[["week", "team", "player_id", "position_group", "name"]].reset_index(drop=True)
+            roster["join_name"] = roster_join_names(roster["name"])
+            self._roster = roster
+        return self._roster
+
+    def _index(self, name: str, keys: List[str]) -> _KeyIndex:
+        if name not in self._indexes:
+            self._indexes[name] = _KeyIndex(self.roster, keys)
+        return self._indexes[name]
+
+    @property
+    def defenses(self) -> Dict[str, str]:
+        """team -> player id of its defense unit."""
+        if self._defenses is None:
+            players = self._players_loader(include_teams_as_players=True)
+            players = players[players["position"] == "D"].drop_duplicates("latest_team")
+            self._defenses = dict(zip(players["latest_team"], players["player_id"]))
+        return self._defenses
+
+    # ----------- PUBLIC -----------
+    def players_frame(self, players_df: pd.DataFrame, week: int, season_type: str) -> pd.DataFrame:
+        """Action Network players (player_id, join_name, position, team) keyed like the roster."""
+        df = players_df[["player_id", "join_name", "position", "team"]].rename(
+            columns={"player_id": "action_network_player_id"}).reset_index(drop=True)
+        df["season"] = self.season
+        df["week"] = roster_week(self.season, week, season_type)
+        df["position_group"] = df["position"].map(POSITION_MAPPER)
+        return df[PLAYER_COLS]
+
+    def resolve(self, players_df: pd.DataFrame, week: int, season_type: str) -> pd.DataFrame:
+        """
+        One row per Action Network player id: PLAYER_COLS + player_id + match_round
+        (both missing when no round matched).
+        """
+        with self._lock, timer("hunt_ids"):
+            df = self.players_frame(players_df, week, season_type)
+            player_ids = np.full(len(df), None, dtype=object)
+            rounds = np.full(len(df), None, dtype=object)
+            priority = np.full(len(df), len(ROUNDS) + 1, dtype=np.int64)
+
+            is_defense = (df["position"] == "D").to_numpy()
+            if is_defense.any():
+                hits = df.loc[is_defense, "team"].map(self.defenses).to_numpy(dtype=object)
+                matched = pd.notna(hits)
+                rows = np.flatnonzero(is_defense)[matched]
+                player_ids[rows], rounds[rows], priority[rows] = hits[matched], DEFENSE, len(ROUNDS)
+
+            pending = np.flatnonzero(~is_defense)
+            for i, (name, keys) in enumerate(ROUNDS):
+                if not len(pending):
+                    break
+                pos = self._index(name, keys).lookup(df.iloc[pending])
+                hit = pos >= 0
+                rows = pending[hit]
+                player_ids[rows] = self.roster["player_id"].to_numpy(dtype=object)[pos[hit]]
+                rounds[rows], priority[rows] = name, i
+                pending = pending[~hit]
+
+            out = df.assign(player_id=player_ids, match_round=rounds)
+            # a player listed twice keeps its best-round match, then its first row
+            order = np.argsort(priority, kind="stable")
+            out = out.take(order).drop_duplicates("action_network_player_id", keep="first")
+            out = out.sort_index().reset_index(drop=True)
+            resolved = int(out["player_id"].notna().sum())
+            self.stats["resolved"] += resolved
+            self.stats["unresolved"] += len(out) - resolved
+            count("player_ids_resolved", resolved)
+            return out
+
+    def hunt(self, players_df: pd.DataFrame, week: int, season_type: str) -> Dict[str, str]:
+        """
+        Resolve a week, persist the mappings not known yet and write the players that did
+        not match for a manual merge. Returns the new mappings.
+        """
+        out = self.resolve(players_df, week, season_type)
+        matched = out[out["player_id"].notna()]
+        ids = matched["action_network_player_id"].astype(int).to_numpy()
+        unknown = pd.isna(self.ids.lookup(ids))
+        new = dict(zip(ids[unknown].astype(str).tolist(), matched["player_id"].to_numpy()[unknown].tolist()))
+        print(f"{len(new)} New Players found on hunt")
+        print(new)
+        if new:
+            self.stats["found"] += self.ids.add(new)
+
+        cant_match = out[out["player_id"].isna()].drop(columns=["match_round"])
+        if cant_match.shape[0] != 0:
+            path = os.path.join(self.cant_match_root, str(self.season),
+                                f"{roster_week(self.season, week, season_type)}.parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cant_match.to_parquet(path, index=False)
+            print(f"------------ {cant_match.shape[0]} Players need manual Merge ----------")
+        return new
+
+
+_RESOLVERS: Dict[int, PlayerIdResolver] = {}
+_RESOLVERS_LOCK = threading.Lock()
+
+
+def get_resolver(season: int) -> PlayerIdResolver:
+    """The process-wide resolver of `season` (one roster load per season per process)."""
+    with _RESOLVERS_LOCK:
+        if int(season) not in _RESOLVERS:
+            _RESOLVERS[int(season)] = PlayerIdResolver(season)
+        return _RESOLVERS[int(season)]
@@ -0,0 +1,215 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+# Opt-in profiling of single stages (src.metrics stage names), on top of the timers.
+# Off unless configured, and then only the named stages pay for it:
+#   cprofile  deterministic, one <stage>-<pid>.prof per process (pstats; snakeviz, flameprof)
+#   sample    a background thread samples the stage's stack every SAMPLE_INTERVAL seconds;
+#             <stage>-<pid>.folded is collapsed-stack text for flamegraph.pl / speedscope
+#   memory    tracemalloc peak per stage (into the run report) plus the top allocation
+#             sites live at the end of the stage's biggest call, <stage>-<pid>.memory.txt
+# Settings travel in the environment so spawned pool workers profile the same stages.
+# Only the outermost profiled stage of a thread is profiled (cProfile cannot nest), and
+# memory peaks are tracked on the main thread only (tracemalloc's peak is process-wide).
+PROFILE_ENV = "ODDS_PROFILE"                # comma-separated stages, or "all"
+PROFILE_MODE_ENV = "ODDS_PROFILE_MODE"      # cprofile | sample
+PROFILE_MEMORY_ENV = "ODDS_PROFILE_MEMORY"  # "1": tracemalloc peaks per stage
+PROFILE_DIR_ENV = "ODDS_PROFILE_DIR"        # where dump() writes
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.005
+MEMORY_TOP = 25
+
+_lock = threading.Lock()
+_local = threading.local()
+_settings: Optional[Tuple[Set[str], str, bool, Optional[str]]] = None
+_profiles: Dict[Tuple[str, int], cProfile.Profile] = {}   # (stage, thread id) -> profiler
+_samples: Dict[str, Counter] = {}                          # stage -> folded stack -> samples
+_sampled: Dict[int, str] = {}                              # thread id -> stage being sampled
+_sampler: Optional[threading.Thread] = None
+_memory_stack: List[Dict[str, int]] = []
+_memory_top: Dict[str, Tuple[int, List[str]]] = {}         # stage -> (peak, top allocation sites)
+
+
+def configure(stages: Optional[List[str]] = None, *, mode: Optional[str] = None, memory: bool = False,
+              out_dir: Optional[str] = None) -> None:
+    """Turn profiling on for `stages` (and/or memory peaks), for this process and its workers."""
+    global _settings
+    if stages:
+        os.environ[PROFILE_ENV] = ",".join(stages)
+    if mode:
+        if mode not in MODES:
+            raise ValueError(f"unknown profile mode {mode!r}; expected one of {MODES}")
+        os.environ[PROFILE_MODE_ENV] = mode
+    if memory:
+        os.environ[PROFILE_MEMORY_ENV] = "1"
+    if out_dir:
+        os.environ[PROFILE_DIR_ENV] = out_dir
+    _settings = None
+
+
+def settings() -> Tuple[Set[str], str, bool, Optional[str]]:
+    """(stages, mode, memory, out_dir) from the environment, read once."""
+    global _settings
+    if _settings is None:
+        stages = {s.strip() for s in os.environ.get(PROFILE_ENV, "").split(",") if s.strip()}
+        mode = os.environ.get(PROFILE_MODE_ENV) or "cprofile"
+        memory = os.environ.get(PROFILE_MEMORY_ENV, "") not in ("", "0")
+        _settings = (stages, mode if mode in MODES else "cprofile", memory, os.environ.get(PROFILE_DIR_ENV))
+    return _settings
+
+
+def active() -> bool:
+    stages, _, memory, _ = settings()
+    return bool(stages) or memory
+
+
+def wanted(stage: str) -> bool:
+    stages = settings()[0]
+    return stage in stages or "all" in stages
+
+
+# --------------- SAMPLER --------------- #
+def _folded(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample_loop() -> None:
+    while True:
+        time.sleep(SAMPLE_INTERVAL)
+        with _lock:
+            targets = dict(_sampled)
+        if not targets:
+            continue
+        frames = sys._current_frames()
+        with _lock:
+            for thread_id, stage in targets.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    _samples.setdefault(stage, Counter())[_folded(frame)] += 1
+
+
+def _start_sampler() -> None:
+    global _sampler
+    with _lock:
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_loop, name="stage-sampler", daemon=True)
+            _sampler.start()
+
+
+# --------------- PER-CALL HOOK --------------- #
+class StageProfile:
+    """Context manager around one call of a stage; `peak` is its tracemalloc peak (bytes) or None."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.peak: Optional[int] = None
+        self._profiling = False
+        self._frame: Optional[Dict[str, int]] = None
+
+    def __enter__(self) -> "StageProfile":
+        _, mode, memory, _ = settings()
+        if wanted(self.stage) and not getattr(_local, "busy", False):
+            _local.busy = self._profiling = True
+            thread_id = threading.get_ident()
+            if mode == "sample":
+                _start_sampler()
+                with _lock:
+                    _sampled[thread_id] = self.stage
+            else:
+                with _lock:
+                    profile = _profiles.setdefault((self.stage, thread_id), cProfile.Profile())
+                _local.profile = profile
+                profile.enable()
+        if memory and threading.current_thread() is threading.main_thread():
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if _memory_stack:  # the enclosing stage's peak so far would be lost to reset_peak()
+                _memory_stack[-1]["carried"] = max(_memory_stack[-1]["carried"], peak)
+            tracemalloc.reset_peak()
+            self._frame = {"start": current, "carried": 0}
+            _memory_stack.append(self._frame)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._profiling:
+            _local.busy = False
+            thread_id = threading.get_ident()
+            with _lock:
+                _sampled.pop(thread_id, None)
+            profile = getattr(_local, "profile", None)
+            if profile is not None:
+                profile.disable()
+                _local.profile = None
+        if self._frame is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._frame["carried"])
+            _memory_stack.pop()
+            if _memory_stack:
+                _memory_stack[-1]["carried"] = max(_memory_stack[-1]["carried"], peak)
+            self.peak = max(0, peak - self._frame["start"])
+            if self.peak > _memory_top.get(self.stage, (-1, []))[0]:
+                # what the stage's biggest call still holds on the way out (rollups: the season frames);
+                # an enclosing stage's profiler is paused so the snapshot does not show up in its profile
+                outer = getattr(_local, "profile", None)
+                if outer is not None:
+                    outer.disable()
+                top = tracemalloc.take_snapshot().statistics("lineno")[:MEMORY_TOP]
+                _memory_top[self.stage] = (self.peak, [str(s) for s in top])
+                if outer is not None:
+                    outer.enable()
+
+
+# --------------- OUTPUT --------------- #
+def dump(out_dir: Optional[str] = None) -> List[str]:
+    """Write everything collected so far under `out_dir` (default: PROFILE_DIR_ENV); returns the paths."""
+    out_dir = out_dir or settings()[3]
+    if not out_dir:
+        return []
+    with _lock:
+        profiles = dict(_profiles)
+        samples = {stage: Counter(c) for stage, c in _samples.items()}
+    if not (profiles or samples or _memory_top):
+        return []
+    os.makedirs(out_dir, exist_ok=True)
+    pid = os.getpid()
+    paths = []
+    by_stage: Dict[str, List[cProfile.Profile]] = {}
+    for (stage, _), profile in profiles.items():
+        by_stage.setdefault(stage, []).append(profile)
+    for stage, stage_profiles in by_stage.items():
+        path = os.path.join(out_dir, f"{stage}-{pid}.prof")
+        stats = None
+        for profile in stage_profiles:
+            profile.create_stats()
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        stats.dump_stats(path)
+        paths.append(path)
+    for stage, counts in samples.items():
+        path = os.path.join(out_dir, f"{stage}-{pid}.folded")
+        with open(path, "w") as f:
+            f.writelines(f"{stack} {n}\n" for stack, n in counts.most_common())
+        paths.append(path)
+    for stage, (peak, top) in _memory_top.items():
+        path = os.path.join(out_dir, f"{stage}-{pid}.memory.txt")
+        with open(path, "w") as f:
+            f.write(f"# {stage}: tracemalloc peak {peak / 2**20:.1f} MiB above the stage's start; "
+                    f"top allocation sites live at the end of that call\n")
+            f.writelines(line + "\n" for line in top)
+        paths.append(path)
+    return paths
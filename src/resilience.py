@@ -0,0 +1,256 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from src.metrics import get_metrics
+
+# Retry/backoff, Retry-After, per-host circuit breaking and per-request deadlines for
+# every Action Network GET. One policy object per process is shared by all clients
+# (and all threads of GamePropsClient), so the breaker and the metrics see every call.
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host's circuit is open: recent requests kept failing, so this one was not sent."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The request (including its retries and backoff) ran past its deadline."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one host.
+
+    closed -> open after `failure_threshold` failures in a row; while open every
+    request is refused for `reset_after` seconds; then one probe is let through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_after:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True  # exactly one probe at a time
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """End a half-open probe that proved nothing either way (it was interrupted)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; True when this one opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                return True
+            return False
+
+
+def retry_after_seconds(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds to wait; None if absent/unparseable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class Resilience:
+    """
+    GET with bounded exponential backoff + full jitter, Retry-After, a circuit
+    breaker per host and a deadline per logical request (all attempts + sleeps).
+
+    Retries: connection errors, timeouts and RETRY_STATUSES, up to `max_retries`
+    re-sends. A non-retryable status (e.g. 404) is returned at once, and after the
+    last retry the final response is returned as-is: callers keep deciding what a
+    non-200 means. Any other requests error (a broken chunked body, a redirect loop)
+    is raised at once and counts as a failure for the breaker. Retry-After is
+    honoured up to `max_retry_after` seconds.
+
+    Every failed attempt counts towards the host's breaker, so `failure_threshold`
+    must exceed the attempts of one call (max_retries + 1): a single flapping
+    request cannot open the circuit for every other request to the host.
+
+    `stats`: requests (attempts sent), retries, gave_up, sleep_s (backoff only,
+    not rate limiting), circuit_rejected, circuit_opened.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 5,
+        base_sleep: float = 0.5,
+        max_sleep: float = 8.0,
+        max_retry_after: float = 60.0,
+        deadline: Optional[float] = 120.0,
+        failure_threshold: int = 12,
+        reset_after: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold <= max_retries + 1:
+            raise ValueError(f"failure_threshold ({failure_threshold}) must exceed the attempts of one call "
+                             f"(max_retries + 1 = {max_retries + 1})")
+        self.max_retries = max_retries
+        self.base_sleep = base_sleep
+        self.max_sleep = max_sleep
+        self.max_retry_after = max_retry_after
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.sleep = sleep
+        self.clock = clock
+        self.stats: Dict[str, Any] = {
+            "requests": 0, "retries": 0, "gave_up": 0, "sleep_s": 0.0, "circuit_rejected": 0, "circuit_opened": 0,
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, stat: str, n: float = 1) -> None:
+        with self._lock:
+            self.stats[stat] += n
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_after, clock=self.clock)
+            return self._breakers[host]
+
+    def _backoff(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        retry_after = retry_after_seconds(resp.headers.get("Retry-After")) if resp is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        # exponential backoff with FULL JITTER
+        return min(self.max_sleep, self.base_sleep * (2 ** attempt)) * random.random()
+
+    # ----------- PUBLIC -----------
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 20,
+        rate_limiter=None,
+        deadline: Optional[float] = None,
+    ) -> requests.Response:
+        """
+        session.get(url, ...) under the retry policy. `rate_limiter.acquire()` gates every
+        attempt; `deadline` (seconds, default self.deadline) bounds the whole call.
+        Raises CircuitOpenError, DeadlineExceeded, or the last connection error.
+        """
+        breaker = self.breaker(url)
+        budget = self.deadline if deadline is None else deadline
+        give_up_at = None if budget is None else self.clock() + budget
+
+        metrics = get_metrics()
+        for attempt in range(self.max_retries + 1):
+            if rate_limiter is not None:
+                with metrics.timer("rate_limit"):
+                    rate_limiter.acquire()
+            attempt_timeout = timeout
+            if give_up_at is not None:
+                remaining = give_up_at - self.clock()
+                if remaining <= 0:
+                    self._count("gave_up")
+                    raise DeadlineExceeded(f"deadline of {budget}s exceeded for {url}")
+                attempt_timeout = min(timeout, remaining)
+            # asked last: an allowed half-open probe is always actually sent
+            if not breaker.allow():
+                self._count("circuit_rejected")
+                raise CircuitOpenError(f"circuit open for {urlsplit(url).netloc}; not sending {url}")
+
+            self._count("requests")
+            resp, error = None, None
+            try:
+                with metrics.timer("http"):
+                    resp = session.get(url, params=params, headers=headers, timeout=attempt_timeout)
+            except RETRY_EXCEPTIONS as e:
+                error = e
+            except requests.RequestException:
+                # not worth re-sending, but the host did not answer cleanly either
+                if breaker.record_failure():
+                    self._count("circuit_opened")
+                raise
+            except BaseException:
+                breaker.release()  # interrupted: a half-open probe must not stay claimed forever
+                raise
+
+            if error is None and resp.status_code not in RETRY_STATUSES:
+                breaker.record_success()  # 2xx/3xx, or a 4xx that says the host is healthy
+                return resp
+            if breaker.record_failure():
+                self._count("circuit_opened")
+                break  # this failure tripped the breaker: further attempts would be refused
+            if attempt == self.max_retries:
+                break
+            sleep_s = self._backoff(attempt, resp)
+            if give_up_at is not None and self.clock() + sleep_s >= give_up_at:
+                break  # waiting would run past the deadline
+            self._count("retries")
+            self._count("sleep_s", sleep_s)
+            self.sleep(sleep_s)
+
+        self._count("gave_up")
+        if error is not None:
+            raise error
+        return resp
+
+
+_RESILIENCE: Optional[Resilience] = None
+_RESILIENCE_LOCK = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """The process-wide policy (created on first use; spawned workers build their own)."""
+    global _RESILIENCE
+    with _RESILIENCE_LOCK:
+        if _RESILIENCE is None:
+            _RESILIENCE = Resilience()
+        return _RESILIENCE
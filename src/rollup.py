@@ -0,0 +1,188 @@
+import datetime as dt
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.schemas import COMPRESSION, COMPRESSION_LEVEL, ROW_GROUP_SIZE, conform_table, to_pandas, to_table
+from src.utils import atomic_write
+
+# Incremental season rollup: a week whose weekly input has the same fingerprint as
+# the one its processed rows were built from is carried over as-is (Arrow, never
+# converted to pandas, deduped or merged); only changed weeks go through rollup_season.
+# Manifests live outside data/processed: get_seasons_to_update() expects only
+# <season>.parquet there. Delete a manifest to force a full rebuild of its season.
+MANIFEST_ROOT = "./data/manifests/football/nfl"
+
+# last_updated is the fetch time: re-fetching identical lines is not a change
+VOLATILE_COLUMNS = ("last_updated",)
+
+RollupFn = Callable[..., pd.DataFrame]
+
+
+def week_fingerprint(df: pd.DataFrame, schema: pa.Schema, ignore=VOLATILE_COLUMNS) -> str:
+    """
+    Order-independent hash of a week's rows, taken after casting onto `schema` so
+    frames built in-process and frames read back from parquet hash the same.
+    """
+    cols = [c for c in schema.names if c not in ignore]
+    table = conform_table(pa.Table.from_pandas(df, preserve_index=False), schema).select(cols)
+    # dictionary columns stay categorical: pandas hashes each category once, not each row
+    row_hashes = np.sort(pd.util.hash_pandas_object(table.to_pandas(), index=False).to_numpy())
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(cols).encode("utf-8"))
+    h.update(row_hashes.tobytes())
+    return h.hexdigest()
+
+
+class SeasonManifest:
+    """
+    What a processed <season>.parquet was built from.
+
+    Layout: <root>/<name>/<season>.json holding
+    {"rows": n, "updated_at": iso8601, "weeks": {"<week>": {"rows": n, "fingerprint": hex | null}}}
+    The manifest only vouches for a file whose row count still matches; anything
+    else (no manifest, file rewritten by hand) rebuilds every incoming week.
+    """
+
+    def __init__(self, name: str, season: int, root: str = MANIFEST_ROOT):
+        self.path = os.path.join(root, name, f"{season}.json")
+        self.rows: Optional[int] = None
+        self.weeks: Dict[int, Dict[str, Any]] = {}
+
+    def load(self) -> "SeasonManifest":
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        self.rows = data.get("rows")
+        self.weeks = {int(w): entry for w, entry in data.get("weeks", {}).items()}
+        return self
+
+    def save(self) -> None:
+        data = {
+            "rows": self.rows,
+            "updated_at": dt.datetime.now().isoformat(timespec="seconds"),
+            "weeks": {str(w): self.weeks[w] for w in sorted(self.weeks)},
+        }
+
+        def write(tmp: str) -> None:
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=1)
+
+        atomic_write(self.path, write)
+
+    def fingerprint(self, week: int) -> Optional[str]:
+        return self.weeks.get(week, {}).get("fingerprint")
+
+    def matches(self, processed_path: str) -> bool:
+        """True when the manifest describes the file currently at `processed_path`."""
+        if self.rows is None or not os.path.exists(processed_path):
+            return False
+        try:
+            return pq.ParquetFile(processed_path).metadata.num_rows == self.rows
+        except Exception as e:
+            print(e)
+            return False
+
+
+# --------------- READ / WRITE --------------- #
+def _split_weeks(season_rows: List[pd.DataFrame]) -> Dict[int, pd.DataFrame]:
+    """{week: rows}, ascending; runners hand over one frame per week, which is used as-is."""
+    parts: Dict[int, List[pd.DataFrame]] = {}
+    for rows in season_rows:
+        weeks = rows["week"].dropna().unique()
+        groups = [(weeks[0], rows)] if len(weeks) == 1 and rows["week"].notna().all() else rows.groupby("week")
+        for w, part in groups:
+            parts.setdefault(int(w), []).append(part)
+    return {w: p[0] if len(p) == 1 else pd.concat(p, ignore_index=True) for w, p in sorted(parts.items())}
+
+
+def _read_season_table(path: str, schema: pa.Schema) -> pa.Table:
+    """The processed season as an Arrow table on `schema` (empty if missing/unreadable)."""
+    if not os.path.exists(path):
+        return schema.empty_table()
+    try:
+        return conform_table(pq.read_table(path), schema)
+    except Exception as e:
+        print(e)
+        return schema.empty_table()
+
+
+def _write_season_table(table: pa.Table, path: str) -> None:
+    atomic_write(path, lambda tmp: pq.write_table(table, tmp, compression=COMPRESSION,
+                                                  compression_level=COMPRESSION_LEVEL,
+                                                  row_group_size=ROW_GROUP_SIZE))
+
+
+# --------------- PUBLIC --------------- #
+def incremental_rollup(
+    season_rows: List[pd.DataFrame],
+    *,
+    processed_path: str,
+    manifest: SeasonManifest,
+    rollup: RollupFn,
+    input_schema: pa.Schema,
+    schema: pa.Schema,
+    replace_weeks: bool = False,
+    max_week: Optional[int] = None,
+) -> Tuple[pd.DataFrame, Dict[str, List[int]]]:
+    """
+    Fold this run's weekly frames into the processed season file, redoing only the
+    weeks whose input changed since the manifest was written.
+
+    `rollup(processed_df, rows, replace_weeks=...)` is the runner's rollup_season; it
+    only ever sees the changed weeks (every dedupe key includes season and week, so
+    weeks are independent). Weeks above `max_week` are dropped from the file. The
+    season file is rewritten sorted by week only when something changed.
+
+    Returns (rows of the rebuilt weeks, {"rebuilt": [...], "unchanged": [...], "dropped": [...]}).
+    """
+    incoming = _split_weeks(season_rows)
+    trusted = manifest.matches(processed_path)
+    fingerprints = {w: week_fingerprint(part, input_schema) for w, part in incoming.items()}
+    changed = [w for w in incoming if not trusted or manifest.fingerprint(w) != fingerprints[w]]
+    summary = {"rebuilt": changed, "unchanged": [w for w in incoming if w not in changed], "dropped": []}
+
+    if trusted:
+        on_disk = set(manifest.weeks)
+    else:
+        existing = _read_season_table(processed_path, schema)
+        on_disk = {int(w) for w in pc.unique(existing.column("week")).to_pylist() if w is not None}
+    # only processed weeks are trimmed; this run's weeks are always kept
+    summary["dropped"] = sorted(w for w in on_disk - set(incoming) if max_week is not None and w > max_week)
+    if not changed and not summary["dropped"]:
+        return pd.DataFrame(), summary
+
+    if trusted:
+        existing = _read_season_table(processed_path, schema)
+    week_col = existing.column("week")
+    touched = pa.array(changed + summary["dropped"], type=week_col.type)
+    kept = existing.filter(pc.invert(pc.fill_null(pc.is_in(week_col, value_set=touched), False)))
+    previous = to_pandas(existing.filter(pc.is_in(week_col, value_set=pa.array(changed, type=week_col.type))))
+    del existing
+
+    rebuilt_df = rollup(previous, [incoming[w] for w in changed], replace_weeks=replace_weeks) if changed \
+        else pd.DataFrame()
+    parts = [kept] + ([to_table(rebuilt_df, schema)] if not rebuilt_df.empty else [])
+    table = pa.concat_tables(parts)
+    table = table.take(pc.sort_indices(table, sort_keys=[("week", "ascending")], null_placement="at_end"))
+    _write_season_table(table, processed_path)
+
+    # carried-over weeks keep their fingerprint; weeks never fingerprinted stay null
+    counts = {int(r["values"]): int(r["counts"]) for r in pc.value_counts(table.column("week")).to_pylist()
+              if r["values"] is not None}
+    manifest.weeks = {
+        w: {"rows": n, "fingerprint": fingerprints[w] if w in changed else (manifest.fingerprint(w) if trusted else None)}
+        for w, n in counts.items()
+    }
+    manifest.rows = table.num_rows
+    manifest.save()
+    return rebuilt_df, summary
@@ -0,0 +1,188 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Every persisted frame is cast to one of these before it is written, so a column's
+# type no longer depends on what pandas inferred for a given week. Casts are "safe":
+# a value that does not fit (e.g. a fractional team_id) raises instead of drifting.
+#
+# IDs/season/week are narrow ints, low-cardinality strings are dictionary encoded,
+# prices are float32 (American odds up to +-16.7M and half-point lines are exact).
+_CAT = pa.dictionary(pa.int32(), pa.string())
+_TS = pa.timestamp("ns")
+
+GAME_LINES_SCHEMA = pa.schema([
+    ("line_type", _CAT),
+    ("event_id", pa.int32()),
+    ("book_id", pa.int16()),
+    ("period", _CAT),
+    ("side", _CAT),
+    ("value", pa.float32()),
+    ("odds", pa.float32()),
+    ("odds_coefficient_score", pa.float32()),
+    ("team_id", pa.int32()),
+    ("team", _CAT),
+    ("season", pa.int16()),
+    ("week", pa.int16()),
+    ("total_bets_on_event", pa.int32()),
+    ("tickets_percent", pa.float32()),
+    ("money_percent", pa.float32()),
+    ("last_updated", _TS),
+    ("open_inferred", pa.bool_()),
+    ("open_source_book_id", pa.int16()),
+])
+
+# Weekly raw props files: player_id is still the Action Network id
+PLAYER_PROPS_RAW_SCHEMA = pa.schema([
+    ("bet_type", _CAT),
+    ("event_id", pa.int32()),
+    ("book_id", pa.int16()),
+    ("player_id", pa.int32()),
+    ("line_type", _CAT),
+    ("period", _CAT),
+    ("side", _CAT),
+    ("value", pa.float32()),
+    ("odds", pa.float32()),
+    ("team", _CAT),
+    ("join_name", _CAT),
+    ("position", _CAT),
+    ("position_group", _CAT),
+    ("total_bets_on_event", pa.int32()),
+    ("season", pa.int16()),
+    ("week", pa.int16()),
+    ("last_updated", _TS),
+    ("open_inferred", pa.bool_()),
+    ("open_source_book_id", pa.int16()),
+])
+
+# Processed props seasons: Action Network id as text + mapped player_id
+PLAYER_PROPS_SCHEMA = pa.schema(
+    [f if f.name != "player_id" else pa.field("action_network_player_id", _CAT) for f in PLAYER_PROPS_RAW_SCHEMA]
+    + [pa.field("player_id", _CAT)]
+)
+
+# Games dimension (src.games): one row per game of a (season, season_type, api week); start_time is UTC
+GAMES_SCHEMA = pa.schema([
+    ("id", pa.int32()),
+    ("season", pa.int16()),
+    ("season_type", _CAT),
+    ("week", pa.int16()),
+    ("home_team_id", pa.int32()),
+    ("away_team_id", pa.int32()),
+    ("home_team_abbr", _CAT),
+    ("away_team_abbr", _CAT),
+    ("start_time", _TS),
+    ("status", _CAT),
+    ("num_bets", pa.int32()),
+    ("fetched_at", _TS),
+])
+
+# Action Network player id -> nflverse player id (src.player_ids.PlayerIdMap), sorted by the Action Network id
+PLAYER_ID_MAP_SCHEMA = pa.schema([
+    ("action_network_player_id", pa.int64()),
+    ("player_id", pa.string()),
+])
+
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 9
+ROW_GROUP_SIZE = 65_536
+
+# Arrow -> pandas nullable dtypes, matching what get_dataframe() hands back
+_NULLABLE_DTYPES = {
+    pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(), pa.uint16(): pd.UInt16Dtype(), pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(), pa.float32(): pd.Float32Dtype(), pa.float64(): pd.Float64Dtype(),
+    pa.bool_(): pd.BooleanDtype(), pa.string(): pd.StringDtype(), pa.large_string(): pd.StringDtype(),
+}
+
+
+# --------------- CAST --------------- #
+def conform_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Project/cast `table` onto `schema`: missing columns become nulls, unknown ones are dropped (noisily)."""
+    extra = [c for c in table.column_names if c not in schema.names]
+    if extra:
+        print(f"Dropping columns not in schema: {extra}")
+    arrays = []
+    for field in schema:
+        if field.name in table.column_names:
+            col = table.column(field.name)
+            arrays.append(col if col.type == field.type else col.cast(field.type))
+        else:
+            arrays.append(pa.nulls(table.num_rows, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def to_table(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """pandas -> Arrow table conforming to `schema` (no pandas metadata)."""
+    table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+    return conform_table(table, schema)
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Arrow -> pandas with nullable dtypes; dictionary columns come back as strings, not categories."""
+    df = table.to_pandas(types_mapper=_NULLABLE_DTYPES.get)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # take() from the categories: one str object per distinct value, not per row
+            # (a trailing NA slot, so the -1 codes of nulls, even all-null columns, take NA)
+            cats = np.append(np.asarray(df[col].cat.categories, dtype=object), pd.NA)
+            codes = df[col].cat.codes.to_numpy()
+            values = cats.take(codes)
+            df[col] = pd.arrays.StringArray(values)
+    return df
+
+
+# --------------- READ / WRITE --------------- #
+def write_parquet(df: pd.DataFrame, path: str, schema: pa.Schema) -> None:
+    """put_dataframe(), but cast to `schema` with tuned compression and row groups."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    pq.write_table(
+        to_table(df, schema),
+        path,
+        compression=COMPRESSION,
+        compression_level=COMPRESSION_LEVEL,
+        row_group_size=ROW_GROUP_SIZE,
+    )
+
+
+def read_parquet(path: str, schema: Optional[pa.Schema] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    get_dataframe(), but files written before the schema existed are cast onto it,
+    so every read sees the same dtypes. Prints and returns an empty frame if the
+    file cannot be read.
+    """
+    try:
+        table = pq.read_table(path, columns=columns)
+    except Exception as e:
+        print(e)
+        return pd.DataFrame()
+    if schema is not None:
+        if columns is not None:
+            schema = pa.schema([schema.field(c) for c in columns if c in schema.names])
+        table = conform_table(table, schema)
+    return to_pandas(table)
+
+
+# --------------- ONE-OFF: rewrite existing files onto the schemas --------------- #
+if __name__ == "__main__":
+    import glob
+
+    nfl = "./data/{}/football/nfl"
+    targets = [
+        (f"{nfl.format('raw')}/game_lines/*/*/game_lines.parquet", GAME_LINES_SCHEMA),
+        (f"{nfl.format('raw')}/player_props/*/*/player_props.parquet", PLAYER_PROPS_RAW_SCHEMA),
+        (f"{nfl.format('processed')}/game_lines/*.parquet", GAME_LINES_SCHEMA),
+        (f"{nfl.format('processed')}/player_props/*.parquet", PLAYER_PROPS_SCHEMA),
+    ]
+    for pattern, schema in targets:
+        before = after = 0
+        paths = sorted(glob.glob(pattern))
+        for path in paths:
+            before += os.path.getsize(path)
+            write_parquet(read_parquet(path, schema), path, schema)
+            after += os.path.getsize(path)
+        print(f"{pattern}: {len(paths)} files, {before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB")
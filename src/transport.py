@@ -0,0 +1,103 @@
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# One pooled, keep-alive session per process, shared by every Action Network client
+# (GameLinesClient, SimpleGamesClient, GamePropsClient). Clients used to build a new
+# requests.Session per week, i.e. a fresh TCP+TLS handshake per week and per client.
+
+# Browser-like header block every Action Network request carries
+DEFAULT_HEADERS: Dict[str, str] = {
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/119.0.0.0 Safari/537.36"
+    ),
+    "Origin": "https://www.actionnetwork.com",
+    "Referer": "https://www.actionnetwork.com/",
+}
+
+# All traffic goes to api.actionnetwork.com; POOL_MAXSIZE keep-alive connections per
+# host covers PROPS_MAX_WORKERS concurrent per-game fetches with headroom.
+POOL_CONNECTIONS = 4   # distinct hosts kept pooled
+POOL_MAXSIZE = 8       # keep-alive connections per host
+
+
+class CountingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that counts requests and bytes. `wire_bytes` is the (compressed)
+    body size read off the socket, `body_bytes` the decoded size; connection
+    reuse comes from urllib3's own per-pool counters.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "wire_bytes": 0, "body_bytes": 0}
+
+    def send(self, request, stream=False, **kwargs):
+        resp = super().send(request, stream=stream, **kwargs)
+        wire = body = 0
+        if not stream:
+            body = len(resp.content)  # reads the body now rather than in Session.send
+            wire = resp.raw.tell() if resp.raw is not None else body
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["wire_bytes"] += wire
+            self._counts["body_bytes"] += body
+        return resp
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._counts)
+        pools = self.poolmanager.pools
+        opened = sum(getattr(pools.get(key), "num_connections", 0) for key in pools.keys())
+        out["connections_opened"] = opened
+        out["connections_reused"] = max(0, out["requests"] - opened)
+        return out
+
+
+class Transport:
+    """A requests.Session over a CountingAdapter, with keep-alive and compression negotiated."""
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE):
+        # retries, backoff and circuit breaking live in src.resilience, so the adapter never retries on its own
+        self.adapter = CountingAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers.update({
+            # gzip/deflate, plus br/zstd when urllib3 can decode them (Brotli / zstandard installed)
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+
+    def stats(self) -> Dict[str, int]:
+        return self.adapter.stats()
+
+
+_TRANSPORT: Optional[Transport] = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """The process-wide transport (created on first use; spawned workers build their own)."""
+    global _TRANSPORT
+    with _TRANSPORT_LOCK:
+        if _TRANSPORT is None:
+            _TRANSPORT = Transport()
+        return _TRANSPORT
+
+
+def get_session() -> requests.Session:
+    return get_transport().session
+
+
+def diff_stats(after: Dict[str, int], before: Dict[str, int]) -> Dict[str, int]:
+    """Per-unit counters from two stats() snapshots."""
+    return {k: v - before.get(k, 0) for k, v in after.items()}
@@ -1,17 +1,117 @@
+import functools
+import multiprocessing
+import os
 import random
+import re
+import tempfile
+import threading
 import time
+from typing import Callable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import unicodedata
 
+from src.metrics import timed
+
 
 def polite_sleep_block(min_s=0.5, max_s=4.5):
     time.sleep(random.uniform(min_s, max_s))
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; `acquire()`
+    blocks until enough tokens are available and returns the seconds spent waiting.
+    One instance can be shared by every thread that talks to the same API.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                sleep_s = (tokens - self._tokens) / self.rate
+            time.sleep(sleep_s)
+            waited += sleep_s
+
+
+def regular_season_weeks(season: int) -> int:
+    """Canonical postseason weeks (Action Network 'post' weeks) start after this."""
+    return 18 if season >= 2021 else 17
+
+
+def api_week_for(season: int, canonical_week: int) -> Optional[Tuple[str, int]]:
+    """Canonical NFL week (1..22) -> (season_type, Action Network week); None if no such week."""
+    shift = regular_season_weeks(season)
+    if canonical_week > shift:
+        if season <= 2022 and canonical_week == 22:
+            # 2021–2022 had different playoff week structure
+            return None
+        return "post", canonical_week - shift  # Action uses 1.. for post
+    return "reg", canonical_week
+
+
+def canonical_week_for(season: int, season_type: str, week: int) -> int:
+    """Inverse of api_week_for."""
+    return week + regular_season_weeks(season) if season_type == "post" else week
+
+
+def to_numeric_or_keep(s: pd.Series) -> pd.Series:
+    """pd.to_numeric(s, errors="ignore") without the pandas 2.2 deprecation warning."""
+    try:
+        return pd.to_numeric(s)
+    except (ValueError, TypeError):
+        return s
+
+
 def _to_ascii(x: str) -> str:
     return unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("ascii")
 
+
+# --------------- PLAYER NAMES --------------- #
+# The same few thousand names repeat across every week, book and bet type, so each
+# distinct raw name is cleaned once per process (bounded LRU) and mapped back by code.
+CLEAN_NAME_CACHE_SIZE = 65536
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_LAST_FIRST_RE = re.compile(r"^(.+?),\s*(.+)$")
+_SUFFIX_RE = re.compile(r"\s+(Jr|Sr)\.?$|\s+(II|III|IV|V)$", re.IGNORECASE)
+_PUNCT_RE = re.compile(r"[\'\u2019\.,]")
+
+
+@functools.lru_cache(maxsize=CLEAN_NAME_CACHE_SIZE)
+def _clean_name(name: str, lowercase: bool, convert_lastfirst: bool, convert_to_ascii: bool) -> str:
+    """One name through the clean_player_names steps (same regexes, same order)."""
+    name = _WHITESPACE_RE.sub(" ", name).strip()
+    if convert_lastfirst:
+        name = _LAST_FIRST_RE.sub(r"\2 \1", name)
+    name = _SUFFIX_RE.sub("", name)
+    name = _PUNCT_RE.sub("", name)
+    if convert_to_ascii:
+        name = _to_ascii(name)
+    if lowercase:
+        name = name.lower()
+    return name
+
+
+@timed("clean_names")
 def clean_player_names(
     s: pd.Series,
     *,
@@ -30,31 +130,116 @@ def clean_player_names(
       5) if convert_to_ascii: transliterate to latin-ascii
       6) if use_name_database: apply exact substitutions from name_database
       7) if lowercase: to lowercase
+    Each distinct name goes through the steps once (_clean_name, LRU-cached per process).
     """
     # ensure string dtype but preserve NA
     s = s.astype("string")
 
-    # 1) whitespace
-    s = s.str.replace(r"\s+", " ", regex=True).str.strip()
+    # steps 1-7 run once per distinct name (_clean_name); NA codes (-1) pick the trailing NA
+    codes, uniques = pd.factorize(s)
+    cleaned = np.empty(len(uniques) + 1, dtype=object)
+    cleaned[:-1] = [_clean_name(name, lowercase, convert_lastfirst, convert_to_ascii) for name in uniques]
+    cleaned[-1] = pd.NA
+    values = cleaned.take(codes)
+    if convert_to_ascii and len(s):
+        # object dtype (NA as pd.NA), which is what the per-row ASCII apply has always returned
+        return pd.Series(values, index=s.index, name=s.name, dtype=object)
+    return pd.Series(pd.array(values, dtype="string"), index=s.index, name=s.name)
 
-    # 2) "Last, First" -> "First Last"
-    if convert_lastfirst:
-        s = s.str.replace(r"^(.+?),\s*(.+)$", r"\2 \1", regex=True)
+class SharedTokenBucket:
+    """
+    TokenBucket whose state lives in shared memory, so a single request budget
+    spans every worker process of a pool. Hand it to workers through the pool
+    initializer (it cannot be pickled into individual tasks).
+    """
 
-    # 3) remove trailing suffixes
-    s = s.str.replace(r"\s+(Jr|Sr)\.?$|\s+(II|III|IV|V)$", "", case=False, regex=True)
+    def __init__(self, rate: float, capacity: Optional[float] = None, ctx=None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        ctx = ctx or multiprocessing.get_context()
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        # [tokens, last refill (monotonic seconds; system-wide clock)]
+        self._state = ctx.Array("d", [self.capacity, time.monotonic()])
 
-    # 4) remove apostrophes/periods/commas (incl. curly apostrophe)
-    s = s.str.replace(r"[\'\u2019\.,]", "", regex=True)
+    def acquire(self, tokens: float = 1.0) -> float:
+        waited = 0.0
+        while True:
+            with self._state.get_lock():
+                now = time.monotonic()
+                available = min(self.capacity, self._state[0] + (now - self._state[1]) * self.rate)
+                self._state[1] = now
+                if available >= tokens:
+                    self._state[0] = available - tokens
+                    return waited
+                self._state[0] = available
+                sleep_s = (tokens - available) / self.rate
+            time.sleep(sleep_s)
+            waited += sleep_s
 
-    # 5) transliterate to ASCII
-    if convert_to_ascii:
-        s = s.apply(lambda x: _to_ascii(x) if pd.notna(x) else x)
 
-    # 6) apply exact substitutions from name_database
+def backfill_open_lines(
+    df: pd.DataFrame,
+    group_keys: List[str],
+    *,
+    open_book_id: int,
+    fallback_priority: List[int],
+) -> pd.DataFrame:
+    """
+    Vectorized OPEN backfill shared by both runners.
 
-    # 7) lowercase
-    if lowercase:
-        s = s.str.lower()
+    For every `group_keys` group without an `open_book_id` row, copy the row from
+    the first book in `fallback_priority` present in that group (latest
+    `last_updated` wins within a book), set book_id=open_book_id and tag it with
+    open_inferred=True / open_source_book_id. New rows are appended in group-key
+    order. One sort + drop_duplicates replaces the per-group `.loc` probes.
+    """
+    if "open_inferred" not in df.columns:
+        df = df.assign(open_inferred=False)
+    if "open_source_book_id" not in df.columns:
+        df = df.assign(open_source_book_id=pd.NA)
+    df = df.assign(open_source_book_id=df["open_source_book_id"].astype("Int64"))
+
+    gid = df.groupby(group_keys, dropna=False, sort=True, observed=True).ngroup()
+    has_open = gid[(df["book_id"] == open_book_id).fillna(False).to_numpy(dtype=bool)].unique()
+
+    rank = df["book_id"].map({bid: i for i, bid in enumerate(fallback_priority)})
+    candidates = df[rank.notna().to_numpy() & ~gid.isin(has_open).to_numpy()]
+    if not candidates.empty:
+        sort_cols = ["_gid"] + (["last_updated"] if "last_updated" in df.columns else [])
+        candidates = candidates.assign(_rank=rank[candidates.index], _gid=gid[candidates.index])
+        # best rank first; within that book the latest last_updated sits last
+        best_rank = candidates.groupby("_gid")["_rank"].transform("min")
+        chosen = (
+            candidates[candidates["_rank"] == best_rank]
+            .sort_values(sort_cols, kind="stable")
+            .drop_duplicates("_gid", keep="last")
+        )
+        add_df = chosen.drop(columns=["_rank", "_gid"]).assign(
+            open_source_book_id=chosen["book_id"].astype("Int64"),
+            open_inferred=True,
+            book_id=open_book_id,
+        )
+        df = pd.concat([df, add_df[df.columns]], ignore_index=True)
 
-    return s
\ No newline at end of file
+    return df.assign(open_inferred=df["open_inferred"].fillna(False))
+
+
+# --------------- FILES --------------- #
+def atomic_write(path: str, write_fn: Callable[[str], None]) -> None:
+    """
+    write_fn(tmp) writes the whole file to a temp path next to `path`, which then replaces
+    `path`: readers and crashed runs never see a truncated file, and the temp file is
+    removed if writing fails.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_fn(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
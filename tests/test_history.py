@@ -0,0 +1,57 @@
+import datetime as dt
+
+import pandas as pd
+import pytest
+
+from event_odds_runner import HISTORY_COLUMNS, UNIQ_KEYS_W_BOOK, merge_with_existing_and_dedupe
+from src.history import LineHistory
+from src.schemas import GAME_LINES_SCHEMA, to_pandas, to_table
+
+T0 = dt.datetime(2030, 9, 8, 12, 0)
+
+
+def snapshot(rows, when: dt.datetime) -> pd.DataFrame:
+    """Game lines of one fetch: rows are (book_id, side, odds)."""
+    df = pd.DataFrame([{
+        "line_type": "moneyline", "event_id": 190001, "book_id": book_id, "period": "event", "side": side,
+        "value": None, "odds": odds, "odds_coefficient_score": None, "team_id": 7 if side == "home" else 8,
+        "team": None, "season": 2030, "week": 1, "total_bets_on_event": 100, "tickets_percent": 50.0,
+        "money_percent": 50.0, "last_updated": when, "open_inferred": False, "open_source_book_id": None,
+    } for book_id, side, odds in rows])
+    return to_pandas(to_table(df, GAME_LINES_SCHEMA))
+
+
+@pytest.fixture
+def history(tmp_path):
+    return LineHistory("game_lines", keys=UNIQ_KEYS_W_BOOK, tracked=HISTORY_COLUMNS, schema=GAME_LINES_SCHEMA,
+                       root=str(tmp_path))
+
+
+def state(df: pd.DataFrame) -> pd.DataFrame:
+    cols = UNIQ_KEYS_W_BOOK + HISTORY_COLUMNS
+    return df[cols].astype(str).sort_values(cols).reset_index(drop=True)
+
+
+def test_new_key_in_a_week_with_history_is_appended(history, tmp_path):
+    first = snapshot([(15, "home", -110.0), (15, "away", -110.0)], T0)
+    assert history.append(first) == 2
+
+    # a book seen for the first time, next to an unchanged one
+    second = snapshot([(15, "home", -110.0), (15, "away", -110.0), (68, "home", -115.0)],
+                      T0 + dt.timedelta(minutes=5))
+    assert history.append(second) == 1
+
+    merged = merge_with_existing_and_dedupe(first, second, fill_open=False)
+    pd.testing.assert_frame_equal(state(history.latest(2030, 1)), state(merged))
+    # and from disk, not just the in-memory state
+    reread = LineHistory("game_lines", keys=UNIQ_KEYS_W_BOOK, tracked=HISTORY_COLUMNS,
+                         schema=GAME_LINES_SCHEMA, root=str(tmp_path))
+    pd.testing.assert_frame_equal(state(reread.latest(2030, 1)), state(merged))
+
+
+def test_moved_line_appended_and_older_snapshot_ignored(history):
+    history.append(snapshot([(15, "home", -110.0)], T0))
+    assert history.append(snapshot([(15, "home", -120.0)], T0 + dt.timedelta(minutes=5))) == 1
+    assert history.append(snapshot([(15, "home", -130.0)], T0 - dt.timedelta(minutes=5))) == 0
+    assert history.latest(2030, 1)["odds"].tolist() == [-120.0]
+    assert len(history.read(season=2030, week=1)) == 2
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+import requests
+
+import poll_daemon
+from poll_daemon import ERROR_RETRY, GAME_LINES, PLAYER_PROPS, SCHEDULE, PollDaemon
+
+NOW = 2_000_000_000.0
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # caches, archive and state land in the temp dir
+    clock = {"now": NOW}
+    d = PollDaemon([GAME_LINES, PLAYER_PROPS], clock=lambda: clock["now"], sleep=lambda s: None)
+    d.test_clock = clock
+    return d
+
+
+def games(*game_ids):
+    return pd.DataFrame([{"id": g, "start_time": pd.Timestamp(NOW + 3600, unit="s", tz="UTC"), "status": "scheduled"}
+                         for g in game_ids])
+
+
+@pytest.mark.parametrize("error", [ValueError("unexpected payload"), KeyError("markets"),
+                                   requests.ConnectionError("reset")])
+def test_failed_poll_is_counted_and_retried(daemon, monkeypatch, error):
+    monkeypatch.setattr(daemon, "week_games", lambda season, week: games(1, 2))
+    polled = []
+
+    def run_week(**kwargs):
+        polled.append(kwargs["game_ids"][0])
+        if kwargs["game_ids"] == [1]:
+            raise error
+        return None
+
+    monkeypatch.setattr(poll_daemon.player_props_runner, "run_week", run_week)
+    monkeypatch.setattr(poll_daemon.event_odds_runner, "run_week", lambda **kwargs: None)
+    daemon.refresh_weeks([(2030, 1)])
+    daemon.poll_due(NOW)
+
+    assert sorted(polled) == [1, 2]  # game 1 failing did not stop game 2
+    assert daemon.stats["errors"] == 1
+    assert daemon.stats["polls"] == 2  # game 2 and the week's lines
+    assert daemon._retry_at[(PLAYER_PROPS, 2030, 1, 1)] == NOW + ERROR_RETRY
+    assert daemon.schedule._due[(PLAYER_PROPS, 2030, 1, 1)] == NOW + ERROR_RETRY
+
+
+def test_failed_reschedule_is_counted_and_retried(daemon, monkeypatch):
+    calls = []
+
+    def week_games(season, week):
+        calls.append((season, week))
+        if len(calls) == 1:
+            raise KeyError("start_time")
+        return games(1)
+
+    monkeypatch.setattr(daemon, "week_games", week_games)
+    daemon.refresh_weeks([(2030, 1)])
+    assert daemon.stats["errors"] == 1
+    assert daemon.schedule.next_due() == NOW + ERROR_RETRY
+
+    # the retry re-reads the week (without polling anything for it) and schedules its games
+    monkeypatch.setattr(poll_daemon.player_props_runner, "run_week", lambda **kwargs: None)
+    monkeypatch.setattr(poll_daemon.event_odds_runner, "run_week", lambda **kwargs: None)
+    daemon.test_clock["now"] = NOW + ERROR_RETRY
+    daemon.poll_due(NOW + ERROR_RETRY)
+    assert calls == [(2030, 1), (2030, 1)]
+    assert daemon.stats["polls"] == 0
+    assert (SCHEDULE, 2030, 1, None) not in daemon.schedule._due
+    assert (PLAYER_PROPS, 2030, 1, 1) in daemon.schedule._due
@@ -0,0 +1,295 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from src.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, Resilience
+
+
+# --------------- FAKE SERVER --------------- #
+class Reply:
+    """One scripted reply: a status (+ headers), a delay before answering, or a malformed chunked body."""
+
+    def __init__(self, status: int = 200, *, headers: Optional[Dict[str, str]] = None, delay: float = 0.0,
+                 broken_chunks: bool = False):
+        self.status = status
+        self.headers = headers or {}
+        self.delay = delay
+        self.broken_chunks = broken_chunks
+
+
+class FakeServer:
+    """Local HTTP server answering every GET with the next scripted Reply (200 once the script runs out)."""
+
+    def __init__(self):
+        self.script: List[Reply] = []
+        self.hits = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.hits += 1
+                    reply = server.script.pop(0) if server.script else Reply()
+                time.sleep(reply.delay)
+                self.send_response(reply.status)
+                for k, v in reply.headers.items():
+                    self.send_header(k, v)
+                if reply.broken_chunks:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    self.wfile.write(b"zz\r\nnot a chunk\r\n")
+                    self.close_connection = True
+                    return
+                body = b'{"ok": true}'
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        # a client that timed out has hung up before its (delayed) reply: not an error here
+        self.httpd.handle_error = lambda request, client_address: None
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/odds"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def server():
+    s = FakeServer()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as s:
+        yield s
+
+
+def make_policy(clock: Optional[FakeClock] = None, sleeps: Optional[List[float]] = None, **kwargs) -> Resilience:
+    """Backoff sleeps are recorded (and advance `clock`) instead of slept."""
+    def sleep(seconds: float) -> None:
+        if sleeps is not None:
+            sleeps.append(seconds)
+        if clock is not None:
+            clock.advance(seconds)
+
+    kwargs.setdefault("base_sleep", 0.01)
+    return Resilience(sleep=sleep, clock=clock or time.monotonic, **kwargs)
+
+
+# --------------- RETRIES --------------- #
+def test_retries_503_until_success(server, session):
+    server.script = [Reply(503), Reply(503)]
+    policy = make_policy(sleeps=[], max_retries=5)
+    resp = policy.get(session, server.url, timeout=5)
+    assert resp.status_code == 200
+    assert server.hits == 3
+    assert policy.stats["requests"] == 3
+    assert policy.stats["retries"] == 2
+    assert policy.stats["gave_up"] == 0
+
+
+def test_gives_up_after_max_retries_with_last_response(server, session):
+    server.script = [Reply(503)] * 3
+    policy = make_policy(sleeps=[], max_retries=2)
+    resp = policy.get(session, server.url, timeout=5)
+    assert resp.status_code == 503
+    assert server.hits == 3
+    assert policy.stats["retries"] == 2
+    assert policy.stats["gave_up"] == 1
+
+
+def test_non_retryable_status_returned_at_once(server, session):
+    server.script = [Reply(404)]
+    policy = make_policy(sleeps=[])
+    assert policy.get(session, server.url, timeout=5).status_code == 404
+    assert server.hits == 1
+    assert policy.stats["retries"] == 0
+
+
+def test_retry_after_is_honoured_and_capped(server, session):
+    sleeps: List[float] = []
+    server.script = [Reply(429, headers={"Retry-After": "7"}), Reply(503, headers={"Retry-After": "300"})]
+    policy = make_policy(sleeps=sleeps, max_retry_after=60)
+    assert policy.get(session, server.url, timeout=5).status_code == 200
+    assert sleeps == [7.0, 60.0]
+    assert policy.stats["sleep_s"] == pytest.approx(67.0)
+
+
+def test_timeout_is_retried(server, session):
+    server.script = [Reply(delay=1.0)]
+    policy = make_policy(sleeps=[])
+    resp = policy.get(session, server.url, timeout=0.2)
+    assert resp.status_code == 200
+    assert policy.stats["requests"] == 2
+    assert policy.stats["retries"] == 1
+
+
+def test_timeout_raised_once_retries_run_out(server, session):
+    server.script = [Reply(delay=1.0), Reply(delay=1.0)]
+    policy = make_policy(sleeps=[], max_retries=1)
+    with pytest.raises(requests.Timeout):
+        policy.get(session, server.url, timeout=0.2)
+    assert policy.stats["gave_up"] == 1
+
+
+# --------------- CIRCUIT BREAKER --------------- #
+def test_breaker_opens_then_half_opens(server, session):
+    clock = FakeClock()
+    policy = make_policy(clock, max_retries=1, failure_threshold=3, reset_after=30)
+    server.script = [Reply(503)] * 3
+
+    # two failed attempts: still closed
+    assert policy.get(session, server.url, timeout=5).status_code == 503
+    assert policy.breaker(server.url).state == CircuitBreaker.CLOSED
+    # the third failure in a row opens it; the call stops retrying
+    assert policy.get(session, server.url, timeout=5).status_code == 503
+    assert policy.breaker(server.url).state == CircuitBreaker.OPEN
+    assert policy.stats["circuit_opened"] == 1
+    assert server.hits == 3
+
+    # open: refused without touching the host
+    with pytest.raises(CircuitOpenError):
+        policy.get(session, server.url, timeout=5)
+    assert server.hits == 3
+    assert policy.stats["circuit_rejected"] == 1
+
+    # once reset_after has passed one probe goes out; its success closes the circuit
+    clock.advance(31)
+    assert policy.get(session, server.url, timeout=5).status_code == 200
+    assert server.hits == 4
+    assert policy.breaker(server.url).state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens(server, session):
+    clock = FakeClock()
+    policy = make_policy(clock, max_retries=1, failure_threshold=3, reset_after=30)
+    breaker = policy.breaker(server.url)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(31)
+    server.script = [Reply(503)]
+    assert policy.get(session, server.url, timeout=5).status_code == 503
+    assert server.hits == 1  # the failed probe is not retried into an open circuit
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        policy.get(session, server.url, timeout=5)
+
+
+def test_unretried_error_on_probe_does_not_wedge_breaker(server, session):
+    clock = FakeClock()
+    policy = make_policy(clock, max_retries=1, failure_threshold=3, reset_after=30)
+    breaker = policy.breaker(server.url)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(31)
+    server.script = [Reply(broken_chunks=True)]
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        policy.get(session, server.url, timeout=5)
+    assert breaker.state == CircuitBreaker.OPEN  # the probe failed: re-opened, not stuck half-open
+
+    clock.advance(31)
+    assert policy.get(session, server.url, timeout=5).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_interrupted_probe_is_released(server, session):
+    clock = FakeClock()
+    policy = make_policy(clock, max_retries=1, failure_threshold=3, reset_after=30)
+    breaker = policy.breaker(server.url)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(31)
+
+    class Interrupted(Exception):
+        pass
+
+    def interrupted_get(*args, **kwargs):
+        raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        policy.get(type("S", (), {"get": staticmethod(interrupted_get)})(), server.url, timeout=5)
+    # the next request can still probe the host
+    assert policy.get(session, server.url, timeout=5).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_one_flapping_call_does_not_open_the_circuit(server, session):
+    server.script = [Reply(503)] * 6
+    policy = make_policy(sleeps=[])  # defaults: 5 retries, so 6 attempts
+    assert policy.get(session, server.url, timeout=5).status_code == 503
+    assert policy.breaker(server.url).state == CircuitBreaker.CLOSED
+    assert policy.stats["circuit_opened"] == 0
+    assert policy.get(session, server.url, timeout=5).status_code == 200
+
+
+def test_threshold_must_exceed_one_calls_attempts():
+    with pytest.raises(ValueError):
+        Resilience(max_retries=5, failure_threshold=6)
+
+
+# --------------- DEADLINE --------------- #
+def test_deadline_bounds_the_attempt_timeout(server, session):
+    server.script = [Reply(delay=2.0)] * 3
+    policy = make_policy(sleeps=[], deadline=0.3)
+    start = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        policy.get(session, server.url, timeout=10)
+    assert time.monotonic() - start < 1.5
+    assert policy.stats["requests"] == 1
+    assert policy.stats["gave_up"] == 1
+
+
+def test_deadline_exceeded_before_sending(server, session):
+    clock = FakeClock()
+
+    class SlowLimiter:
+        def acquire(self):
+            clock.advance(10)
+
+    policy = make_policy(clock, deadline=5)
+    with pytest.raises(DeadlineExceeded):
+        policy.get(session, server.url, timeout=5, rate_limiter=SlowLimiter())
+    assert server.hits == 0
+    assert policy.stats["requests"] == 0
+    assert policy.stats["gave_up"] == 1
+
+
+def test_backoff_stops_at_the_deadline(server, session):
+    clock = FakeClock()
+    sleeps: List[float] = []
+    server.script = [Reply(503, headers={"Retry-After": "4"})] * 3
+    policy = make_policy(clock, sleeps, deadline=10)
+    resp = policy.get(session, server.url, timeout=5)
+    assert resp.status_code == 503
+    assert sleeps == [4.0, 4.0]  # a third wait would end past the deadline
+    assert server.hits == 3
+    assert policy.stats["gave_up"] == 1